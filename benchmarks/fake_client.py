@@ -0,0 +1,125 @@
+# benchmarks/fake_client.py
+#
+# In-process stand-in for pyrogram.Client used by the offline benchmarks.
+# FakeClient is a real Client whose network methods are replaced by a
+# simulated connection with configurable latency, FloodWaits and
+# disconnects, so the managers, rate limiters, plugins and the update
+# dispatcher run unchanged without Telegram accounts.
+
+import asyncio
+import contextlib
+import itertools
+import random
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator
+
+import client_manager
+from pyrogram import Client, raw, types
+from pyrogram.errors import FloodWait
+from pyrogram.session import Session
+
+
+@dataclass
+class FakeNetwork:
+    """
+    Behaviour of the simulated connection, shared by all fake clients.
+
+    Attributes:
+        latency: Mean seconds per request.
+        jitter: Uniform +/- seconds added to the latency.
+        flood_wait_rate: Probability that a request is answered with a FloodWait.
+        flood_wait_seconds: Value of the simulated FloodWaits.
+        disconnect_rate: Probability that a request fails with a lost connection.
+        seed: Seed of the fault generator, for repeatable runs.
+    """
+    latency: float = 0.02
+    jitter: float = 0.01
+    flood_wait_rate: float = 0.0
+    flood_wait_seconds: int = 1
+    disconnect_rate: float = 0.0
+    seed: int = 0
+    stats: Dict[str, int] = field(default_factory=lambda: {'requests': 0, 'flood_waits': 0, 'disconnects': 0})
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    async def request(self) -> None:
+        """Wait for one simulated round trip and raise the simulated faults."""
+        self.stats['requests'] += 1
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(0.0, delay))
+
+        roll = self._random.random()
+        if roll < self.flood_wait_rate:
+            self.stats['flood_waits'] += 1
+            raise FloodWait(self.flood_wait_seconds)
+        if roll < self.flood_wait_rate + self.disconnect_rate:
+            self.stats['disconnects'] += 1
+            raise ConnectionError("Connection lost (simulated)")
+
+
+class FakeClient(Client):
+    # Replaced by use_fake_client(); all instances share one simulated network
+    network = FakeNetwork()
+    _message_ids = itertools.count(1)
+
+    def _user_id(self) -> int:
+        return zlib.crc32(self.name.encode()) + 1
+
+    async def start(self):
+        """Simulate connect and authorization in one round trip, then load plugins and start the dispatcher."""
+        await self.network.request()
+        self.is_connected = True
+        self.me = types.User(
+            id=self._user_id(),
+            is_bot=bool(self.bot_token),
+            first_name=self.name,
+            username=self.name
+        )
+        self.load_plugins()
+        await self.dispatcher.start()
+        self.is_initialized = True
+        return self
+
+    async def stop(self, block: bool = True):
+        if self.is_initialized:
+            await self.dispatcher.stop()
+            self.is_initialized = False
+        self.is_connected = False
+        return self
+
+    async def invoke(self, query: raw.core.TLObject, retries: int = Session.MAX_RETRIES,
+                     timeout: float = Session.WAIT_TIMEOUT, sleep_threshold: float = None):
+        await self.network.request()
+        if isinstance(query, raw.functions.messages.EditMessage):
+            return raw.types.Updates(updates=[], users=[], chats=[], date=0, seq=0)
+        if isinstance(query, raw.functions.messages.SendMessage):
+            return raw.types.UpdateShortSentMessage(
+                id=next(self._message_ids), pts=0, pts_count=0, date=int(time.time()), out=True
+            )
+        return True
+
+    async def get_me(self) -> types.User:
+        await self.invoke(raw.functions.users.GetUsers(id=[raw.types.InputUserSelf()]))
+        return self.me
+
+    async def resolve_peer(self, peer_id: Any):
+        return raw.types.InputPeerUser(user_id=int(peer_id), access_hash=0)
+
+    async def export_session_string(self) -> str:
+        return ""
+
+
+@contextlib.contextmanager
+def use_fake_client(network: FakeNetwork) -> Iterator[FakeNetwork]:
+    """Make ClientManager create fake clients on ``network`` inside the block."""
+    previous_client, previous_network = client_manager.Client, FakeClient.network
+    client_manager.Client = FakeClient
+    FakeClient.network = network
+    try:
+        yield network
+    finally:
+        client_manager.Client = previous_client
+        FakeClient.network = previous_network
@@ -0,0 +1,134 @@
+# benchmarks/import_time.py
+#
+# Import-time report and budget check for process startup. Every run imports
+# the module in a fresh interpreter with ``python -X importtime`` and the
+# median of the runs is compared with the budget; the exit status is 1 when
+# the import is over budget or loads a module that startup should defer:
+#
+#   python -m benchmarks.import_time
+#   python -m benchmarks.import_time --budget 0.25 --repeat 9 --output imports.json
+#   python -m benchmarks.import_time --module client_manager --allow-heavy --budget 2
+#
+# The import of main must stay cheap: the supervisor process and every
+# spawned worker import it before a single client connects, and restarts
+# during rolling deploys wait for it.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds a cold import of main may take
+DEFAULT_BUDGET = 0.3
+
+# Packages that are imported on first use and must not be loaded by main
+DEFERRED = ("pyrogram", "apscheduler", "yaml", "uvloop", "tgcrypto")
+
+
+def import_profile(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Import ``module`` in a fresh interpreter.
+
+    Returns:
+        List[Tuple[str, int, int]]: (module, self microseconds, cumulative
+        microseconds) of every module imported, in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile.append((name.strip(), int(self_us), int(cumulative_us)))
+    return profile
+
+
+def measure(module: str, repeat: int, top: int) -> Dict[str, Any]:
+    """Import ``module`` ``repeat`` times and summarize the slowest packages of the median run."""
+    runs = []
+    for _ in range(repeat):
+        profile = import_profile(module)
+        total = next(cumulative for name, _, cumulative in reversed(profile) if name == module)
+        runs.append((total, profile))
+    runs.sort(key=lambda run: run[0])
+    total, profile = runs[len(runs) // 2]
+
+    # Self time summed per top-level package
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in profile:
+        packages[name.split(".")[0]] += self_us
+
+    loaded = {name.split(".")[0] for name, _, _ in profile}
+    return {
+        'module': module,
+        'python': sys.version.split()[0],
+        'repeat': repeat,
+        'import_seconds': total / 1e6,
+        'min_seconds': runs[0][0] / 1e6,
+        'max_seconds': runs[-1][0] / 1e6,
+        'modules': len(profile),
+        'packages': [
+            {'package': package, 'seconds': self_us / 1e6}
+            for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        ],
+        'deferred_loaded': sorted(loaded.intersection(DEFERRED))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold import time of a module")
+    parser.add_argument("--module", default="main", help="module to import")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET,
+                        help="seconds the median import may take (0 = no budget)")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters to import in")
+    parser.add_argument("--top", type=int, default=10, help="packages listed in the report")
+    parser.add_argument("--allow-heavy", action="store_true",
+                        help=f"do not fail when one of {', '.join(DEFERRED)} is imported")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    report = measure(args.module, args.repeat, args.top)
+
+    print(
+        f"import {report['module']}: {report['import_seconds'] * 1000:.0f} ms median "
+        f"({report['min_seconds'] * 1000:.0f}-{report['max_seconds'] * 1000:.0f} ms over {report['repeat']} runs), "
+        f"{report['modules']} modules"
+    )
+    for entry in report['packages']:
+        print(f"  {entry['package']:<24} {entry['seconds'] * 1000:>8.1f} ms")
+
+    failures = []
+    if args.budget and report['import_seconds'] > args.budget:
+        failures.append(f"over the budget of {args.budget * 1000:.0f} ms")
+    if report['deferred_loaded'] and not args.allow_heavy:
+        failures.append(f"imports {', '.join(report['deferred_loaded'])} at startup")
+    report['budget'] = args.budget
+    report['failures'] = failures
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"report written to {args.output}")
+
+    if failures:
+        print(f"FAILED: import {args.module} " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/live_sessions_bench.py
+#
+# Compares the memory and expiry cost of the live sessions of the bot plugins:
+# the previous dict of Message objects and datetimes, scanned on every tick,
+# against the slotted LiveSessionStore with its heap expiry index.
+#
+#   python -m benchmarks.live_sessions_bench
+
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Tuple
+
+from pyrogram import enums
+from pyrogram.types import Chat, Message, User
+
+from utils.live_sessions import LiveSessionStore
+
+TTL = 30 * 60
+
+
+def build_legacy(sessions: int, start: float) -> Dict[int, Dict[str, Any]]:
+    """Sessions as stored before: the sent Message and a datetime per user."""
+    store = {}
+    for user_id in range(1, sessions + 1):
+        started = datetime.fromtimestamp(start + user_id % TTL)
+        chat = Chat(id=user_id, type=enums.ChatType.PRIVATE, first_name=f"user{user_id}")
+        message = Message(
+            id=user_id,
+            chat=chat,
+            from_user=User(id=100, is_bot=True, first_name="bot"),
+            date=started,
+            text="👋 Hello! I'm Bot #1"
+        )
+        store[user_id] = {"message": message, "start_time": started}
+    return store
+
+
+def build_store(sessions: int, start: float) -> LiveSessionStore:
+    store = LiveSessionStore(TTL)
+    for user_id in range(1, sessions + 1):
+        store.add(user_id, user_id, user_id, start + user_id % TTL)
+    return store
+
+
+def measure_memory(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Build a session store and return it with its traced size in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        store = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return store, size
+
+
+def expire_legacy(store: Dict[int, Dict[str, Any]], now: datetime) -> int:
+    users_to_remove = [
+        user_id for user_id, session in store.items()
+        if now - session["start_time"] > timedelta(minutes=30)
+    ]
+    for user_id in users_to_remove:
+        store.pop(user_id, None)
+    return len(users_to_remove)
+
+
+def run(sessions: int = 100_000) -> Dict[str, Any]:
+    """Build both stores with ``sessions`` users and expire the oldest second of them."""
+    start = time.time()
+    legacy, legacy_bytes = measure_memory(lambda: build_legacy(sessions, start))
+    store, store_bytes = measure_memory(lambda: build_store(sessions, start))
+
+    # One tick later: only the sessions started in the first second have expired
+    now = start + TTL + 0.5
+
+    begin = time.perf_counter()
+    legacy_expired = expire_legacy(legacy, datetime.fromtimestamp(now))
+    legacy_seconds = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    store_expired = len(store.pop_expired(now))
+    store_seconds = time.perf_counter() - begin
+
+    assert legacy_expired == store_expired
+
+    return {
+        'sessions': sessions,
+        'legacy_bytes': legacy_bytes,
+        'store_bytes': store_bytes,
+        'expired': store_expired,
+        'legacy_expire_ms': legacy_seconds * 1000,
+        'store_expire_ms': store_seconds * 1000
+    }
+
+
+def main():
+    result = run()
+    sessions = result['sessions']
+    print(f"sessions:                 {sessions}")
+    print(f"legacy dict, MiB:         {result['legacy_bytes'] / 2 ** 20:.1f}  "
+          f"({result['legacy_bytes'] / sessions:.0f} B per session)")
+    print(f"LiveSessionStore, MiB:    {result['store_bytes'] / 2 ** 20:.1f}  "
+          f"({result['store_bytes'] / sessions:.0f} B per session)")
+    print(f"expired per tick:         {result['expired']}")
+    print(f"legacy expiry scan, ms:   {result['legacy_expire_ms']:.2f}")
+    print(f"heap expiry, ms:          {result['store_expire_ms']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/logging_bench.py
+#
+# Measures how long log calls block the event loop with synchronous handlers
+# and with the queue-based logging mode, for text and JSON-lines log files.
+#
+#   python -m benchmarks.logging_bench
+
+import asyncio
+import contextlib
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from utils.logger import LoggerFactory, get_logger
+
+
+async def measure(mode: str, fmt: str, records: int) -> Dict[str, Any]:
+    """
+    Log ``records`` messages from a coroutine and time every call.
+
+    Args:
+        mode: Logging mode passed to ``LoggerFactory.configure``.
+        fmt: Log file format passed to ``LoggerFactory.configure``.
+        records: Number of log calls.
+
+    Returns:
+        Dict[str, Any]: Loop time spent in log calls, in microseconds.
+    """
+    LoggerFactory.configure(mode, fmt)
+    logger = get_logger("user_bench")
+    timings: List[float] = []
+
+    for i in range(records):
+        begin = time.perf_counter()
+        logger.info("Edited message %s in chat %s", i, -1001234567890)
+        timings.append(time.perf_counter() - begin)
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+
+    # Flushing the queue happens off the loop and is not counted
+    LoggerFactory.shutdown()
+
+    timings.sort()
+    return {
+        'total_ms': sum(timings) * 1000,
+        'mean_us': statistics.mean(timings) * 1e6,
+        'p99_us': timings[int(len(timings) * 0.99)] * 1e6,
+        'max_us': timings[-1] * 1e6
+    }
+
+
+def run(records: int = 20000) -> Dict[str, Dict[str, Any]]:
+    """Run the benchmark for every mode and format in a temporary log directory."""
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, "w") as devnull:
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(devnull):
+                for fmt in (LoggerFactory.TEXT, LoggerFactory.JSON):
+                    for mode in (LoggerFactory.SYNC, LoggerFactory.QUEUE):
+                        results[f"{mode}/{fmt}"] = asyncio.run(measure(mode, fmt, records))
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def main():
+    results = run()
+    print(f"{'mode':<12}{'loop time, ms':>15}{'mean, us':>10}{'p99, us':>10}{'max, us':>10}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<12}{result['total_ms']:>15.1f}{result['mean_us']:>10.1f}"
+            f"{result['p99_us']:>10.1f}{result['max_us']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
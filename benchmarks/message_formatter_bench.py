@@ -0,0 +1,134 @@
+# benchmarks/message_formatter_bench.py
+#
+# Compares the previous multi-pass MessageFormatter escaping with the
+# precompiled single-pass implementation.
+#
+#   python -m benchmarks.message_formatter_bench
+
+import random
+import timeit
+from typing import Any, Dict
+
+from pyrogram import Client
+
+from utils.message_formatter import ALLOWED_HTML_TAGS, MARKDOWN_SPECIAL_CHARS, MessageFormatter
+
+ALLOWED_BUTTON_HTML_TAGS = ['<b>', '</b>', '<i>', '</i>', '<u>', '</u>', '<s>', '</s>']
+
+
+def legacy_clean_html(text: str) -> str:
+    text = text.replace('<', '&lt;').replace('>', '&gt;')
+    for tag in ALLOWED_HTML_TAGS:
+        escaped_tag = tag.replace('<', '&lt;').replace('>', '&gt;')
+        text = text.replace(escaped_tag, tag)
+    return text
+
+
+def legacy_escape_markdown(text: str) -> str:
+    for char in MARKDOWN_SPECIAL_CHARS:
+        text = text.replace(char, f'\\{char}')
+    return text
+
+
+def legacy_has_conflicting_tags(text: str) -> bool:
+    markdown_tags = ['**', '__', '~~', '`', '```']
+    has_markdown = any(tag in text for tag in markdown_tags)
+    has_html = any(tag in text for tag in ALLOWED_HTML_TAGS)
+    return has_markdown and has_html
+
+
+def legacy_button_text(text: str) -> str:
+    text = legacy_clean_html(text)
+    for tag in ALLOWED_HTML_TAGS:
+        if tag not in ALLOWED_BUTTON_HTML_TAGS:
+            text = text.replace(tag, '')
+    return text
+
+
+def make_message(length: int, seed: int = 0, dense: bool = False) -> str:
+    """
+    Build a test message.
+
+    Regular messages are prose with an occasional tag, comparison or
+    punctuation mark. Dense messages put a tag, entity or Markdown
+    character in almost every word, which is the worst case for the
+    single-pass implementation.
+    """
+    rng = random.Random(seed)
+    words = [
+        "status", "update", "time", "remaining", "minutes", "started", "account",
+        "plugin", "active", "the", "bot", "will", "stop", "after", "hello", "world"
+    ]
+    specials = [
+        "<b>", "</b>", "<code>", "</code>", "<div>", "</div>", "&lt;i&gt;", "a < b", "c > d",
+        "**bold**", "snake_case", "1.5!", "[link](url)", "<spoiler>", "</spoiler>", "<s>",
+        "<script>", "#tag", "x-y", "`code`", "\\"
+    ]
+    text = ""
+    while len(text) < length:
+        if dense or rng.random() < 0.05:
+            text += rng.choice(specials) + " "
+        else:
+            text += rng.choice(words) + " "
+    return text[:length]
+
+
+def make_formatter() -> MessageFormatter:
+    return MessageFormatter(Client("bench_formatter", api_id=1, api_hash="0" * 32, in_memory=True))
+
+
+def check_equivalence(formatter: MessageFormatter, samples: int = 2000) -> None:
+    """Raise AssertionError if the new implementation differs from the old one."""
+    for seed in range(samples):
+        text = make_message(seed % 300 + 1, seed, dense=seed % 2 == 0)
+        assert formatter._clean_html(text) == legacy_clean_html(text), text
+        assert formatter._escape_markdown(text) == legacy_escape_markdown(text), text
+        assert formatter._has_conflicting_tags(text) == legacy_has_conflicting_tags(text), text
+        assert formatter.create_button_text(text, "HTML") == legacy_button_text(text), text
+
+
+def run(number: int = 2000) -> Dict[str, Any]:
+    """
+    Time old and new escaping on a short and a 4096-character message.
+
+    Returns:
+        Dict[str, Any]: Microseconds per call for each case and implementation.
+    """
+    formatter = make_formatter()
+    check_equivalence(formatter)
+
+    cases = {
+        "short": make_message(64, 1),
+        "4096": make_message(4096, 2),
+        "short,dense": make_message(64, 3, dense=True),
+        "4096,dense": make_message(4096, 4, dense=True)
+    }
+    functions = {
+        "clean_html": (legacy_clean_html, formatter._clean_html),
+        "escape_markdown": (legacy_escape_markdown, formatter._escape_markdown),
+        "has_conflicting_tags": (legacy_has_conflicting_tags, formatter._has_conflicting_tags),
+        "button_text": (legacy_button_text, lambda text: formatter.create_button_text(text, "HTML"))
+    }
+
+    results = {}
+    for case, text in cases.items():
+        for name, (old, new) in functions.items():
+            old_us = min(timeit.repeat(lambda: old(text), number=number, repeat=3)) / number * 1e6
+            new_us = min(timeit.repeat(lambda: new(text), number=number, repeat=3)) / number * 1e6
+            results[f"{name}[{case}]"] = {
+                "old_us": round(old_us, 3),
+                "new_us": round(new_us, 3),
+                "speedup": round(old_us / new_us, 2) if new_us else None
+            }
+    return results
+
+
+def main():
+    results = run()
+    print(f"{'case':<32}{'old, us':>12}{'new, us':>12}{'speedup':>10}")
+    for case, result in results.items():
+        print(f"{case:<32}{result['old_us']:>12}{result['new_us']:>12}{result['speedup']:>9}x")
+
+
+if __name__ == "__main__":
+    main()
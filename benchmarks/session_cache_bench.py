@@ -0,0 +1,76 @@
+# benchmarks/session_cache_bench.py
+#
+# Measures the cost of storing and loading encrypted session strings, which
+# replaces the export/import handshakes on restart of memory and string
+# sessions. The time saved per client shows up as the "start" time in the
+# startup report of the StartupScheduler.
+#
+#   python -m benchmarks.session_cache_bench
+
+import base64
+import os
+import struct
+import tempfile
+import time
+from typing import Any, Dict
+
+from pyrogram.storage import Storage
+
+from utils.session_cache import SessionStringCache
+from utils.session_manager import is_valid_session_string
+
+API_ID = 123456
+
+
+def make_session_string(user_id: int) -> str:
+    """Build a well-formed, authorized session string with a random auth key."""
+    packed = struct.pack(
+        Storage.SESSION_STRING_FORMAT,
+        2, API_ID, False, os.urandom(256), user_id, False
+    )
+    return base64.urlsafe_b64encode(packed).decode().rstrip("=")
+
+
+def run(sessions: int = 1000) -> Dict[str, Any]:
+    """Store and load ``sessions`` strings and time each phase."""
+    strings = {f"user{i}": make_session_string(i + 1) for i in range(sessions)}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cache = SessionStringCache(workdir, "bench-secret", API_ID, False)
+
+        begin = time.perf_counter()
+        for name, session_string in strings.items():
+            cache.store(name, session_string)
+        store_seconds = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        loaded = {name: cache.load(name) for name in strings}
+        load_seconds = time.perf_counter() - begin
+
+    assert loaded == strings
+
+    begin = time.perf_counter()
+    for session_string in strings.values():
+        is_valid_session_string(session_string, API_ID, False)
+    validate_seconds = time.perf_counter() - begin
+
+    return {
+        'sessions': sessions,
+        'store_us': store_seconds / sessions * 1e6,
+        'load_us': load_seconds / sessions * 1e6,
+        'validate_us': validate_seconds / sessions * 1e6,
+        'load_all_ms': load_seconds * 1000
+    }
+
+
+def main():
+    result = run()
+    print(f"sessions:               {result['sessions']}")
+    print(f"store, us per session:  {result['store_us']:.1f}")
+    print(f"load, us per session:   {result['load_us']:.1f}  (decrypt, MAC and structural check)")
+    print(f"check only, us:         {result['validate_us']:.1f}")
+    print(f"load all, ms:           {result['load_all_ms']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+# benchmarks/suite.py
+#
+# Offline scaling benchmarks on simulated Telegram connections (see
+# fake_client.py), written as JSON so runs can be compared across versions:
+#
+#   startup    PyrogramMultiClient.start_all/stop_all for 1 to 1000 clients
+#   fanout     one tick of BotPeriodicTasks editing many live messages
+#   formatter  MessageFormatter.format_message throughput
+#
+#   python -m benchmarks.suite --output before.json
+#   python -m benchmarks.suite --output after.json --compare before.json
+#   python -m benchmarks.suite --flood-wait-rate 0.02 --disconnect-rate 0.02
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import pyrogram
+import yaml
+
+from benchmarks.fake_client import FakeClient, FakeNetwork, use_fake_client
+from benchmarks.message_formatter_bench import make_message
+from main import PyrogramMultiClient
+from plugins.bot_plugins.status import bot_periodic
+from utils.fanout import FanOutEngine
+from utils.logger import LoggerFactory
+from utils.message_formatter import MessageFormatter
+from utils.plugin_context import PluginContext
+
+API_HASH = "0" * 32
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def write_config(path: str, prefix: str, clients: int, max_concurrent: int, ramp_up_rate: float) -> None:
+    """Write a configuration with ``clients`` in-memory user clients without plugins."""
+    config = {
+        'startup': {
+            'max_concurrent': max_concurrent,
+            'per_dc_concurrency': 0,
+            'ramp_up_rate': ramp_up_rate,
+            'authorized_first': True
+        },
+        'logging': {'mode': 'queue', 'format': 'text'},
+        'reload': {'watch': False},
+        'clients': [
+            {
+                'session_name': f"{prefix}_{index}",
+                'type': 'user',
+                'api_id': 1,
+                'api_hash': API_HASH,
+                'in_memory': True,
+                'session': {'type': 'memory', 'cache': False},
+                'error_handler': {
+                    'max_retries': 5,
+                    'retry_delay': 0.05,
+                    'max_delay': 0.5,
+                    'circuit_failure_threshold': 5,
+                    'circuit_reset_timeout': 1
+                }
+            }
+            for index in range(clients)
+        ]
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+
+
+async def bench_startup(clients: int, network: FakeNetwork, max_concurrent: int,
+                        ramp_up_rate: float) -> Dict[str, Any]:
+    """Start and stop ``clients`` fake clients through PyrogramMultiClient."""
+    requests_before = dict(network.stats)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "config.yaml")
+        write_config(path, f"bench{clients}_{time.monotonic_ns()}", clients, max_concurrent, ramp_up_rate)
+
+        manager = PyrogramMultiClient(path)
+        with use_fake_client(network):
+            begin = time.perf_counter()
+            await manager.start_all()
+            start_seconds = time.perf_counter() - begin
+
+            started = len(manager.managers)
+            begin = time.perf_counter()
+            await manager.stop_all()
+            stop_seconds = time.perf_counter() - begin
+
+    ready = [r.ready_after for r in manager.startup_report.results.values() if r.success]
+    return {
+        'clients': clients,
+        'started': started,
+        'failed': clients - started,
+        'start_all_seconds': start_seconds,
+        'stop_all_seconds': stop_seconds,
+        'clients_per_second': started / start_seconds if start_seconds else 0.0,
+        'ready_p50_seconds': _percentile(ready, 0.5),
+        'ready_p95_seconds': _percentile(ready, 0.95),
+        **{key: network.stats[key] - requests_before[key] for key in network.stats}
+    }
+
+
+async def bench_fanout(sessions: int, network: FakeNetwork, concurrency: int) -> Dict[str, Any]:
+    """Run one BotPeriodicTasks tick in which all ``sessions`` messages are due."""
+    client = FakeClient(f"fanout_{concurrency}", api_id=1, api_hash=API_HASH, in_memory=True)
+    client.network = network
+    engine = FanOutEngine(client.name, concurrency, 0, 0)
+    engine.install()
+
+    context = PluginContext(client.name)
+    context.install()
+    tasks = bot_periodic.BotPeriodicTasks(client)
+    try:
+        for user_id in range(1, sessions + 1):
+            tasks.commands_handler.user_sessions.add(user_id, user_id, user_id)
+            tasks.refresh_wheel.schedule(user_id, 0)
+        # Let the wheel reach the tick the refreshes are due in
+        await asyncio.sleep(bot_periodic.TICK_INTERVAL)
+
+        requests_before = dict(network.stats)
+        begin = time.perf_counter()
+        await tasks.update_user_messages()
+        tick_seconds = time.perf_counter() - begin
+    finally:
+        context.uninstall()
+        engine.uninstall()
+
+    report = engine.last_report
+    return {
+        'sessions': sessions,
+        'concurrency': concurrency,
+        'tick_seconds': tick_seconds,
+        'completed': report.completed if report else 0,
+        'failed': len(report.failed) if report else 0,
+        'dropped': len(report.dropped) if report else 0,
+        'edits_per_second': report.completed / tick_seconds if report and tick_seconds else 0.0,
+        **{key: network.stats[key] - requests_before[key] for key in network.stats}
+    }
+
+
+def bench_formatter(number: int) -> Dict[str, Any]:
+    """Messages per second through MessageFormatter.format_message."""
+    formatter = MessageFormatter(FakeClient("bench_formatter", api_id=1, api_hash=API_HASH, in_memory=True))
+    results = {}
+    for parse_mode in ("HTML", "Markdown"):
+        for length in (64, 4096):
+            texts = [make_message(length, seed) for seed in range(16)]
+            begin = time.perf_counter()
+            for index in range(number):
+                formatter.format_message(texts[index % len(texts)], parse_mode)
+            seconds = time.perf_counter() - begin
+            results[f"{parse_mode.lower()}_{length}"] = {
+                'messages_per_second': number / seconds,
+                'us_per_message': seconds / number * 1e6
+            }
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, timeout=10,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    network = FakeNetwork(
+        latency=args.latency,
+        jitter=args.latency / 2,
+        flood_wait_rate=args.flood_wait_rate,
+        flood_wait_seconds=args.flood_wait_seconds,
+        disconnect_rate=args.disconnect_rate,
+        seed=args.seed
+    )
+    results: Dict[str, Any] = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'pyrogram': pyrogram.__version__,
+            'platform': platform.platform(),
+            'network': {
+                'latency': network.latency,
+                'jitter': network.jitter,
+                'flood_wait_rate': network.flood_wait_rate,
+                'flood_wait_seconds': network.flood_wait_seconds,
+                'disconnect_rate': network.disconnect_rate,
+                'seed': network.seed
+            },
+            'startup': {'max_concurrent': args.max_concurrent, 'ramp_up_rate': args.ramp_up_rate}
+        }
+    }
+
+    if "startup" in args.scenarios:
+        results['startup'] = [
+            await bench_startup(clients, network, args.max_concurrent, args.ramp_up_rate)
+            for clients in args.clients
+        ]
+    if "fanout" in args.scenarios:
+        results['fanout'] = [
+            await bench_fanout(args.sessions, network, concurrency)
+            for concurrency in args.concurrency
+        ]
+    if "formatter" in args.scenarios:
+        results['formatter'] = bench_formatter(args.messages)
+    return results
+
+
+def _flatten(results: Dict[str, Any]) -> Dict[str, float]:
+    """Map every numeric result to a stable name, e.g. ``startup[100].start_all_seconds``."""
+    flat = {}
+    for run_result in results.get('startup', []):
+        for key, value in run_result.items():
+            flat[f"startup[{run_result['clients']}].{key}"] = value
+    for run_result in results.get('fanout', []):
+        for key, value in run_result.items():
+            flat[f"fanout[{run_result['sessions']}x{run_result['concurrency']}].{key}"] = value
+    for case, case_result in results.get('formatter', {}).items():
+        for key, value in case_result.items():
+            flat[f"formatter[{case}].{key}"] = value
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Format the change of every result present in both runs."""
+    old, new = _flatten(baseline), _flatten(current)
+    lines = [f"{'result':<52}{'baseline':>14}{'current':>14}{'change':>10}"]
+    for name, value in new.items():
+        if name not in old:
+            continue
+        change = f"{(value - old[name]) / old[name] * 100:+.1f}%" if old[name] else "-"
+        lines.append(f"{name:<52}{old[name]:>14.4g}{value:>14.4g}{change:>10}")
+    return lines
+
+
+def _print_summary(results: Dict[str, Any]) -> None:
+    for run_result in results.get('startup', []):
+        print(
+            f"startup  {run_result['clients']:>5} clients: start_all {run_result['start_all_seconds']:.2f}s "
+            f"({run_result['clients_per_second']:.0f}/s, p95 ready {run_result['ready_p95_seconds']:.2f}s), "
+            f"stop_all {run_result['stop_all_seconds']:.2f}s, failed {run_result['failed']}, "
+            f"flood waits {run_result['flood_waits']}, disconnects {run_result['disconnects']}"
+        )
+    for run_result in results.get('fanout', []):
+        print(
+            f"fanout   {run_result['sessions']:>5} edits x{run_result['concurrency']:<3}: "
+            f"tick {run_result['tick_seconds']:.2f}s ({run_result['edits_per_second']:.0f} edits/s), "
+            f"failed {run_result['failed']}, dropped {run_result['dropped']}"
+        )
+    for case, case_result in results.get('formatter', {}).items():
+        print(
+            f"format   {case:<14}: {case_result['messages_per_second']:.0f} messages/s "
+            f"({case_result['us_per_message']:.1f} us)"
+        )
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks on simulated Telegram connections")
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=["startup", "fanout", "formatter"],
+                        help="comma-separated scenarios: startup, fanout, formatter")
+    parser.add_argument("--clients", type=_int_list, default=[1, 10, 100, 1000],
+                        help="client counts of the startup scenario")
+    parser.add_argument("--sessions", type=int, default=1000, help="live messages of the fan-out tick")
+    parser.add_argument("--concurrency", type=_int_list, default=[10, 100], help="fan-out concurrency levels")
+    parser.add_argument("--messages", type=int, default=20000, help="messages per formatter case")
+    parser.add_argument("--latency", type=float, default=0.02, help="mean simulated round trip in seconds")
+    parser.add_argument("--flood-wait-rate", type=float, default=0.0)
+    parser.add_argument("--flood-wait-seconds", type=int, default=1)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-concurrent", type=int, default=50, help="startup.max_concurrent of the clients")
+    parser.add_argument("--ramp-up-rate", type=float, default=0.0, help="startup.ramp_up_rate of the clients")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--verbose", action="store_true", help="show the log output of the managers")
+    args = parser.parse_args()
+
+    # Log files of the managers go to a scratch directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            # The generated configs use queue mode too, so the managers keep this console handler
+            LoggerFactory.configure(LoggerFactory.QUEUE, LoggerFactory.TEXT)
+            if not args.verbose:
+                LoggerFactory.get_console_handler().setLevel(logging.CRITICAL)
+            results = asyncio.run(run(args))
+        finally:
+            LoggerFactory.shutdown()
+            os.chdir(cwd)
+
+    _print_summary(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(results, baseline)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# benchmarks/update_injector.py
+#
+# Load test for plugin handlers: feeds synthetic private-chat messages into
+# a client's dispatcher at a target rate and measures how many the handlers
+# sustain. By default a bot with the shared bot plugins runs offline on a
+# FakeClient, once per worker count:
+#
+#   python -m benchmarks.update_injector --workers 2,8 --rate 200 --duration 5
+#   python -m benchmarks.update_injector --no-rate-limits --latency 0.05 --output load.json
+#
+# Latency is measured from putting an update on the dispatcher queue until
+# all handler groups have run for it, so updates stopped by StopPropagation
+# are not counted as completed.
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pyrogram import Client, raw
+from pyrogram.handlers import RawUpdateHandler
+
+from benchmarks.fake_client import FakeNetwork, use_fake_client
+from client_manager import ClientManager
+from config.settings import ClientConfig
+from utils.logger import LoggerFactory
+
+# Runs after every plugin handler group
+COMPLETION_GROUP = 2 ** 31
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class UpdateInjector:
+    def __init__(self, client: Client, users: int = 1000, text: str = "/start"):
+        """
+        Synthetic update source for one running client.
+
+        Updates go straight onto ``client.dispatcher.updates_queue`` as raw
+        ``UpdateNewMessage`` packets, so they are parsed and dispatched to the
+        registered handlers exactly like updates received from Telegram.
+
+        Args:
+            client: Started client whose dispatcher runs.
+            users: Number of distinct private chats the messages come from.
+            text: Text of every message.
+        """
+        self.client = client
+        self.users = users
+        self.text = text
+        self._enqueued_at: Dict[int, float] = {}
+        self._latencies: List[float] = []
+        self._last_completed = 0.0
+        self._handler = RawUpdateHandler(self._on_processed)
+        self._entities = (
+            [raw.types.MessageEntityBotCommand(offset=0, length=len(text.split()[0]))]
+            if text.startswith("/") else []
+        )
+
+    def make_update(self, message_id: int) -> Tuple[raw.base.Update, Dict[int, Any], Dict[int, Any]]:
+        """Build the dispatcher packet of one incoming private message."""
+        user_id = 1_000_000 + message_id % self.users
+        user = raw.types.User(id=user_id, first_name=f"load{user_id}", access_hash=0, restriction_reason=[])
+        peer = raw.types.PeerUser(user_id=user_id)
+        message = raw.types.Message(
+            id=message_id,
+            peer_id=peer,
+            from_id=peer,
+            date=int(time.time()),
+            message=self.text,
+            entities=self._entities
+        )
+        update = raw.types.UpdateNewMessage(message=message, pts=0, pts_count=0)
+        return update, {user_id: user}, {}
+
+    async def _on_processed(self, client: Client, update, users, chats) -> None:
+        if not isinstance(update, raw.types.UpdateNewMessage):
+            return
+        enqueued_at = self._enqueued_at.pop(update.message.id, None)
+        if enqueued_at is not None:
+            self._last_completed = time.perf_counter()
+            self._latencies.append(self._last_completed - enqueued_at)
+
+    async def install(self) -> None:
+        """Register the completion handler and wait until the dispatcher has it."""
+        dispatcher = self.client.dispatcher
+        dispatcher.add_handler(self._handler, COMPLETION_GROUP)
+        # The dispatcher adds handlers in a task; updates injected before that would be lost
+        while self._handler not in dispatcher.groups.get(COMPLETION_GROUP, []):
+            await asyncio.sleep(0.001)
+
+    def uninstall(self) -> None:
+        self.client.dispatcher.remove_handler(self._handler, COMPLETION_GROUP)
+
+    async def run(self, rate: float, duration: float, drain_timeout: float = 30.0,
+                  sample_interval: float = 0.1) -> Dict[str, Any]:
+        """
+        Inject ``rate`` updates per second for ``duration`` seconds.
+
+        Args:
+            rate: Target updates per second.
+            duration: Seconds of injection.
+            drain_timeout: Seconds to wait for the backlog after the last update.
+            sample_interval: Seconds between queue depth samples.
+
+        Returns:
+            Dict[str, Any]: Throughput, latency percentiles and queue growth.
+        """
+        queue = self.client.dispatcher.updates_queue
+        self._enqueued_at.clear()
+        self._latencies = []
+        total = int(rate * duration)
+        samples: List[Tuple[float, int]] = []
+
+        async def sample_queue():
+            while True:
+                samples.append((time.perf_counter() - begin, queue.qsize()))
+                await asyncio.sleep(sample_interval)
+
+        begin = time.perf_counter()
+        sampler = asyncio.create_task(sample_queue())
+        try:
+            sent = 0
+            while sent < total:
+                due = min(total, int((time.perf_counter() - begin) * rate) + 1)
+                while sent < due:
+                    sent += 1
+                    self._enqueued_at[sent] = time.perf_counter()
+                    queue.put_nowait(self.make_update(sent))
+                await asyncio.sleep(0.001)
+            injected_seconds = time.perf_counter() - begin
+            depth_after_injection = queue.qsize()
+
+            deadline = time.monotonic() + drain_timeout
+            while self._enqueued_at and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+        finally:
+            sampler.cancel()
+
+        completed = len(self._latencies)
+        busy_seconds = (self._last_completed - begin) if completed else 0.0
+        return {
+            'target_rate': rate,
+            'injected': total,
+            'injected_rate': total / injected_seconds if injected_seconds else 0.0,
+            'completed': completed,
+            'lost': len(self._enqueued_at),
+            'throughput': completed / busy_seconds if busy_seconds else 0.0,
+            'latency_p50': _percentile(self._latencies, 0.5),
+            'latency_p99': _percentile(self._latencies, 0.99),
+            'latency_max': max(self._latencies, default=0.0),
+            'queue_max': max((depth for _, depth in samples), default=0),
+            'queue_after_injection': depth_after_injection,
+            'queue_growth_per_second': depth_after_injection / injected_seconds if injected_seconds else 0.0
+        }
+
+
+def build_config(name: str, plugins_root: str, workers: int, rate_limits: bool) -> ClientConfig:
+    """Configuration of an offline bot running the plugins under ``plugins_root``."""
+    return ClientConfig.from_dict({
+        'session_name': name,
+        'type': 'bot',
+        'api_id': 1,
+        'api_hash': "0" * 32,
+        'bot_token': "1:offline",
+        'in_memory': True,
+        'workers': workers,
+        'session': {'type': 'memory', 'cache': False},
+        'plugins': {'enabled': True, 'root': plugins_root},
+        'rate_limits': {'enabled': rate_limits}
+    })
+
+
+async def run_load(plugins_root: str, workers: int, rate: float, duration: float,
+                   network: FakeNetwork, rate_limits: bool = True,
+                   users: int = 1000) -> Optional[Dict[str, Any]]:
+    """Start an offline bot with ``workers`` handler workers and inject load into it."""
+    manager = ClientManager(build_config(f"load_w{workers}", plugins_root, workers, rate_limits))
+    with use_fake_client(network):
+        if not await manager.start():
+            return None
+        injector = UpdateInjector(manager.client, users)
+        await injector.install()
+        try:
+            result = await injector.run(rate, duration)
+        finally:
+            injector.uninstall()
+            await manager.stop()
+    return {'workers': workers, **result}
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inject synthetic messages into an offline bot")
+    parser.add_argument("--plugins", default="plugins/bot_plugins/status", help="plugin root of the bot")
+    parser.add_argument("--workers", type=_int_list, default=[2, 8], help="handler worker counts to compare")
+    parser.add_argument("--rate", type=float, default=200.0, help="target messages per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of injection")
+    parser.add_argument("--users", type=int, default=1000, help="distinct chats the messages come from")
+    parser.add_argument("--latency", type=float, default=0.02, help="mean simulated round trip in seconds")
+    parser.add_argument("--no-rate-limits", action="store_true", help="disable the client's outbound rate limits")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the log output of the client")
+    args = parser.parse_args()
+
+    LoggerFactory.configure(LoggerFactory.QUEUE, LoggerFactory.TEXT)
+    if not args.verbose:
+        LoggerFactory.get_console_handler().setLevel(logging.CRITICAL)
+
+    network = FakeNetwork(latency=args.latency, jitter=args.latency / 2)
+
+    async def run_all():
+        return [
+            await run_load(args.plugins, workers, args.rate, args.duration, network,
+                           not args.no_rate_limits, args.users)
+            for workers in args.workers
+        ]
+
+    try:
+        results = asyncio.run(run_all())
+    finally:
+        LoggerFactory.shutdown()
+
+    for result in results:
+        if result is None:
+            print("client failed to start")
+            continue
+        print(
+            f"workers {result['workers']:>3}: {result['throughput']:.0f}/s of {result['target_rate']:.0f}/s target, "
+            f"p50 {result['latency_p50'] * 1000:.0f} ms, p99 {result['latency_p99'] * 1000:.0f} ms, "
+            f"queue max {result['queue_max']}, growth {result['queue_growth_per_second']:.0f}/s, "
+            f"lost {result['lost']}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,38 +6,107 @@ from typing import Optional, Dict, Any, Tuple
 
 from pyrogram import Client, enums
 from pyrogram.errors import (
-    FloodWait
+    FloodWait, Unauthorized
 )
 
 from config.settings import ClientConfig
 from utils.error_handler import EnhancedErrorHandler
+from utils.fanout import FanOutEngine
+from utils.handler_metrics import HandlerInstrumentation
+from utils.identity_cache import IdentityCache
 from utils.logger import get_logger
 from utils.message_formatter import MessageFormatter
+from utils.metrics import install_rpc_metrics
+from utils.plugin_context import PluginContext
+from utils.rate_limiter import ClientRateLimiter
+from utils.render_cache import RenderCache
+from utils.retry import BackoffPolicy, CircuitBreaker
+from utils.scheduler import ClientScheduler, SharedScheduler
+from utils.session_cache import SessionStringCache
 from utils.session_manager import SessionManager, SessionType
+from utils.worker_pool import WorkerPoolAutoscaler
 
 
 class ClientManager:
-    MAX_RETRIES = 3
-    RETRY_DELAY = 5
-
-    def __init__(self, config: ClientConfig):
+    def __init__(self, config: ClientConfig, shared_scheduler: Optional[SharedScheduler] = None,
+                 rpc_metrics: bool = False):
         """
         Initialize the client manager with extended capabilities.
 
         Args:
             config: Client configuration.
+            shared_scheduler: Process-wide scheduler for periodic tasks.
+                A private one is created if not given.
+            rpc_metrics: Record latency and errors of the client's raw calls.
         """
         self.config = config
+        self.rpc_metrics = rpc_metrics
         self.logger = get_logger(f"{config.type}_{config.session_name}")
         self.client: Optional[Client] = None
-        self.scheduler = None
-        self._retry_count = 0
+        self.shared_scheduler = shared_scheduler
+        self.scheduler: Optional[ClientScheduler] = None
+        self._owns_scheduler = shared_scheduler is None
         self._is_stopping = False
+        self._stop_event = asyncio.Event()
+
+        # Retry behaviour of start()
+        error_handler = config.error_handler
+        self.backoff = BackoffPolicy(
+            error_handler.retry_delay,
+            error_handler.max_delay,
+            error_handler.backoff_multiplier
+        )
+        self.circuit = CircuitBreaker.for_client(
+            config.session_name,
+            error_handler.circuit_failure_threshold,
+            error_handler.circuit_reset_timeout
+        )
+        self.retry_stats = {
+            'attempts': 0,
+            'retries': 0,
+            'backoff_seconds': 0.0,
+            'last_error': None
+        }
 
         # Additional managers will be initialized after creating the client
         self.error_handler: Optional[EnhancedErrorHandler] = None
         self.session_manager: Optional[SessionManager] = None
         self.message_formatter: Optional[MessageFormatter] = None
+        self.rate_limiter: Optional[ClientRateLimiter] = None
+        self.handler_metrics: Optional[HandlerInstrumentation] = None
+        self.identity: Optional[IdentityCache] = None
+        self.fanout: Optional[FanOutEngine] = None
+        self.render_cache: Optional[RenderCache] = None
+        self.plugin_context: Optional[PluginContext] = None
+        self.worker_pool: Optional[WorkerPoolAutoscaler] = None
+
+        # Exported strings of memory/string sessions are cached to skip login on restart
+        self.session_type = self._get_session_type()
+        self.session_cache: Optional[SessionStringCache] = None
+        if config.session.cache and self.session_type != SessionType.FILE:
+            self.session_cache = SessionStringCache.for_client(
+                config.session_name,
+                config.api_id,
+                config.session.workdir,
+                config.test_mode
+            )
+
+    def _get_session_type(self) -> SessionType:
+        """Get the session type from the configuration."""
+        if self.config.session.type == SessionType.STRING.value or self.config.session.string:
+            return SessionType.STRING
+        if self.config.in_memory or self.config.session.type == SessionType.MEMORY.value:
+            return SessionType.MEMORY
+        return SessionType.FILE
+
+    def _get_session_string(self) -> Optional[str]:
+        """Get the configured session string, or the cached one."""
+        session_string = self.config.session_string or self.config.session.string
+        if not session_string and self.session_cache:
+            session_string = self.session_cache.load(self.config.session_name)
+            if session_string:
+                self.logger.info("Using cached session string")
+        return session_string
 
     def _build_client_config(self) -> Dict[str, Any]:
         """Build the configuration for the Pyrogram client."""
@@ -50,10 +119,10 @@ class ClientManager:
             "system_version": self.config.system_version,
             "lang_code": self.config.lang_code,
             "ipv6": self.config.ipv6,
-            "proxy": self.config.proxy,
+            "proxy": dict(self.config.proxy) if self.config.proxy else None,
             "test_mode": self.config.test_mode,
             "bot_token": self.config.bot_token,
-            "session_string": self.config.session_string,
+            "session_string": self._get_session_string(),
             "in_memory": self.config.in_memory,
             "phone_number": self.config.phone_number,
             "phone_code": self.config.phone_code,
@@ -88,16 +157,39 @@ class ClientManager:
             client_config = self._build_client_config()
             self.client = Client(**client_config)
 
+            # Measure raw calls before the rate limiter wraps them, so throttling is not counted
+            if self.rpc_metrics:
+                install_rpc_metrics(self.client)
+
+            # Throttle outbound calls before Telegram has to
+            if self.config.rate_limits.enabled:
+                self.rate_limiter = ClientRateLimiter(self.config.session_name, self.config.rate_limits)
+                self.rate_limiter.install(self.client)
+
+            # Time plugin handlers; installed before start, which loads the plugins
+            if self.config.handler_metrics.enabled:
+                self.handler_metrics = HandlerInstrumentation(
+                    self.config.session_name,
+                    self.config.handler_metrics.sample_rate
+                )
+                self.handler_metrics.install(self.client)
+
+            # Shared plugin packages read this client's settings and keep its state here
+            self.plugin_context = PluginContext(self.config.session_name, self.config)
+            self.plugin_context.install()
+
             # Initialize additional managers
             self.error_handler = EnhancedErrorHandler(
                 self.client,
                 f"ErrorHandler_{self.config.session_name}",
-                self.config.sleep_threshold
+                self.config.sleep_threshold,
+                self.rate_limiter
             )
 
             self.session_manager = SessionManager(
                 self.client,
-                SessionType.MEMORY if self.config.in_memory else SessionType.FILE
+                self.session_type,
+                self.session_cache
             )
 
             self.message_formatter = MessageFormatter(self.client)
@@ -120,11 +212,27 @@ class ClientManager:
         self.logger.error(f"Error handler not initialized, using basic error handling: {error}")
         if isinstance(error, FloodWait):
             return True, error.value
-        return True, self.RETRY_DELAY
+        return True, self.config.error_handler.retry_delay
 
     async def start(self):
-        """Start the client with error handling and retries."""
-        while not self._is_stopping and self._retry_count < self.MAX_RETRIES:
+        """
+        Start the client with error handling and retries.
+
+        Retries wait with exponential backoff and full jitter, FloodWaits wait
+        the required time plus jitter. Consecutive failures open the client's
+        circuit breaker; while it is open, start() gives up right away and the
+        first start after the reset timeout makes a half-open probe. ``stop()``
+        interrupts the waits between attempts.
+        """
+        max_retries = self.config.error_handler.max_retries
+        attempt = 0
+        while not self._is_stopping and attempt < max_retries:
+            wait = self.circuit.time_until_probe()
+            if wait > 0:
+                self.logger.warning(f"Circuit open after repeated failures, not starting for {wait:.1f}s")
+                return False
+
+            self.retry_stats['attempts'] += 1
             try:
                 if not self.client:
                     self.client = await self._init_client()
@@ -132,7 +240,12 @@ class ClientManager:
                 if not self.client.is_connected:
                     await self.client.start()
 
-                me = await self.client.get_me()
+                # Identity is filled from the start handshake and shared with plugins;
+                # retries reuse the client's cache instead of stacking handlers
+                if self.identity is None or self.identity.client is not self.client:
+                    self.identity = IdentityCache(self.client, self.config.identity_cache_ttl)
+                self.identity.install()
+                me = await self.identity.get()
                 self.logger.info(
                     f"Started as {me.first_name or '???'} "
                     f"(ID: {me.id}, Type: {self.config.type})"
@@ -142,42 +255,111 @@ class ClientManager:
                 if self.scheduler:
                     self.logger.info("Scheduler initialized")
 
-                self._retry_count = 0
+                if self.config.autoscale.enabled and not self.worker_pool:
+                    self.worker_pool = WorkerPoolAutoscaler(self.client, self.config.autoscale, self.handler_metrics)
+                    self.worker_pool.start()
+
+                await self._cache_session_string()
+
+                self.circuit.record_success()
                 return True
 
             except Exception as e:
+                if isinstance(e, Unauthorized) and self.session_cache:
+                    self.session_cache.invalidate(self.config.session_name)
+                self.circuit.record_failure()
+                self.retry_stats['last_error'] = f"{type(e).__name__}: {e}"
                 should_retry, delay = await self._handle_error(e)
                 if not should_retry:
                     return False
 
-                if not self._is_stopping:
-                    await asyncio.sleep(delay)
-                    self._retry_count += 1
+                attempt += 1
+                if self._is_stopping or attempt >= max_retries:
+                    break
+
+                if self.circuit.state == CircuitBreaker.OPEN:
+                    self.logger.error(
+                        f"Circuit opened after {self.circuit.failures} failure(s), "
+                        f"not starting for {self.circuit.reset_timeout:.0f}s"
+                    )
+                    return False
+
+                if isinstance(e, FloodWait):
+                    delay = self.backoff.after(delay)
+                else:
+                    delay = self.backoff.delay(attempt - 1)
+                self.logger.info(f"Retrying start in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+                self.retry_stats['retries'] += 1
+                self.retry_stats['backoff_seconds'] += delay
+                if await self._wait_for_stop(delay):
+                    return False
 
         if not self._is_stopping:
-            self.logger.error(f"Failed to start after {self.MAX_RETRIES} attempts")
+            self.logger.error(f"Failed to start after {max_retries} attempts")
         return False
 
-    async def _init_scheduler(self):
-        """Initialize the scheduler for periodic tasks."""
+    async def _wait_for_stop(self, delay: float) -> bool:
+        """Sleep for ``delay`` seconds, returning early with True if ``stop()`` is called."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _cache_session_string(self) -> None:
+        """Store the current session string, so the next start skips the login."""
+        if not self.session_cache:
+            return
+        try:
+            session_string = await self.client.export_session_string()
+        except Exception as e:
+            self.logger.warning(f"Failed to export session string for the cache: {e}")
+            return
+        if session_string != self.session_manager.session_string:
+            self.session_cache.store(self.config.session_name, session_string)
+            self.session_manager.session_string = session_string
+
+    async def _init_scheduler(self) -> Optional[ClientScheduler]:
+        """Register periodic tasks in this client's namespace of the shared scheduler."""
         if not self.config.periodic_tasks.enabled:
             return None
 
+        namespace = None
         try:
+            if self.shared_scheduler is None:
+                self.shared_scheduler = SharedScheduler()
+            if not self.shared_scheduler.running:
+                self.shared_scheduler.start()
+
             module = importlib.import_module(self.config.periodic_tasks.schedule_module)
             schedule_function = getattr(module, self.config.periodic_tasks.schedule_function)
 
-            return schedule_function(
-                self.client,
-                self.config.periodic_tasks.tasks
+            # Periodic tasks send their per-tick calls through the client's fan-out engine
+            self.fanout = FanOutEngine(
+                self.config.session_name,
+                self.config.periodic_tasks.max_concurrency,
+                self.config.periodic_tasks.rate_limit,
+                self.config.periodic_tasks.per_chat_rate_limit
             )
+            self.fanout.install()
+            self.render_cache = RenderCache(self.config.session_name)
+            self.render_cache.install()
+
+            namespace = self.shared_scheduler.namespace(self.config.session_name)
+            if schedule_function(self.client, self.config.periodic_tasks.tasks, namespace) is None:
+                namespace.shutdown()
+                return None
+            return namespace
         except Exception as e:
             self.logger.error(f"Scheduler initialization failed: {e}")
+            if namespace:
+                namespace.shutdown()
             return None
 
     async def stop(self):
         """Gracefully shutdown the client and all components."""
         self._is_stopping = True
+        self._stop_event.set()
         try:
             if self.scheduler:
                 self.logger.info("Stopping scheduler...")
@@ -187,6 +369,24 @@ class ClientManager:
                 except Exception as e:
                     self.logger.error(f"Error stopping scheduler: {e}")
 
+            if self._owns_scheduler and self.shared_scheduler:
+                self.shared_scheduler.shutdown()
+
+            if self.worker_pool:
+                await self.worker_pool.stop()
+
+            if self.fanout:
+                self.fanout.uninstall()
+
+            if self.render_cache:
+                self.render_cache.uninstall()
+
+            if self.identity:
+                self.identity.uninstall()
+
+            if self.plugin_context:
+                self.plugin_context.uninstall()
+
             if self.client and self.client.is_connected:
                 self.logger.info("Stopping client...")
                 try:
@@ -203,8 +403,43 @@ class ClientManager:
             self.error_handler = None
             self.session_manager = None
             self.message_formatter = None
+            self.rate_limiter = None
+            self.handler_metrics = None
+            self.identity = None
+            self.fanout = None
+            self.render_cache = None
+            self.plugin_context = None
+            self.worker_pool = None
             self._is_stopping = False
+            self._stop_event.clear()
 
     def get_formatter(self) -> Optional[MessageFormatter]:
         """Get the message formatter."""
         return self.message_formatter
+
+    def get_identity(self) -> Optional[IdentityCache]:
+        """Get the identity cache."""
+        return self.identity
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get the statistics of the client and all its components."""
+        return {
+            'type': self.config.type,
+            'connected': bool(self.client and self.client.is_connected),
+            'updates_queue': self.client.dispatcher.updates_queue.qsize() if self.client else 0,
+            'errors': self.error_handler.get_error_statistics() if self.error_handler else None,
+            'retries': self.get_retry_statistics(),
+            'session': self.session_manager.get_session_info() if self.session_manager else None,
+            'identity': self.identity.get_statistics() if self.identity else None,
+            'fanout': self.fanout.get_statistics() if self.fanout else None,
+            'render_cache': self.render_cache.get_statistics() if self.render_cache else None,
+            'handlers': self.handler_metrics.get_statistics() if self.handler_metrics else None,
+            'workers': self.worker_pool.get_statistics() if self.worker_pool else None
+        }
+
+    def get_retry_statistics(self) -> Dict[str, Any]:
+        """Get start retry and circuit breaker statistics."""
+        return {
+            **self.retry_stats,
+            'circuit': self.circuit.get_statistics()
+        }
@@ -0,0 +1,140 @@
+# config/compiled_cache.py
+
+import functools
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+
+# Environment variable selecting the compiled config cache: "auto" (default,
+# used when PyYAML has no C loader), "on" or "off"
+COMPILED_CONFIG_ENV = "CONFIG_COMPILED_CACHE"
+
+FORMAT_VERSION = 1
+
+
+@functools.lru_cache(maxsize=1)
+def schema_fingerprint() -> str:
+    """Fingerprint of the config classes; snapshots written by other code versions are ignored."""
+    source = Path(settings.__file__).read_bytes()
+    version = f"{FORMAT_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}".encode()
+    return hashlib.sha256(version + source).hexdigest()
+
+
+def cache_enabled(setting: Optional[str] = None) -> bool:
+    """
+    Check whether the compiled config cache should be used.
+
+    Args:
+        setting: "auto", "on" or "off"; defaults to the ``CONFIG_COMPILED_CACHE``
+            environment variable.
+    """
+    setting = (setting or os.environ.get(COMPILED_CONFIG_ENV) or "auto").lower()
+    if setting in ("on", "1", "true"):
+        return True
+    if setting in ("off", "0", "false"):
+        return False
+    import yaml
+    return not yaml.__with_libyaml__
+
+
+class CompiledConfigCache:
+    PREFIX = "."
+    SUFFIX = ".compiled"
+
+    def __init__(self, config_path: str):
+        """
+        Binary snapshot of a parsed configuration file, stored next to it.
+
+        The snapshot holds the top-level settings and the parsed ``ClientConfig``
+        list of every client. It is current while the file has the modification
+        time and size it was written for, or, after a touch or a copy, the same
+        SHA-256 digest. Snapshots of other versions of the config classes are
+        ignored. The file is only readable by its owner, as it contains the
+        credentials of the configuration.
+
+        Args:
+            config_path: Path to the YAML configuration file.
+        """
+        self.config_path = Path(config_path)
+        self.path = self.config_path.with_name(f"{self.PREFIX}{self.config_path.name}{self.SUFFIX}")
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0
+        }
+
+    def load(self) -> Optional[Tuple[Dict[str, Any], List[settings.ClientConfig]]]:
+        """
+        Get the snapshot of the configuration file if it is current.
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], List[ClientConfig]]]: The top-level
+            settings without ``clients`` and the parsed clients, or None.
+        """
+        try:
+            stat = self.config_path.stat()
+            with open(self.path, "rb") as f:
+                header = pickle.load(f)
+                if header.get('schema') != schema_fingerprint():
+                    raise ValueError("snapshot of other config classes")
+                if (header['mtime_ns'], header['size']) != (stat.st_mtime_ns, stat.st_size):
+                    if header['sha256'] != hashlib.sha256(self.config_path.read_bytes()).hexdigest():
+                        raise ValueError("configuration changed")
+                config, clients = pickle.load(f)
+        except Exception:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return config, clients
+
+    def store(self, stat: os.stat_result, source: bytes, config: Dict[str, Any],
+              clients: List[settings.ClientConfig]) -> bool:
+        """
+        Write the snapshot of a parsed configuration file.
+
+        Args:
+            stat: Status of the file taken before ``source`` was read.
+            source: Content of the file that was parsed.
+            config: Top-level settings without ``clients``.
+            clients: Parsed configuration of every client.
+
+        Returns:
+            bool: True if the snapshot was written.
+        """
+        header = {
+            'schema': schema_fingerprint(),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': hashlib.sha256(source).hexdigest()
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump((config, clients), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except (OSError, pickle.PicklingError):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        self.stats['stores'] += 1
+        return True
+
+    def invalidate(self) -> None:
+        """Remove the snapshot."""
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache hit and store counters."""
+        return {'path': str(self.path), **self.stats}
@@ -1,45 +1,408 @@
 # config/settings.py
 
-from dataclasses import dataclass
+import functools
+import zlib
+from collections import abc
+from dataclasses import dataclass, is_dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union, get_type_hints
 
-import yaml
 
+def shard_of(session_name: str, shards: int) -> int:
+    """Get the stable shard index of a session (the same in every process and run)."""
+    return zlib.crc32(session_name.encode("utf-8")) % shards
 
-@dataclass
+
+def merge_config(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge ``override`` over ``base`` without copying unchanged sections.
+
+    Nested mappings are merged key by key, any other value of ``override``
+    replaces the one in ``base``. Sections that ``override`` does not touch
+    are the same objects as in ``base``.
+    """
+    if not base:
+        return override
+    if not override:
+        return base
+    merged = dict(base)
+    for key, value in override.items():
+        current = merged.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            merged[key] = merge_config(current, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class ConfigError(ValueError):
+    def __init__(self, source: str, errors: List[str]):
+        """
+        Invalid configuration.
+
+        Args:
+            source: File or entry the errors were found in.
+            errors: Every problem found, one message each.
+        """
+        self.source = source
+        self.errors = list(errors)
+        lines = "\n".join(f"  - {error}" for error in self.errors)
+        super().__init__(f"{len(self.errors)} error(s) in {source}:\n{lines}")
+
+
+class FrozenMapping(abc.Mapping):
+    """Read-only mapping of a configuration value; hashable and picklable, unlike ``MappingProxyType``."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping):
+        self._data = {key: _readonly(value) for key, value in data.items()}
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self._data.items()))
+
+    def __repr__(self) -> str:
+        return f"FrozenMapping({self._data!r})"
+
+    def __reduce__(self):
+        return FrozenMapping, (self._data,)
+
+
+def _readonly(value: Any) -> Any:
+    """Read-only copy of a parsed configuration value: lists become tuples and mappings ``FrozenMapping``."""
+    if isinstance(value, (str, int, float, FrozenMapping)) or value is None:
+        return value
+    if isinstance(value, abc.Mapping):
+        return FrozenMapping(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_readonly(item) for item in value)
+    return value
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a parsed configuration value."""
+    if isinstance(value, (str, int, float)) or value is None:
+        return type(value), value
+    if isinstance(value, abc.Mapping):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return type(value), value
+
+
+def _share(components: Optional[Dict[Any, Any]], component: Any) -> Any:
+    """Return the equal component parsed earlier for another client, or remember this one."""
+    if components is None:
+        return component
+    key = (type(component), tuple(_freeze(getattr(component, name)) for name in component.__slots__))
+    return components.setdefault(key, component)
+
+
+def config_record(cls):
+    """
+    Make ``cls`` a frozen dataclass with ``__slots__``.
+
+    Records have no per-instance ``__dict__`` and cannot be changed after
+    parsing. This is ``dataclass(frozen=True, slots=True)``, which needs
+    Python 3.10, with pickling that does not go through the frozen
+    ``__setattr__``.
+    """
+    names = tuple(cls.__annotations__)
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    namespace["__reduce__"] = lambda self: (type(self), tuple(getattr(self, name) for name in names))
+    return dataclass(frozen=True)(type(cls)(cls.__name__, cls.__bases__, namespace))
+
+
+def _describe(annotation: Any) -> str:
+    origin = getattr(annotation, "__origin__", None)
+    if origin is Union:
+        return " or ".join(_describe(arg) for arg in annotation.__args__ if arg is not type(None))
+    if origin in (list, tuple):
+        return "a list"
+    if origin in (dict, abc.Mapping) or is_dataclass(annotation):
+        return "a mapping"
+    names = {bool: "true or false", int: "an integer", float: "a number", str: "a string"}
+    return names.get(annotation, str(annotation))
+
+
+def _type_check(annotation: Any) -> Callable[[Any], bool]:
+    """Build the check of a raw YAML value against the annotation of the field it is parsed into."""
+    origin = getattr(annotation, "__origin__", None)
+    if origin is Union:
+        checks = [_type_check(arg) for arg in annotation.__args__]
+        return lambda value: any(check(value) for check in checks)
+    if origin in (list, tuple):
+        item = _type_check(annotation.__args__[0])
+        return lambda value: isinstance(value, (list, tuple)) and all(item(element) for element in value)
+    if origin in (dict, abc.Mapping) or is_dataclass(annotation):
+        return lambda value: isinstance(value, abc.Mapping)
+    if annotation is type(None):
+        return lambda value: value is None
+    if annotation is Any:
+        return lambda value: True
+    if annotation is float:
+        return lambda value: type(value) is float or type(value) is int
+    if annotation is int:
+        return lambda value: type(value) is int
+    # bool cannot be subclassed, and str and the rest are matched by type
+    return lambda value: isinstance(value, annotation)
+
+
+@functools.lru_cache(maxsize=None)
+def _schema(cls: type) -> Dict[str, Tuple[Callable[[Any], bool], str, bool]]:
+    """Type check, expected type and whether it is a nested record, of every field of a config record."""
+    return {
+        name: (_type_check(annotation), _describe(annotation), is_dataclass(annotation))
+        for name, annotation in get_type_hints(cls).items()
+    }
+
+
+def _check_section(cls: type, data: Any, where: str, errors: List[str], extra: Tuple[str, ...] = ()) -> None:
+    """
+    Check a section of the file against the record it is parsed into.
+
+    Values are checked against the annotations of the fields, and against the
+    ``CHOICES`` (accepted values) and ``RANGES`` (lowest and highest value,
+    None = unbounded) of the record.
+
+    Args:
+        cls: Config record of the section.
+        data: Raw section.
+        where: Position of the section, used as prefix of the messages.
+        errors: List the problems are appended to.
+        extra: Keys accepted besides the fields of ``cls``.
+    """
+    if not isinstance(data, abc.Mapping):
+        errors.append(f"{where}: expected a mapping, got {data!r}")
+        return
+    schema = _schema(cls)
+    choices = getattr(cls, "CHOICES", {})
+    ranges = getattr(cls, "RANGES", {})
+    for key, value in data.items():
+        field = schema.get(key)
+        if field is None:
+            if key not in extra:
+                errors.append(f"{where}.{key}: unknown key")
+            continue
+        matches, expected, nested = field
+        if nested:
+            continue  # nested sections are checked on their own
+        if not matches(value):
+            errors.append(f"{where}.{key}: expected {expected}, got {value!r}")
+        elif key in choices and value not in choices[key]:
+            errors.append(f"{where}.{key}: expected one of {', '.join(choices[key])}, got {value!r}")
+        elif key in ranges and value is not None:
+            low, high = ranges[key]
+            if value < low or (high is not None and value > high):
+                bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+                errors.append(f"{where}.{key}: must be {bounds}, got {value!r}")
+
+
+@config_record
 class PluginConfig:
     enabled: bool
     root: str
-    include: List[str]
-    exclude: List[str]
+    include: Tuple[str, ...]
+    exclude: Tuple[str, ...]
+    settings: Mapping[str, Any]  # parameters of shared plugin packages for this client
 
 
-@dataclass
+@config_record
 class PeriodicTasksConfig:
+    RANGES = {'max_concurrency': (1, None), 'rate_limit': (0, None), 'per_chat_rate_limit': (0, None)}
+
     enabled: bool
     schedule_module: str
     schedule_function: str
-    tasks: List[str]
+    tasks: Tuple[str, ...]
+    max_concurrency: int
+    rate_limit: float  # calls per second across all chats
+    per_chat_rate_limit: float  # calls per second to a single chat
 
 
-@dataclass
+@config_record
 class SessionConfig:
+    CHOICES = {'type': ('file', 'memory', 'string')}
+
     type: str  # file/memory/string
     string: Optional[str]
     workdir: str
     in_memory: bool
+    cache: bool  # keep exported session strings of memory/string sessions in an encrypted cache
 
 
-@dataclass
+@config_record
 class ErrorHandlerConfig:
+    RANGES = {
+        'sleep_threshold': (0, None),
+        'max_retries': (0, None),
+        'retry_delay': (0, None),
+        'max_delay': (0, None),
+        'backoff_multiplier': (1, None),
+        'circuit_failure_threshold': (0, None),
+        'circuit_reset_timeout': (0, None)
+    }
+
     sleep_threshold: int
     max_retries: int
-    retry_delay: int
+    retry_delay: float  # upper bound of the first backoff delay
+    max_delay: float  # cap of the backoff delay
+    backoff_multiplier: float
+    circuit_failure_threshold: int  # consecutive failures that open the circuit, 0 = never
+    circuit_reset_timeout: float  # seconds the circuit stays open before a probe
+
+
+@config_record
+class RateLimitConfig:
+    RANGES = {
+        'send': (0, None),
+        'edit': (0, None),
+        'resolve': (0, None),
+        'min_rate_factor': (0, 1),
+        'decrease_factor': (0, 1),
+        'recovery_interval': (0, None)
+    }
+
+    enabled: bool
+    send: float  # calls per second, 0 = unlimited
+    edit: float
+    resolve: float
+    min_rate_factor: float  # lowest rate as a fraction of the configured one
+    decrease_factor: float  # rate multiplier applied on FloodWait
+    recovery_interval: float  # seconds without FloodWait before the rate is raised
+
+
+@config_record
+class HandlerMetricsConfig:
+    RANGES = {'sample_rate': (0, 1)}
+
+    enabled: bool
+    sample_rate: float  # fraction of handler calls that are timed
+
+
+@config_record
+class AutoscaleConfig:
+    RANGES = {
+        'min_workers': (1, None),
+        'max_workers': (1, None),
+        'interval': (0.1, None),
+        'scale_up_depth': (1, None),
+        'latency_target': (0, None),
+        'scale_down_after': (1, None)
+    }
+
+    enabled: bool
+    min_workers: int
+    max_workers: int
+    interval: float  # seconds between scaling decisions
+    scale_up_depth: int  # queued updates that grow the pool
+    latency_target: float  # mean handler seconds above which a non-empty queue grows the pool
+    scale_down_after: int  # idle checks before the pool gives up one worker
+
+
+@config_record
+class StartupConfig:
+    RANGES = {'max_concurrent': (0, None), 'per_dc_concurrency': (0, None), 'ramp_up_rate': (0, None)}
+
+    max_concurrent: int  # 0 = unlimited
+    per_dc_concurrency: int  # 0 = unlimited
+    ramp_up_rate: float  # clients launched per second, 0 = no pacing
+    authorized_first: bool
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StartupConfig':
+        return cls(
+            max_concurrent=int(data.get('max_concurrent', 20)),
+            per_dc_concurrency=int(data.get('per_dc_concurrency', 10)),
+            ramp_up_rate=float(data.get('ramp_up_rate', 5.0)),
+            authorized_first=data.get('authorized_first', True)
+        )
+
+
+@config_record
+class LoggingConfig:
+    CHOICES = {'mode': ('sync', 'queue'), 'format': ('text', 'json')}
+
+    mode: str  # "sync" or "queue"
+    format: str  # "text" or "json" (JSON lines)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LoggingConfig':
+        return cls(
+            mode=data.get('mode', 'sync'),
+            format=data.get('format', 'text')
+        )
+
+
+@config_record
+class ReloadConfig:
+    RANGES = {'poll_interval': (0.1, None)}
+
+    watch: bool  # poll config.yaml for changes
+    poll_interval: float  # seconds between modification time checks
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ReloadConfig':
+        return cls(
+            watch=data.get('watch', True),
+            poll_interval=float(data.get('poll_interval', 5.0))
+        )
 
 
-@dataclass
+@config_record
+class SupervisorConfig:
+    RANGES = {'workers': (1, None), 'stats_interval': (0.1, None), 'max_restart_delay': (0, None)}
+
+    workers: int  # worker processes, 1 = run in a single process
+    stats_interval: float  # seconds between stats reports of a worker
+    max_restart_delay: float  # cap of the restart backoff of crashed workers
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SupervisorConfig':
+        return cls(
+            workers=int(data.get('workers', 1)),
+            stats_interval=float(data.get('stats_interval', 30.0)),
+            max_restart_delay=float(data.get('max_restart_delay', 60.0))
+        )
+
+
+@config_record
+class MetricsConfig:
+    RANGES = {'port': (0, 65535)}
+
+    enabled: bool
+    host: str
+    port: int  # worker processes listen on port + worker index
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetricsConfig':
+        return cls(
+            enabled=data.get('enabled', False),
+            host=data.get('host', '127.0.0.1'),
+            port=int(data.get('port', 9090))
+        )
+
+
+@config_record
 class ClientConfig:
+    CHOICES = {'type': ('user', 'bot')}
+    RANGES = {
+        'workers': (1, None),
+        'sleep_threshold': (0, None),
+        'max_concurrent_transmissions': (1, None),
+        'identity_cache_ttl': (0, None)
+    }
+
     # Main parameters
     session_name: str
     type: str
@@ -54,7 +417,7 @@ class ClientConfig:
 
     # Network settings
     ipv6: bool
-    proxy: Optional[Dict[str, Any]]
+    proxy: Optional[Mapping[str, Any]]
     test_mode: bool
 
     # Authentication
@@ -68,6 +431,7 @@ class ClientConfig:
     workers: int
     sleep_threshold: int
     max_concurrent_transmissions: int
+    identity_cache_ttl: int
 
     # Message settings
     parse_mode: str
@@ -84,41 +448,161 @@ class ClientConfig:
     periodic_tasks: PeriodicTasksConfig
     session: SessionConfig
     error_handler: ErrorHandlerConfig
+    rate_limits: RateLimitConfig
+    handler_metrics: HandlerMetricsConfig
+    autoscale: AutoscaleConfig
+
+    # Sections of an entry and the records they are parsed into
+    COMPONENTS = {
+        'plugins': PluginConfig,
+        'periodic_tasks': PeriodicTasksConfig,
+        'session': SessionConfig,
+        'error_handler': ErrorHandlerConfig,
+        'rate_limits': RateLimitConfig,
+        'handler_metrics': HandlerMetricsConfig,
+        'autoscale': AutoscaleConfig
+    }
+
+    # Keys accepted at the top level of an entry for older configuration files
+    LEGACY_KEYS = ('session_type', 'max_retries', 'retry_delay', 'max_delay', 'backoff_multiplier',
+                   'circuit_failure_threshold', 'circuit_reset_timeout')
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'ClientConfig':
+    def check(cls, data: Any, where: str, errors: List[str]) -> None:
+        """
+        Check one client entry before it is parsed.
+
+        Args:
+            data: Client entry with defaults and templates already applied.
+            where: Position of the entry, used as prefix of the messages.
+            errors: List the problems are appended to.
+        """
+        if not isinstance(data, abc.Mapping):
+            errors.append(f"{where}: expected a mapping, got {data!r}")
+            return
+        for key in ('session_name', 'type', 'api_id', 'api_hash'):
+            if data.get(key) is None:
+                errors.append(f"{where}.{key}: required")
+        if data.get('type') == 'bot' and not data.get('bot_token') and not data.get('session_string'):
+            errors.append(f"{where}.bot_token: required for bots without a session string")
+
+        # api_id is also accepted as a quoted number
+        api_id = data.get('api_id')
+        if isinstance(api_id, str) and api_id.isdigit():
+            data = {**data, 'api_id': int(api_id)}
+        _check_section(cls, data, where, errors, cls.LEGACY_KEYS)
+
+        session_type = data.get('session_type')
+        if session_type is not None and session_type not in SessionConfig.CHOICES['type']:
+            errors.append(f"{where}.session_type: expected one of {', '.join(SessionConfig.CHOICES['type'])}, "
+                          f"got {session_type!r}")
+        legacy_error_handler = {key: data[key] for key in _schema(ErrorHandlerConfig) if key in data}
+        for key, component in cls.COMPONENTS.items():
+            section = data.get(key) or {}
+            if key == 'error_handler' and isinstance(section, abc.Mapping):
+                section = {**legacy_error_handler, **section}
+            _check_section(component, section, f"{where}.{key}", errors)
+
+        autoscale = data.get('autoscale') or {}
+        if isinstance(autoscale, abc.Mapping):
+            low, high = autoscale.get('min_workers', 1), autoscale.get('max_workers')
+            if isinstance(low, int) and isinstance(high, int) and low > high:
+                errors.append(f"{where}.autoscale: min_workers {low} is above max_workers {high}")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any],
+                  components: Optional[Dict[Any, Any]] = None) -> 'ClientConfig':
+        """
+        Parse one client entry checked with ``check``.
+
+        Args:
+            data: Client entry with defaults and templates already applied.
+            components: Component configurations parsed for other clients.
+                Equal components are shared instead of stored once per client.
+        """
         # Plugin configuration
-        plugins_data = data.get('plugins', {})
+        plugins_data = data.get('plugins') or {}
         plugins = PluginConfig(
             enabled=plugins_data.get('enabled', False),
             root=plugins_data.get('root', ''),
-            include=plugins_data.get('include', []),
-            exclude=plugins_data.get('exclude', [])
+            include=_readonly(plugins_data.get('include') or ()),
+            exclude=_readonly(plugins_data.get('exclude') or ()),
+            settings=_readonly(plugins_data.get('settings') or {})
         )
+        plugins = _share(components, plugins)
 
         # Periodic tasks configuration
-        periodic_tasks_data = data.get('periodic_tasks', {})
+        periodic_tasks_data = data.get('periodic_tasks') or {}
         periodic_tasks = PeriodicTasksConfig(
             enabled=periodic_tasks_data.get('enabled', False),
             schedule_module=periodic_tasks_data.get('schedule_module', ''),
             schedule_function=periodic_tasks_data.get('schedule_function', ''),
-            tasks=periodic_tasks_data.get('tasks', [])
+            tasks=_readonly(periodic_tasks_data.get('tasks') or ()),
+            max_concurrency=periodic_tasks_data.get('max_concurrency', 10),
+            rate_limit=periodic_tasks_data.get('rate_limit', 25.0),
+            per_chat_rate_limit=periodic_tasks_data.get('per_chat_rate_limit', 1.0)
         )
+        periodic_tasks = _share(components, periodic_tasks)
 
         # Session configuration
+        session_data = data.get('session') or {}
         session = SessionConfig(
-            type=data.get('session_type', 'file'),
-            string=data.get('session_string'),
-            workdir=data.get('workdir', 'sessions'),
-            in_memory=data.get('in_memory', False)
+            type=session_data.get('type', data.get('session_type', 'file')),
+            string=session_data.get('string') or data.get('session_string'),
+            workdir=session_data.get('workdir', data.get('workdir', 'sessions')),
+            in_memory=session_data.get('in_memory', data.get('in_memory', False)),
+            cache=session_data.get('cache', False)
         )
+        session = _share(components, session)
 
-        # Error handler configuration
+        # Error handler configuration (top-level keys are still accepted)
+        error_handler_data = {**data, **(data.get('error_handler') or {})}
         error_handler = ErrorHandlerConfig(
-            sleep_threshold=data.get('sleep_threshold', 10),
-            max_retries=data.get('max_retries', 3),
-            retry_delay=data.get('retry_delay', 5)
+            sleep_threshold=error_handler_data.get('sleep_threshold', 10),
+            max_retries=error_handler_data.get('max_retries', 3),
+            retry_delay=error_handler_data.get('retry_delay', 5),
+            max_delay=error_handler_data.get('max_delay', 60),
+            backoff_multiplier=error_handler_data.get('backoff_multiplier', 2.0),
+            circuit_failure_threshold=error_handler_data.get('circuit_failure_threshold', 5),
+            circuit_reset_timeout=error_handler_data.get('circuit_reset_timeout', 300)
         )
+        error_handler = _share(components, error_handler)
+
+        # Outbound rate limit configuration
+        rate_limits_data = data.get('rate_limits') or {}
+        is_bot = data.get('type') == 'bot'
+        rate_limits = RateLimitConfig(
+            enabled=rate_limits_data.get('enabled', True),
+            send=rate_limits_data.get('send', 25.0 if is_bot else 5.0),
+            edit=rate_limits_data.get('edit', 25.0 if is_bot else 5.0),
+            resolve=rate_limits_data.get('resolve', 2.0 if is_bot else 0.5),
+            min_rate_factor=rate_limits_data.get('min_rate_factor', 0.1),
+            decrease_factor=rate_limits_data.get('decrease_factor', 0.5),
+            recovery_interval=rate_limits_data.get('recovery_interval', 60.0)
+        )
+        rate_limits = _share(components, rate_limits)
+
+        # Handler latency instrumentation
+        handler_metrics_data = data.get('handler_metrics') or {}
+        handler_metrics = HandlerMetricsConfig(
+            enabled=handler_metrics_data.get('enabled', True),
+            sample_rate=float(handler_metrics_data.get('sample_rate', 1.0))
+        )
+        handler_metrics = _share(components, handler_metrics)
+
+        # Handler worker autoscaling, ``workers`` is the initial pool size
+        autoscale_data = data.get('autoscale') or {}
+        workers = data.get('workers', 4)
+        autoscale = AutoscaleConfig(
+            enabled=autoscale_data.get('enabled', False),
+            min_workers=autoscale_data.get('min_workers', 1),
+            max_workers=autoscale_data.get('max_workers', max(workers, 32)),
+            interval=float(autoscale_data.get('interval', 5.0)),
+            scale_up_depth=autoscale_data.get('scale_up_depth', 100),
+            latency_target=float(autoscale_data.get('latency_target', 0.5)),
+            scale_down_after=autoscale_data.get('scale_down_after', 6)
+        )
+        autoscale = _share(components, autoscale)
 
         return cls(
             session_name=data['session_name'],
@@ -130,14 +614,14 @@ class ClientConfig:
             system_version=data.get('system_version', 'Unknown'),
             lang_code=data.get('lang_code', 'en'),
             ipv6=data.get('ipv6', False),
-            proxy=data.get('proxy'),
+            proxy=_readonly(data.get('proxy')),
             test_mode=data.get('test_mode', False),
             bot_token=data.get('bot_token'),
             session_string=data.get('session_string'),
             phone_number=data.get('phone_number'),
             phone_code=data.get('phone_code'),
             password=data.get('password'),
-            workers=data.get('workers', 4),
+            workers=workers,
             workdir=data.get('workdir', 'sessions'),
             parse_mode=data.get('parse_mode', 'HTML'),
             no_updates=data.get('no_updates', False),
@@ -145,36 +629,264 @@ class ClientConfig:
             sleep_threshold=data.get('sleep_threshold', 10),
             hide_password=data.get('hide_password', True),
             max_concurrent_transmissions=data.get('max_concurrent_transmissions', 1),
+            identity_cache_ttl=data.get('identity_cache_ttl', 3600),
             in_memory=data.get('in_memory', False),
             plugins=plugins,
             periodic_tasks=periodic_tasks,
             session=session,
-            error_handler=error_handler
+            error_handler=error_handler,
+            rate_limits=rate_limits,
+            handler_metrics=handler_metrics,
+            autoscale=autoscale
         )
 
 
 class Config:
-    def __init__(self, config_path: str = "config.yaml"):
+    # Top-level keys that only describe clients; everything else is a settings section
+    CLIENT_KEYS = ("clients", "defaults", "templates")
+
+    # Settings sections and the records they are parsed into
+    SECTIONS = {
+        'startup': StartupConfig,
+        'logging': LoggingConfig,
+        'reload': ReloadConfig,
+        'supervisor': SupervisorConfig,
+        'metrics': MetricsConfig
+    }
+
+    def __init__(self, config_path: str = "config.yaml", shard: Optional[Tuple[int, int]] = None,
+                 compiled_cache: Optional[bool] = None):
+        """
+        Application configuration.
+
+        The whole file is checked before anything is parsed, and every problem
+        found is reported in one ``ConfigError``.
+
+        Args:
+            config_path: Path to the configuration file.
+            shard: (index, count) to keep only the clients of one worker process.
+            compiled_cache: Read and write a compiled snapshot of the file (see
+                ``config.compiled_cache``). None selects it from the
+                ``CONFIG_COMPILED_CACHE`` environment variable, which by default
+                enables it only when PyYAML has no C loader.
+        """
         self.config_path = config_path
-        self._config = self._load_config()
-        self._clients = self._parse_clients()
+        self.shard = shard
+        self.compiled_cache = compiled_cache
+        self._config, self._clients, self.loaded_from_cache = self._load()
+        self._startup = self._parse_startup()
+        self._logging = self._parse_logging()
+        self._reload = self._parse_reload()
+        self._supervisor = self._parse_supervisor()
+        self._metrics = self._parse_metrics()
+
+    def _load(self) -> Tuple[Dict[str, Any], List[ClientConfig], bool]:
+        """
+        Read the file and parse its clients, from the compiled snapshot when it is current.
+
+        Returns:
+            Tuple[Dict[str, Any], List[ClientConfig], bool]: The settings
+            sections, the clients of this shard and whether the snapshot was used.
+        """
+        from config.compiled_cache import CompiledConfigCache, cache_enabled
 
-    def _load_config(self) -> Dict[str, Any]:
         path_obj = Path(self.config_path)
         if not path_obj.is_file():
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
-        with open(path_obj, encoding="utf-8") as f:
-            return yaml.safe_load(f)
 
-    def _parse_clients(self) -> List[ClientConfig]:
-        return [ClientConfig.from_dict(client) for client in self._config.get("clients", [])]
+        use_cache = cache_enabled() if self.compiled_cache is None else self.compiled_cache
+        cache = CompiledConfigCache(self.config_path) if use_cache else None
+        if cache:
+            snapshot = cache.load()
+            if snapshot:
+                config, clients = snapshot
+                return config, [client for client in clients if self._in_shard(client.session_name)], True
+
+        stat = path_obj.stat()
+        source = path_obj.read_bytes()
+        config = self._load_config(source)
+        if not isinstance(config, dict):
+            raise ConfigError(self.config_path, [f"expected a mapping at the top level, got {config!r}"])
+
+        errors: List[str] = []
+        for key, value in config.items():
+            if key in self.SECTIONS:
+                _check_section(self.SECTIONS[key], value or {}, key, errors)
+            elif key not in self.CLIENT_KEYS:
+                errors.append(f"{key}: unknown section")
+        sections = {key: value for key, value in config.items() if key not in self.CLIENT_KEYS}
+
+        # The snapshot holds every client, so all worker processes can use it
+        clients = self._parse_clients(config, errors, None if cache else self._in_shard)
+        if errors:
+            raise ConfigError(self.config_path, errors)
+        if not cache:
+            return sections, clients, False
+
+        cache.store(stat, source, sections, clients)
+        return sections, [client for client in clients if self._in_shard(client.session_name)], False
+
+    @staticmethod
+    def _load_config(source: bytes) -> Dict[str, Any]:
+        import yaml
+
+        # The C loader is several times faster when PyYAML is built with libyaml
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        return yaml.load(source, Loader=loader) or {}
+
+    def _in_shard(self, session_name: str) -> bool:
+        return not self.shard or shard_of(session_name, self.shard[1]) == self.shard[0]
+
+    @staticmethod
+    def _resolve_template(name: str, defaults: Dict[str, Any], templates: Dict[str, Any],
+                          resolved: Dict[str, Dict[str, Any]], chain: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """Get a template merged over the ``defaults`` block and the templates it extends."""
+        if name in resolved:
+            return resolved[name]
+        if name in chain:
+            raise ValueError(f"Config templates extend each other in a cycle: {' -> '.join(chain + (name,))}")
+        template = templates.get(name)
+        if not isinstance(template, dict):
+            raise ValueError(f"Unknown config template '{name}'")
+
+        body = {key: value for key, value in template.items() if key != 'template'}
+        parent = template.get('template')
+        if parent is None:
+            base = defaults
+        else:
+            base = Config._resolve_template(parent, defaults, templates, resolved, chain + (name,))
+        resolved[name] = merge_config(base, body)
+        return resolved[name]
+
+    @staticmethod
+    def _parse_clients(config: Dict[str, Any], errors: List[str],
+                       in_shard: Optional[Callable[[str], bool]] = None) -> List[ClientConfig]:
+        """
+        Check every client entry of a configuration file and parse the valid ones.
+
+        Args:
+            config: Content of the file.
+            errors: List the problems of the entries are appended to.
+            in_shard: Selects the clients to parse by session name; entries of
+                other worker processes are checked but not parsed.
+        """
+        defaults = config.get("defaults") or {}
+        templates = config.get("templates") or {}
+        entries = config.get("clients") or []
+        if not isinstance(defaults, dict):
+            errors.append(f"defaults: expected a mapping, got {defaults!r}")
+            defaults = {}
+        if not isinstance(templates, dict):
+            errors.append(f"templates: expected a mapping, got {templates!r}")
+            templates = {}
+        if not isinstance(entries, list):
+            errors.append(f"clients: expected a list, got {entries!r}")
+            entries = []
+
+        resolved: Dict[str, Dict[str, Any]] = {}
+        components: Dict[Any, Any] = {}
+        positions: Dict[str, int] = {}
+
+        clients = []
+        for index, entry in enumerate(entries):
+            where = f"clients[{index}]"
+            if not isinstance(entry, dict):
+                errors.append(f"{where}: expected a mapping, got {entry!r}")
+                continue
+            if isinstance(entry.get('session_name'), str):
+                where = f"{where} ({entry['session_name']})"
+            name = entry.get('template')
+            try:
+                if name is None:
+                    data = merge_config(defaults, entry)
+                else:
+                    body = {key: value for key, value in entry.items() if key != 'template'}
+                    data = merge_config(Config._resolve_template(name, defaults, templates, resolved), body)
+            except ValueError as e:
+                errors.append(f"{where}.template: {e}")
+                continue
+
+            session_name = data.get('session_name')
+            if isinstance(session_name, str):
+                if session_name in positions:
+                    errors.append(f"{where}.session_name: already used by clients[{positions[session_name]}]")
+                positions.setdefault(session_name, index)
+
+            count = len(errors)
+            ClientConfig.check(data, where, errors)
+            if len(errors) > count or (in_shard and not in_shard(session_name)):
+                continue
+            clients.append(ClientConfig.from_dict(data, components))
+        return clients
+
+    def _parse_startup(self) -> StartupConfig:
+        return StartupConfig.from_dict(self._config.get("startup") or {})
+
+    def _parse_logging(self) -> LoggingConfig:
+        return LoggingConfig.from_dict(self._config.get("logging") or {})
+
+    def _parse_reload(self) -> ReloadConfig:
+        return ReloadConfig.from_dict(self._config.get("reload") or {})
+
+    def _parse_supervisor(self) -> SupervisorConfig:
+        return SupervisorConfig.from_dict(self._config.get("supervisor") or {})
+
+    def _parse_metrics(self) -> MetricsConfig:
+        return MetricsConfig.from_dict(self._config.get("metrics") or {})
 
     def reload(self):
-        """Reload the configuration."""
-        self._config = self._load_config()
-        self._clients = self._parse_clients()
+        """
+        Reload the configuration.
+
+        The new file is fully parsed before anything is replaced, so an
+        invalid file raises and leaves the current configuration in place.
+        """
+        current = self._config
+        try:
+            self._config, clients, loaded_from_cache = self._load()
+            startup = self._parse_startup()
+            logging = self._parse_logging()
+            reload = self._parse_reload()
+            supervisor = self._parse_supervisor()
+            metrics = self._parse_metrics()
+        except Exception:
+            self._config = current
+            raise
+
+        self._clients = clients
+        self.loaded_from_cache = loaded_from_cache
+        self._startup = startup
+        self._logging = logging
+        self._reload = reload
+        self._supervisor = supervisor
+        self._metrics = metrics
 
     @property
     def clients(self) -> List[ClientConfig]:
         """Get the list of client configurations."""
         return self._clients
+
+    @property
+    def startup(self) -> StartupConfig:
+        """Get the startup scheduling settings."""
+        return self._startup
+
+    @property
+    def logging(self) -> LoggingConfig:
+        """Get the logging settings."""
+        return self._logging
+
+    @property
+    def reload_settings(self) -> ReloadConfig:
+        """Get the hot reload settings."""
+        return self._reload
+
+    @property
+    def supervisor(self) -> SupervisorConfig:
+        """Get the multi-process supervisor settings."""
+        return self._supervisor
+
+    @property
+    def metrics(self) -> MetricsConfig:
+        """Get the metrics endpoint settings."""
+        return self._metrics
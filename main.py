@@ -1,32 +1,51 @@
 # main.py
 
 # !/usr/bin/env python3
+import argparse
 import asyncio
+import os
 import signal
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
-import uvloop
-
-from client_manager import ClientManager
 from config.settings import Config, ClientConfig
-from utils.logger import get_logger
+from utils.logger import LoggerFactory, get_logger
+from utils.scheduler import SharedScheduler
+
+# Pyrogram, uvloop and the metrics endpoint are imported on first use, so the
+# supervisor process and every spawned worker import this module quickly
+if TYPE_CHECKING:
+    from client_manager import ClientManager
+    from utils.metrics import MetricsServer
+    from utils.startup_scheduler import StartupReport
 
 
 class PyrogramMultiClient:
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml", shard: Optional[Tuple[int, int]] = None):
         """
         Initialize the multi-client manager.
 
         Args:
             config_path: Path to the configuration file.
+            shard: (index, count) to run only the clients of one worker process.
         """
-        self.config = Config(config_path)
-        self.managers: Dict[str, ClientManager] = {}
+        self.config = Config(config_path, shard)
+        LoggerFactory.configure(self.config.logging.mode, self.config.logging.format)
+        self.managers: Dict[str, "ClientManager"] = {}
         self.main_logger = get_logger("PyrogramMultiClient")
         self.shutdown_event = asyncio.Event()
+        self.startup_report: Optional["StartupReport"] = None
+        self.scheduler = SharedScheduler()
+        self.metrics_server: Optional["MetricsServer"] = None
+        self._reload_lock = asyncio.Lock()
+        # Session names queued or starting, and the startup runs starting them
+        self._starting: Set[str] = set()
+        self._startup_tasks: Set[asyncio.Task] = set()
+        self._is_stopping = False
+        self._config_mtime = self._get_config_mtime()
 
         # Set uvloop for improved performance
+        import uvloop
         uvloop.install()
 
         # Create necessary directories
@@ -43,6 +62,10 @@ class PyrogramMultiClient:
                 sig,
                 lambda s=sig: asyncio.create_task(self._shutdown(s))
             )
+        asyncio.get_event_loop().add_signal_handler(
+            signal.SIGHUP,
+            lambda: asyncio.create_task(self.reload("SIGHUP"))
+        )
 
     async def _shutdown(self, sig: Optional[signal.Signals] = None):
         """
@@ -53,8 +76,19 @@ class PyrogramMultiClient:
         """
         if sig:
             self.main_logger.info(f"Received exit signal {sig.name}...")
+        if self._is_stopping:
+            return
+        self._is_stopping = True
+
+        # Cancel running startups instead of waiting behind ramp-up and retries;
+        # clients cancelled halfway stop themselves before the tasks finish
+        startups = list(self._startup_tasks)
+        for task in startups:
+            task.cancel()
+        await asyncio.gather(*startups, return_exceptions=True)
 
-        await self.stop_all()
+        async with self._reload_lock:
+            await self.stop_all()
         self.shutdown_event.set()
 
     async def _start_manager(self, client_config: ClientConfig) -> bool:
@@ -67,10 +101,25 @@ class PyrogramMultiClient:
         Returns:
             bool: True if successful, False otherwise.
         """
+        from client_manager import ClientManager
+
         try:
+            if self._is_stopping:
+                return False
+
             # Create the manager
-            manager = ClientManager(client_config)
-            success = await manager.start()
+            manager = ClientManager(client_config, self.scheduler, self.config.metrics.enabled)
+            try:
+                success = await manager.start()
+            except asyncio.CancelledError:
+                # Shutdown cancelled the startup, stop whatever part of the client is up
+                await manager.stop()
+                raise
+
+            if success and self._is_stopping:
+                # Finished starting after shutdown began, so stop_all() did not see it
+                await manager.stop()
+                return False
 
             if success:
                 # Save the manager and its formatter
@@ -99,10 +148,152 @@ class PyrogramMultiClient:
                 f"Error starting {client_config.type} client {client_config.session_name}: {e}"
             )
             return False
+        finally:
+            self._starting.discard(client_config.session_name)
+
+    async def _run_startup(self, configs: List[ClientConfig]) -> Optional["StartupReport"]:
+        """
+        Start clients through the startup scheduler as a task that shutdown can cancel.
+
+        Args:
+            configs: Client configurations to start.
+
+        Returns:
+            Optional[StartupReport]: Startup report, or None if shutdown cancelled the startup.
+        """
+        from utils.startup_scheduler import StartupScheduler
+
+        if self._is_stopping:
+            return None
+
+        # Clients count as starting from the moment they are queued
+        names = {client_config.session_name for client_config in configs}
+        self._starting.update(names)
+        startup_scheduler = StartupScheduler(self.config.startup)
+        task = asyncio.create_task(startup_scheduler.run(configs, self._start_manager), name="startup")
+        self._startup_tasks.add(task)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if not self._is_stopping:
+                raise
+            self.main_logger.info("Startup cancelled by shutdown")
+            return None
+        finally:
+            self._startup_tasks.discard(task)
+            self._starting.difference_update(names)
+
+    async def _stop_manager(self, name: str) -> None:
+        """
+        Stop an individual client manager and forget it.
+
+        Args:
+            name: Session name of the client.
+        """
+        manager = self.managers.pop(name, None)
+        if manager is None:
+            return
+        try:
+            await manager.stop()
+            self.main_logger.info(f"Client {name} stopped successfully")
+        except Exception as e:
+            self.main_logger.error(f"Error stopping {name}: {e}")
+
+    def _get_config_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.config.config_path).st_mtime_ns
+        except OSError:
+            return None
+
+    async def _watch_config(self):
+        """Reload the configuration whenever the config file changes."""
+        while not self.shutdown_event.is_set():
+            await asyncio.sleep(self.config.reload_settings.poll_interval)
+            mtime = self._get_config_mtime()
+            if mtime is not None and mtime != self._config_mtime:
+                await self.reload("config file changed")
+
+    async def reload(self, reason: str = "requested") -> Optional[Dict[str, List[str]]]:
+        """
+        Reload the configuration and reconcile the running clients with it.
+
+        Args:
+            reason: Why the reload was triggered, for logging.
+
+        Returns:
+            Optional[Dict[str, List[str]]]: Session names per action, or None if the
+            configuration could not be loaded.
+        """
+        async with self._reload_lock:
+            if self.shutdown_event.is_set():
+                return None
+
+            self.main_logger.info(f"Reloading configuration ({reason})...")
+            self._config_mtime = self._get_config_mtime()
+            try:
+                self.config.reload()
+            except Exception as e:
+                self.main_logger.error(f"Failed to reload configuration, keeping the current one: {e}")
+                return None
+
+            LoggerFactory.configure(self.config.logging.mode, self.config.logging.format)
+            return await self.reconcile(self.config.clients)
+
+    async def reconcile(self, configs: List[ClientConfig]) -> Dict[str, List[str]]:
+        """
+        Bring the running clients in line with a list of client configurations.
+
+        Only clients that were added, removed or whose configuration changed are
+        started or stopped; all other clients keep running untouched. Clients
+        that previously failed to start are treated as added. Clients that are
+        still starting count as running and are left alone until the next reload.
+
+        Args:
+            configs: Desired client configurations.
+
+        Returns:
+            Dict[str, List[str]]: Session names that were added, removed, restarted,
+            left unchanged and still starting.
+        """
+        desired = {client_config.session_name: client_config for client_config in configs}
+        changes = {
+            'added': [], 'removed': [], 'restarted': [], 'unchanged': [],
+            'starting': sorted(self._starting)
+        }
+
+        for name, manager in self.managers.items():
+            if name not in desired:
+                changes['removed'].append(name)
+            elif manager.config != desired[name]:
+                changes['restarted'].append(name)
+            else:
+                changes['unchanged'].append(name)
+        changes['added'] = [
+            name for name in desired if name not in self.managers and name not in self._starting
+        ]
+
+        self.main_logger.info(
+            f"Reconciling clients: {len(changes['added'])} added, {len(changes['removed'])} removed, "
+            f"{len(changes['restarted'])} changed, {len(changes['unchanged'])} unchanged, "
+            f"{len(changes['starting'])} still starting"
+        )
+
+        await asyncio.gather(*(
+            self._stop_manager(name) for name in changes['removed'] + changes['restarted']
+        ))
+
+        to_start = [desired[name] for name in changes['restarted'] + changes['added']]
+        if to_start:
+            report = await self._run_startup(to_start)
+            if report and report.failed:
+                self.main_logger.warning(f"{report.failed} client(s) failed to start after reload")
+
+        return changes
 
     async def start_all(self):
-        """Start all clients in parallel."""
+        """Start all clients through the startup scheduler."""
         self.main_logger.info("Starting all clients...")
+        self.scheduler.start()
 
         # Group clients by type for logging
         clients_by_type = {
@@ -113,34 +304,20 @@ class PyrogramMultiClient:
         for client_config in self.config.clients:
             clients_by_type[client_config.type].append(client_config)
 
-        # Start clients in parallel
-        tasks = []
         for client_type, configs in clients_by_type.items():
             self.main_logger.info(f"Starting {len(configs)} {client_type} client(s)...")
-            for config in configs:
-                task = asyncio.create_task(
-                    self._start_manager(config),
-                    name=f"start_{config.session_name}"
-                )
-                tasks.append((config, task))
 
-        # Await all tasks
-        failed = 0
-        for config, task in tasks:
-            try:
-                success = await task
-                if not success:
-                    failed += 1
-            except Exception as e:
-                self.main_logger.error(
-                    f"Unexpected error starting {config.session_name}: {e}"
-                )
-                failed += 1
+        # Start clients with bounded concurrency and ramp-up. Reloads may run
+        # meanwhile; reconcile() counts the clients in flight as running.
+        self.startup_report = await self._run_startup(self.config.clients)
+        if self.startup_report is None:
+            return
 
-        total = len(tasks)
-        success = total - failed
+        total = len(self.startup_report.results)
+        failed = self.startup_report.failed
         self.main_logger.info(
-            f"Client startup completed. Success: {success}/{total}"
+            f"Client startup completed in {self.startup_report.total_seconds:.2f}s. "
+            f"Success: {total - failed}/{total}"
         )
 
         if failed:
@@ -151,44 +328,97 @@ class PyrogramMultiClient:
     async def stop_all(self):
         """Gracefully shutdown all clients."""
         if not self.managers:
+            self.scheduler.shutdown()
             return
 
         self.main_logger.info("Shutting down all clients...")
 
-        stop_tasks = []
-        for name, manager in self.managers.items():
-            task = asyncio.create_task(
-                manager.stop(),
-                name=f"stop_{name}"
-            )
-            stop_tasks.append((name, task))
-
-        for name, task in stop_tasks:
-            try:
-                await task
-                self.main_logger.info(f"Client {name} stopped successfully")
-            except Exception as e:
-                self.main_logger.error(f"Error stopping {name}: {e}")
+        await asyncio.gather(*(
+            asyncio.create_task(self._stop_manager(name), name=f"stop_{name}")
+            for name in list(self.managers)
+        ))
 
-        self.managers.clear()
+        self.scheduler.shutdown()
         self.main_logger.info("All clients stopped")
 
+    def _collect_metrics(self) -> None:
+        from utils.metrics import collect_statistics
+
+        collect_statistics(self.get_statistics())
+
+    async def start_metrics_server(self) -> None:
+        """Start the metrics endpoint if it is enabled. Worker processes use port + worker index."""
+        settings = self.config.metrics
+        if not settings.enabled or self.metrics_server:
+            return
+        from utils.metrics import REGISTRY, MetricsServer
+
+        port = settings.port + (self.config.shard[0] if self.config.shard else 0)
+        self.metrics_server = MetricsServer(REGISTRY, settings.host, port)
+        try:
+            await self.metrics_server.start()
+            REGISTRY.add_collector(self._collect_metrics)
+        except OSError as e:
+            self.main_logger.error(f"Failed to start metrics server on {settings.host}:{port}: {e}")
+            self.metrics_server = None
+
+    async def stop_metrics_server(self) -> None:
+        """Stop the metrics endpoint."""
+        if self.metrics_server:
+            from utils.metrics import REGISTRY
+
+            REGISTRY.remove_collector(self._collect_metrics)
+            await self.metrics_server.stop()
+            self.metrics_server = None
+
     async def run(self):
         """Main method to start all clients."""
+        watcher: Optional[asyncio.Task] = None
         try:
+            # Publish metrics from the start, so startup itself can be observed
+            await self.start_metrics_server()
+
             # Start all clients
             await self.start_all()
 
+            # Watch the config file for changes
+            if self.config.reload_settings.watch:
+                watcher = asyncio.create_task(self._watch_config(), name="config_watcher")
+
             # Wait for shutdown signal
             await self.shutdown_event.wait()
 
         except Exception as e:
             self.main_logger.error(f"Critical error: {e}")
         finally:
+            if watcher:
+                watcher.cancel()
             # Attempt to gracefully stop all clients
             await self.stop_all()
+            await self.stop_metrics_server()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get the statistics of all running clients and the shared scheduler.
+
+        Returns:
+            Dict[str, Any]: Statistics per client and of the scheduler.
+        """
+        return {
+            'clients': {name: manager.get_statistics() for name, manager in self.managers.items()},
+            'scheduler': self.get_scheduler_statistics()
+        }
+
+    def get_scheduler_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics of the shared scheduler, including wakeups per second.
+
+        Returns:
+            Dict[str, Any]: Scheduler statistics.
+        """
+        return self.scheduler.get_statistics()
 
-    def get_manager(self, session_name: str) -> Optional[ClientManager]:
+    def get_manager(self, session_name: str) -> Optional["ClientManager"]:
         """
         Get the client manager by session name.
 
@@ -201,9 +431,9 @@ class PyrogramMultiClient:
         return self.managers.get(session_name)
 
 
-async def main():
+async def main(config_path: str = "config.yaml"):
     """Entry point of the application."""
-    manager = PyrogramMultiClient("config.yaml")
+    manager = PyrogramMultiClient(config_path)
     try:
         await manager.run()
     except KeyboardInterrupt:
@@ -213,4 +443,18 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Run multiple Pyrogram clients.")
+    parser.add_argument("--config", default="config.yaml", help="path to the configuration file")
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="number of worker processes (default: supervisor.workers from the config)"
+    )
+    args = parser.parse_args()
+
+    workers = args.workers if args.workers is not None else Config(args.config).supervisor.workers
+    if workers > 1:
+        from supervisor import Supervisor
+
+        Supervisor(args.config, workers).run()
+    else:
+        asyncio.run(main(args.config))
@@ -0,0 +1,74 @@
+from pyrogram import Client, filters
+from pyrogram.errors import RPCError
+from pyrogram.types import Message
+
+from utils.identity_cache import get_me
+from utils.live_sessions import LiveSessionStore
+from utils.logger import get_logger
+from utils.plugin_context import PluginContext
+
+logger = get_logger("BotCommands")
+
+# Seconds the welcome message of a user keeps being updated
+SESSION_TTL = 30 * 60
+
+
+class BotCommands:
+    def __init__(self, context: PluginContext):
+        """
+        Command state of one bot.
+
+        Args:
+            context: Plugin context of the bot; the ``title`` setting names
+                the bot in its messages.
+        """
+        self.name = context.name
+        self.title = context.setting("title", f"Bot {context.name}")
+        self.task_manager = None
+        self.user_sessions = LiveSessionStore(SESSION_TTL)
+
+    async def start_command(self, client: Client, message: Message):
+        """
+        Handler for the /start command.
+        """
+        try:
+            user = message.from_user
+            logger.info(f"[{self.name}] Received /start from user {user.id} ({user.first_name})")
+
+            # Bot information
+            me = await get_me(client)
+            start_text = (
+                f"👋 Hello! I'm {self.title}\n\n"
+                f"Bot Information:\n"
+                f"• Name: {me.first_name}\n"
+                f"• Username: @{me.username}\n"
+                f"• ID: {me.id}\n"
+                f"• Type: Telegram {self.title}\n\n"
+                f"I will update this message with the remaining time.\n"
+                f"Updates will continue for 30 minutes."
+            )
+
+            # Send the message and save it
+            sent_message = await message.reply_text(start_text)
+
+            if self.task_manager:
+                # Save user session information
+                self.user_sessions.add(user.id, sent_message.chat.id, sent_message.id)
+                self.task_manager.track(user.id)
+
+            logger.info(f"[{self.name}] Sent welcome message to user {user.id}")
+
+        except RPCError as e:
+            logger.error(f"[{self.name}] Telegram error in start command: {e}")
+        except Exception as e:
+            logger.error(f"[{self.name}] Error in start command: {e}")
+
+
+def commands_for(client: Client) -> BotCommands:
+    """Get the command state of a client."""
+    return PluginContext.for_client(client).state("bot_commands", BotCommands)
+
+
+@Client.on_message(filters.command("start") & filters.private)
+async def start_handler(client: Client, message: Message):
+    await commands_for(client).start_command(client, message)
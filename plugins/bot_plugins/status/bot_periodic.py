@@ -0,0 +1,132 @@
+import time
+from datetime import datetime
+from functools import partial
+from typing import Optional, List
+
+from pyrogram import Client
+from pyrogram.errors import MessageNotModified, RPCError
+
+from utils.fanout import FanOutEngine
+from utils.logger import get_logger
+from utils.render_cache import RenderCache
+from utils.scheduler import ClientScheduler
+from utils.timer_wheel import TimerWheel
+
+from .bot_commands import commands_for
+
+logger = get_logger("BotPeriodic")
+
+UPDATE_INTERVAL = 30
+# Seconds between wheel ticks; every message is refreshed UPDATE_INTERVAL after its last refresh
+TICK_INTERVAL = 1
+
+
+class BotPeriodicTasks:
+    def __init__(self, client: Client):
+        self.client = client
+        self.fanout = FanOutEngine.for_client(client)
+        self.render_cache = RenderCache.for_client(client)
+        self.refresh_wheel = TimerWheel(resolution=TICK_INTERVAL)
+        self.commands_handler = commands_for(client)
+
+    def track(self, user_id: int) -> None:
+        """Schedule the first refresh of a user's message, UPDATE_INTERVAL from now."""
+        self.refresh_wheel.schedule(user_id, UPDATE_INTERVAL)
+
+    async def update_user_messages(self):
+        """Update the user messages whose refresh is due."""
+        try:
+            now = time.time()
+            sessions = self.commands_handler.user_sessions
+
+            for session in sessions.pop_expired(now):
+                self.refresh_wheel.cancel(session.user_id)
+                self.render_cache.forget(session.chat_id, session.message_id)
+                logger.info(f"[{self.client.name}] Session expired for user {session.user_id}")
+
+            jobs = []
+            for user_id in self.refresh_wheel.advance():
+                session = sessions.get(user_id)
+                if session is None:
+                    continue
+
+                # Prepare the message update. It shows no clock time, so the render
+                # cache skips the edit until the remaining minutes change.
+                time_left = 30 - int(now - session.start_ts) // 60
+                update_text = (
+                    f"🤖 {self.commands_handler.title} Status Update\n\n"
+                    f"📅 Started: {datetime.fromtimestamp(session.start_ts).strftime('%H:%M:%S')}\n"
+                    f"⌛️ Time remaining: {time_left} minutes\n\n"
+                    f"Updates will stop automatically after 30 minutes."
+                )
+
+                self.refresh_wheel.schedule(user_id, UPDATE_INTERVAL)
+                if not self.render_cache.changed(session.chat_id, session.message_id, update_text):
+                    continue
+
+                jobs.append((
+                    user_id,
+                    session.chat_id,
+                    partial(
+                        self.client.edit_message_text,
+                        chat_id=session.chat_id,
+                        message_id=session.message_id,
+                        text=update_text
+                    )
+                ))
+
+            if not jobs:
+                return
+
+            # Send the edits due in this tick concurrently within the rate limits
+            report = await self.fanout.run(jobs, deadline=TICK_INTERVAL)
+
+            # Edits that could not start in time are retried on the next tick
+            for user_id in report.dropped:
+                session = sessions.get(user_id)
+                if session:
+                    self.render_cache.forget(session.chat_id, session.message_id)
+                    self.refresh_wheel.schedule(user_id, TICK_INTERVAL)
+
+            for user_id, error in report.failed.items():
+                if isinstance(error, MessageNotModified):
+                    continue
+                if isinstance(error, RPCError) and "MESSAGE_ID_INVALID" in str(error):
+                    logger.info(
+                        f"[{self.client.name}] Message was deleted or became invalid for user {user_id}, "
+                        f"removing session")
+                else:
+                    logger.error(f"[{self.client.name}] Error updating message for user {user_id}: {error}")
+                session = sessions.remove(user_id)
+                if session:
+                    self.render_cache.forget(session.chat_id, session.message_id)
+                self.refresh_wheel.cancel(user_id)
+                logger.info(f"[{self.client.name}] Removed session for user {user_id}")
+
+        except Exception as e:
+            logger.error(f"[{self.client.name}] Error in update task: {e}")
+
+
+def schedule_tasks(client: Client, tasks: List[str],
+                   scheduler: ClientScheduler) -> Optional[ClientScheduler]:
+    """Register the bot's tasks in its namespace of the shared scheduler."""
+    try:
+        task_manager = BotPeriodicTasks(client)
+
+        # Link with the command handler of the same client
+        task_manager.commands_handler.task_manager = task_manager
+
+        scheduler.add_job(
+            task_manager.update_user_messages,
+            trigger="interval",
+            seconds=TICK_INTERVAL,
+            max_instances=1,
+            misfire_grace_time=TICK_INTERVAL
+        )
+
+        logger.info(f"[{client.name}] Registered tasks")
+        return scheduler
+
+    except Exception as e:
+        logger.error(f"[{client.name}] Failed to setup scheduler: {e}")
+        return None
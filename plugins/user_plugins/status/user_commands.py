@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from pyrogram import Client, filters
+from pyrogram.types import Message
+
+from utils.identity_cache import get_me
+from utils.logger import get_logger
+from utils.plugin_context import PluginContext
+
+logger = get_logger("UserCommands")
+
+
+class UserCommands:
+    def __init__(self, context: PluginContext):
+        """
+        Command state of one user account.
+
+        Args:
+            context: Plugin context of the account; the ``title`` and
+                ``label`` settings name the account and the plugin in its
+                messages.
+        """
+        self.name = context.name
+        self.title = context.setting("title", f"User Account {context.name}")
+        self.label = context.setting("label", "User Plugin")
+        self.task_manager = None
+        self.saved_message = None
+        self.start_time = None
+
+    async def start_command(self, client: Client, message: Message):
+        """
+        Handler for the /start command.
+        Responds only to commands in Saved Messages.
+        """
+        try:
+            # Check if the message is in Saved Messages
+            me = await get_me(client)
+            if message.chat.id != me.id:
+                logger.info(f"[{self.name}] Ignoring /start in chat {message.chat.id}")
+                return
+
+            logger.info(f"[{self.name}] Received /start in Saved Messages")
+
+            start_text = (
+                f"👤 {self.title}\n\n"
+                f"Account Information:\n"
+                f"• Name: {me.first_name} {me.last_name or ''}\n"
+                f"• Username: @{me.username}\n"
+                f"• ID: {me.id}\n"
+                f"• Plugin: {self.label}\n\n"
+                f"Message will be updated with the remaining time\n"
+                f"Updates will continue for 30 minutes"
+            )
+
+            # Send and save the message
+            self.saved_message = await message.reply_text(start_text)
+            self.start_time = datetime.now()
+
+            logger.info(f"[{self.name}] Started new session in Saved Messages")
+
+        except Exception as e:
+            logger.error(f"[{self.name}] Error in start command: {e}")
+
+
+def commands_for(client: Client) -> UserCommands:
+    """Get the command state of a client."""
+    return PluginContext.for_client(client).state("user_commands", UserCommands)
+
+
+@Client.on_message(filters.command("start") & filters.private)
+async def start_handler(client: Client, message: Message):
+    await commands_for(client).start_command(client, message)
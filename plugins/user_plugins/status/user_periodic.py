@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Optional, List
+
+from pyrogram import Client
+from pyrogram.errors import MessageNotModified, RPCError
+
+from utils.fanout import FanOutEngine
+from utils.identity_cache import get_me
+from utils.logger import get_logger
+from utils.render_cache import RenderCache
+from utils.scheduler import ClientScheduler
+
+from .user_commands import commands_for
+
+logger = get_logger("UserPeriodic")
+
+UPDATE_INTERVAL = 30
+
+
+class UserPeriodicTasks:
+    def __init__(self, client: Client):
+        self.client = client
+        self.fanout = FanOutEngine.for_client(client)
+        self.render_cache = RenderCache.for_client(client)
+        self.commands_handler = commands_for(client)
+
+    def _end_session(self):
+        """Forget the saved message and its cached render."""
+        saved_message = self.commands_handler.saved_message
+        if saved_message:
+            self.render_cache.forget(saved_message.chat.id, saved_message.id)
+        self.commands_handler.saved_message = None
+        self.commands_handler.start_time = None
+
+    async def update_saved_message(self):
+        """Update the message in Saved Messages."""
+        try:
+            if not self.commands_handler.saved_message:
+                return
+
+            current_time = datetime.now()
+
+            if not self.commands_handler.start_time:
+                return
+
+            # Check if the time has expired (30 minutes)
+            if current_time - self.commands_handler.start_time > timedelta(minutes=30):
+                self._end_session()
+                logger.info(f"[{self.client.name}] Session expired")
+                return
+
+            me = await get_me(self.client)
+            time_left = 30 - (current_time - self.commands_handler.start_time).seconds // 60
+
+            # No clock time in the text, so the render cache skips the edit
+            # until the remaining minutes change
+            update_text = (
+                f"👤 {self.commands_handler.title} Status\n\n"
+                f"Started: {self.commands_handler.start_time.strftime('%H:%M:%S')}\n"
+                f"Time remaining: {time_left} minutes\n\n"
+                f"Account: {me.first_name} {me.last_name or ''}\n"
+                f"Plugin: {self.commands_handler.label}\n"
+                f"Status: Active ✅"
+            )
+
+            saved_message = self.commands_handler.saved_message
+            if not self.render_cache.changed(saved_message.chat.id, saved_message.id, update_text):
+                return
+
+            report = await self.fanout.run(
+                [(
+                    saved_message.id,
+                    saved_message.chat.id,
+                    partial(
+                        self.client.edit_message_text,
+                        chat_id=saved_message.chat.id,
+                        message_id=saved_message.id,
+                        text=update_text
+                    )
+                )],
+                deadline=UPDATE_INTERVAL
+            )
+
+            error = report.failed.get(saved_message.id)
+            if saved_message.id in report.dropped:
+                self.render_cache.forget(saved_message.chat.id, saved_message.id)
+            elif error and not isinstance(error, MessageNotModified):
+                if isinstance(error, RPCError) and "MESSAGE_ID_INVALID" in str(error):
+                    logger.info(
+                        f"[{self.client.name}] Message was deleted or became invalid, stopping periodic tasks")
+                    self._end_session()
+                else:
+                    raise error
+
+        except Exception as e:
+            logger.error(f"[{self.client.name}] Error updating saved message: {e}")
+            self._end_session()
+
+
+def schedule_tasks(client: Client, tasks: List[str],
+                   scheduler: ClientScheduler) -> Optional[ClientScheduler]:
+    """Register the account's tasks in its namespace of the shared scheduler."""
+    try:
+        task_manager = UserPeriodicTasks(client)
+
+        # Link with the command handler of the same client
+        task_manager.commands_handler.task_manager = task_manager
+
+        scheduler.add_job(
+            task_manager.update_saved_message,
+            trigger="interval",
+            seconds=UPDATE_INTERVAL,
+            max_instances=1,
+            misfire_grace_time=15
+        )
+
+        logger.info(f"[{client.name}] Registered tasks")
+        return scheduler
+
+    except Exception as e:
+        logger.error(f"[{client.name}] Failed to setup scheduler: {e}")
+        return None
@@ -0,0 +1,220 @@
+# supervisor.py
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+from multiprocessing.process import BaseProcess
+from typing import Any, Dict, Optional
+
+from config.settings import Config
+from utils.logger import LoggerFactory, get_logger
+from utils.retry import BackoffPolicy
+
+
+async def _report_stats(manager, index: int, stats_queue, interval: float):
+    """Send the worker's statistics to the supervisor every ``interval`` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        stats_queue.put((index, os.getpid(), manager.get_statistics()))
+
+
+async def _worker_main(config_path: str, index: int, count: int, stats_queue, stats_interval: float) -> bool:
+    """Run the clients of one shard; True if they were stopped by a shutdown signal."""
+    # Imported here, so the supervisor process does not install uvloop or signal handlers
+    from main import PyrogramMultiClient
+
+    manager = PyrogramMultiClient(config_path, (index, count))
+    manager.main_logger.info(f"Worker {index}/{count} running {len(manager.config.clients)} client(s)")
+    reporter = asyncio.create_task(_report_stats(manager, index, stats_queue, stats_interval))
+    try:
+        await manager.run()
+    finally:
+        reporter.cancel()
+        stats_queue.put((index, os.getpid(), manager.get_statistics()))
+    return manager.shutdown_event.is_set()
+
+
+def run_worker(config_path: str, index: int, count: int, stats_queue, stats_interval: float):
+    """
+    Entry point of a worker process.
+
+    Args:
+        config_path: Path to the configuration file.
+        index: Shard index of this worker.
+        count: Total number of workers.
+        stats_queue: Queue the statistics are sent to.
+        stats_interval: Seconds between statistics reports.
+    """
+    LoggerFactory.set_file_tag(f"w{index}")
+    if not asyncio.run(_worker_main(config_path, index, count, stats_queue, stats_interval)):
+        # run() logs and returns on errors; exit non-zero so the supervisor restarts the shard
+        sys.exit(1)
+
+
+class Supervisor:
+    # Workers running at least this long get their restart backoff reset
+    STABLE_RUNTIME = 60.0
+    STOP_TIMEOUT = 30.0
+
+    def __init__(self, config_path: str = "config.yaml", workers: Optional[int] = None):
+        """
+        Runs the clients across several worker processes.
+
+        Clients are assigned to workers by a stable hash of their session name,
+        so a session always lives in the same worker, also after a restart or
+        a config reload. Crashed workers are restarted with backoff, and every
+        worker periodically reports its statistics to the supervisor.
+
+        Args:
+            config_path: Path to the configuration file.
+            workers: Number of worker processes (defaults to ``supervisor.workers``).
+        """
+        self.config_path = config_path
+        self.config = Config(config_path)
+        LoggerFactory.configure(self.config.logging.mode, self.config.logging.format)
+        self.settings = self.config.supervisor
+        self.workers = max(1, workers or self.settings.workers)
+        self.logger = get_logger("Supervisor")
+        self.backoff = BackoffPolicy(1.0, self.settings.max_restart_delay)
+
+        self._context = multiprocessing.get_context("spawn")
+        self.stats_queue = self._context.Queue()
+        self.processes: Dict[int, BaseProcess] = {}
+        self.worker_stats: Dict[int, Dict[str, Any]] = {}
+        self.restarts: Dict[int, int] = {index: 0 for index in range(self.workers)}
+        self._started_at: Dict[int, float] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._stopping = False
+
+    def _start_worker(self, index: int) -> None:
+        process = self._context.Process(
+            target=run_worker,
+            args=(self.config_path, index, self.workers, self.stats_queue, self.settings.stats_interval),
+            name=f"worker-{index}"
+        )
+        process.start()
+        self.processes[index] = process
+        self._started_at[index] = time.monotonic()
+        self._restart_at.pop(index, None)
+        self.logger.info(f"Started worker {index} (PID: {process.pid})")
+
+    def _check_workers(self) -> None:
+        """Schedule restarts of crashed workers and run the due ones."""
+        now = time.monotonic()
+        for index, process in self.processes.items():
+            if process.is_alive() or index in self._restart_at:
+                continue
+
+            if process.exitcode == 0:
+                # Workers exit with 0 only after a shutdown signal, so this was requested
+                self.logger.info(f"Worker {index} exited")
+                self._restart_at[index] = float("inf")
+                continue
+
+            if now - self._started_at[index] >= self.STABLE_RUNTIME:
+                self.restarts[index] = 0
+            delay = self.backoff.after(self.backoff.delay(self.restarts[index]))
+            self.restarts[index] += 1
+            self._restart_at[index] = now + delay
+            self.logger.error(
+                f"Worker {index} crashed with exit code {process.exitcode}, restarting in {delay:.1f}s"
+            )
+
+        for index, restart_at in list(self._restart_at.items()):
+            if restart_at <= now and not self._stopping:
+                self._start_worker(index)
+
+    def _drain_stats(self, timeout: float) -> None:
+        try:
+            index, pid, stats = self.stats_queue.get(timeout=timeout)
+            while True:
+                self.worker_stats[index] = {'pid': pid, 'received_at': time.time(), **stats}
+                index, pid, stats = self.stats_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _log_summary(self) -> None:
+        alive = sum(process.is_alive() for process in self.processes.values())
+        clients = sum(len(stats.get('clients', {})) for stats in self.worker_stats.values())
+        self.logger.info(
+            f"Workers alive: {alive}/{self.workers}, running clients: {clients}, "
+            f"restarts: {sum(self.restarts.values())}"
+        )
+
+    def _request_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _forward_reload(self, signum, frame) -> None:
+        for process in self.processes.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGHUP)
+
+    def _stop_workers(self) -> None:
+        self.logger.info("Stopping workers...")
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        # Keep reading while waiting: a worker whose final statistics do not fit
+        # the pipe buffer cannot exit before the supervisor has read them
+        deadline = time.monotonic() + self.STOP_TIMEOUT
+        while time.monotonic() < deadline and any(process.is_alive() for process in self.processes.values()):
+            self._drain_stats(timeout=0.1)
+
+        for index, process in self.processes.items():
+            if process.is_alive():
+                self.logger.warning(f"Worker {index} did not stop in time, killing it")
+                process.kill()
+            process.join()
+
+        self._drain_stats(timeout=0)
+        self.logger.info("All workers stopped")
+
+    def run(self) -> None:
+        """Start the workers and supervise them until SIGINT or SIGTERM."""
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._forward_reload)
+
+        self.logger.info(f"Starting {self.workers} worker(s) for {len(self.config.clients)} client(s)")
+        for index in range(self.workers):
+            self._start_worker(index)
+
+        next_summary = time.monotonic() + self.settings.stats_interval
+        try:
+            while not self._stopping:
+                self._drain_stats(timeout=1.0)
+                self._check_workers()
+                if time.monotonic() >= next_summary:
+                    self._log_summary()
+                    next_summary = time.monotonic() + self.settings.stats_interval
+        finally:
+            self._stop_workers()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get the statistics reported by all workers.
+
+        Returns:
+            Dict[str, Any]: Per-worker state and the merged per-client statistics.
+        """
+        return {
+            'workers': {
+                index: {
+                    'pid': process.pid,
+                    'alive': process.is_alive(),
+                    'restarts': self.restarts[index],
+                    'clients': len(self.worker_stats.get(index, {}).get('clients', {}))
+                }
+                for index, process in self.processes.items()
+            },
+            'clients': {
+                name: stats
+                for worker in self.worker_stats.values()
+                for name, stats in worker.get('clients', {}).items()
+            }
+        }
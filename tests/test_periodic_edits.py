@@ -0,0 +1,68 @@
+import asyncio
+
+from plugins.bot_plugins.status import bot_periodic
+from plugins.bot_plugins.status.bot_periodic import BotPeriodicTasks
+from utils.fanout import FanOutEngine
+
+START_TS = 1_700_000_000.0
+
+
+class StubClient:
+    name = "periodic_test"
+
+    def __init__(self):
+        self.edits = []
+
+    async def edit_message_text(self, chat_id, message_id, text):
+        self.edits.append((chat_id, message_id, text))
+
+
+class DueWheel:
+    """Timer wheel stand-in that reports every tracked user as due on each tick."""
+
+    def __init__(self):
+        self.users = set()
+
+    def schedule(self, key, delay):
+        self.users.add(key)
+
+    def cancel(self, key):
+        self.users.discard(key)
+
+    def advance(self):
+        return list(self.users)
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def test_unchanged_session_is_not_edited_again(monkeypatch):
+    clock = Clock(START_TS + 5)
+    monkeypatch.setattr(bot_periodic, "time", clock)
+
+    client = StubClient()
+    tasks = BotPeriodicTasks(client)
+    tasks.refresh_wheel = DueWheel()
+    # The simulated minutes pass instantly, so the per-chat limit would drop the edits
+    tasks.fanout = FanOutEngine(client.name, per_chat_rate_limit=0)
+    tasks.commands_handler.user_sessions.add(1, 100, 200, start_ts=START_TS)
+    tasks.track(1)
+
+    async def refresh(*times):
+        for now in times:
+            clock.now = now
+            await tasks.update_user_messages()
+
+    # Seconds apart but in the same minute: the visible state is unchanged
+    asyncio.run(refresh(START_TS + 5, START_TS + 35))
+    assert len(client.edits) == 1
+    assert tasks.render_cache.hits == 1
+
+    # A new minute changes the remaining time
+    asyncio.run(refresh(START_TS + 65))
+    assert len(client.edits) == 2
@@ -0,0 +1,21 @@
+import pytest
+
+from utils.timer_wheel import TimerWheel
+
+
+def test_rejects_single_level():
+    with pytest.raises(ValueError):
+        TimerWheel(levels=1)
+
+
+def test_timer_beyond_horizon_fires_on_time():
+    wheel = TimerWheel(resolution=1.0, slots=4, levels=2)
+    now = wheel._origin
+    # 4 * 4 = 16 ticks fit the wheel; 50 is several revolutions further out
+    wheel.schedule("far", 50, now=now)
+    wheel.schedule("near", 3, now=now)
+
+    assert wheel.advance(now + 3) == ["near"]
+    assert wheel.advance(now + 49) == []
+    assert wheel.advance(now + 50) == ["far"]
+    assert len(wheel) == 0
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 
 from pyrogram import Client
 from pyrogram.errors import (
@@ -9,10 +9,12 @@ from pyrogram.errors import (
 from pyrogram.raw import functions
 
 from utils.logger import get_logger
+from utils.rate_limiter import ClientRateLimiter
 
 
 class EnhancedErrorHandler:
-    def __init__(self, client: Client, logger_name: str, sleep_threshold: int = 10):
+    def __init__(self, client: Client, logger_name: str, sleep_threshold: int = 10,
+                 rate_limiter: Optional[ClientRateLimiter] = None):
         """
         Extended error handler with MTProto support.
 
@@ -20,10 +22,12 @@ class EnhancedErrorHandler:
             client: Instance of Pyrogram client.
             logger_name: Name for the logger.
             sleep_threshold: Threshold for automatic FloodWait handling.
+            rate_limiter: Outbound rate limiter of the client, if enabled.
         """
         self.client = client
         self.logger = get_logger(logger_name)
         self.sleep_threshold = sleep_threshold
+        self.rate_limiter = rate_limiter
         self.error_stats = {
             'flood_wait_counts': 0,
             'last_flood_wait': None,
@@ -126,4 +130,7 @@ class EnhancedErrorHandler:
 
     def get_error_statistics(self) -> Dict[str, Any]:
         """Get error statistics."""
-        return self.error_stats.copy()
+        stats = self.error_stats.copy()
+        if self.rate_limiter:
+            stats['rate_limits'] = self.rate_limiter.get_statistics()
+        return stats
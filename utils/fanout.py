@@ -0,0 +1,145 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from pyrogram import Client
+
+from utils.logger import get_logger
+from utils.metrics import TICK_DURATION
+from utils.rate_limiter import KeyedRateLimiter, TokenBucket
+
+# (key, chat_id, coroutine factory)
+FanOutJob = Tuple[Hashable, int, Callable[[], Awaitable[Any]]]
+
+
+@dataclass
+class FanOutReport:
+    total: int = 0
+    completed: int = 0
+    duration: float = 0.0
+    failed: Dict[Hashable, Exception] = field(default_factory=dict)
+    dropped: List[Hashable] = field(default_factory=list)
+
+
+class FanOutEngine:
+    _engines: Dict[str, "FanOutEngine"] = {}
+
+    def __init__(self, name: str, max_concurrency: int = 10,
+                 rate_limit: float = 25.0, per_chat_rate_limit: float = 1.0):
+        """
+        Concurrent, rate-limited executor for the calls of a periodic tick.
+
+        Args:
+            name: Session name of the client.
+            max_concurrency: Calls in flight at the same time.
+            rate_limit: Calls per second across all chats (0 = unlimited).
+            per_chat_rate_limit: Calls per second to a single chat (0 = unlimited).
+        """
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.logger = get_logger(f"FanOut_{name}")
+        self.global_limit = TokenBucket(rate_limit)
+        self.chat_limit = KeyedRateLimiter(per_chat_rate_limit)
+        self.last_report: Optional[FanOutReport] = None
+        self.stats = {
+            'ticks': 0,
+            'completed': 0,
+            'failed': 0,
+            'dropped': 0,
+            'max_tick_duration': 0.0
+        }
+
+    @classmethod
+    def for_client(cls, client: Client) -> "FanOutEngine":
+        """Get the fan-out engine of a client, creating one with defaults if it has none."""
+        engine = cls._engines.get(client.name)
+        if engine is None:
+            engine = cls(client.name)
+            cls._engines[client.name] = engine
+        return engine
+
+    def install(self) -> None:
+        """Register the engine for its client."""
+        FanOutEngine._engines[self.name] = self
+
+    def uninstall(self) -> None:
+        """Unregister the engine."""
+        if FanOutEngine._engines.get(self.name) is self:
+            del FanOutEngine._engines[self.name]
+
+    async def run(self, jobs: Iterable[FanOutJob], deadline: Optional[float] = None) -> FanOutReport:
+        """
+        Run a batch of calls with bounded concurrency and rate limits.
+
+        Calls that cannot start within ``deadline`` seconds are dropped
+        instead of delaying the next tick.
+
+        Args:
+            jobs: Tuples of (key, chat_id, coroutine factory).
+            deadline: Seconds after which pending calls are dropped.
+
+        Returns:
+            FanOutReport: Outcome of the batch.
+        """
+        report = FanOutReport()
+        begin = time.monotonic()
+        expires_at = begin + deadline if deadline else None
+        pending = iter(jobs)
+
+        async def worker():
+            for key, chat_id, factory in pending:
+                report.total += 1
+
+                chat_wait = self.chat_limit.reserve(chat_id)
+                if expires_at and time.monotonic() + chat_wait > expires_at:
+                    report.dropped.append(key)
+                    continue
+                if chat_wait:
+                    await asyncio.sleep(chat_wait)
+
+                global_wait = self.global_limit.delay()
+                if expires_at and time.monotonic() + global_wait > expires_at:
+                    report.dropped.append(key)
+                    continue
+                await self.global_limit.acquire()
+
+                try:
+                    await factory()
+                    report.completed += 1
+                except Exception as e:
+                    report.failed[key] = e
+
+        await asyncio.gather(*(worker() for _ in range(self.max_concurrency)))
+
+        report.duration = time.monotonic() - begin
+        self._record(report)
+        return report
+
+    def _record(self, report: FanOutReport) -> None:
+        self.last_report = report
+        self.stats['ticks'] += 1
+        self.stats['completed'] += report.completed
+        self.stats['failed'] += len(report.failed)
+        self.stats['dropped'] += len(report.dropped)
+        self.stats['max_tick_duration'] = max(self.stats['max_tick_duration'], report.duration)
+        TICK_DURATION.observe(report.duration, client=self.name)
+        self.chat_limit.prune()
+
+        if not report.total:
+            return
+        message = (
+            f"Tick finished in {report.duration:.2f}s: {report.completed}/{report.total} completed, "
+            f"{len(report.failed)} failed, {len(report.dropped)} dropped"
+        )
+        if report.dropped:
+            self.logger.warning(message)
+        else:
+            self.logger.debug(message)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get fan-out statistics."""
+        return {
+            **self.stats,
+            'last_tick_duration': self.last_report.duration if self.last_report else None
+        }
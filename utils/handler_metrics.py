@@ -0,0 +1,188 @@
+import copy
+import functools
+import inspect
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from pyrogram import Client, ContinuePropagation, StopPropagation
+from pyrogram.handlers.handler import Handler
+from pyrogram.session import Session
+
+from utils.logger import get_logger
+from utils.metrics import REGISTRY
+
+HANDLER_DURATION = REGISTRY.histogram(
+    "pyrogram_handler_duration_seconds", "Wall time of sampled handler calls.", ("client", "handler")
+)
+HANDLER_RPC_SECONDS = REGISTRY.counter(
+    "pyrogram_handler_rpc_seconds_total", "Time sampled handler calls spent awaiting raw API calls.",
+    ("client", "handler")
+)
+HANDLER_ERRORS = REGISTRY.counter(
+    "pyrogram_handler_errors_total", "Exceptions raised by sampled handler calls.", ("client", "handler", "error")
+)
+
+# RPC time accumulator of the handler call running in the current task
+_rpc_time: ContextVar[Optional[List[float]]] = ContextVar("handler_rpc_time", default=None)
+
+
+class HandlerStats:
+    __slots__ = ("calls", "sampled", "errors", "wall_total", "wall_max", "rpc_total", "error_types")
+
+    def __init__(self):
+        self.calls = 0
+        self.sampled = 0
+        self.errors = 0
+        self.wall_total = 0.0
+        self.wall_max = 0.0
+        self.rpc_total = 0.0
+        self.error_types: Dict[str, int] = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'sampled': self.sampled,
+            'errors': self.errors,
+            'error_types': dict(self.error_types),
+            'wall_mean': self.wall_total / self.sampled if self.sampled else 0.0,
+            'wall_max': self.wall_max,
+            'rpc_mean': self.rpc_total / self.sampled if self.sampled else 0.0
+        }
+
+
+def _handler_name(callback: Callable) -> str:
+    module = getattr(callback, "__module__", None) or "?"
+    return f"{module}.{getattr(callback, '__qualname__', repr(callback))}"
+
+
+class HandlerInstrumentation:
+    def __init__(self, name: str, sample_rate: float = 1.0):
+        """
+        Latency middleware for the handlers of one client.
+
+        Every handler added through ``client.add_handler`` (which is how plugins
+        are loaded) is registered as a copy whose callback records wall time,
+        time spent awaiting raw API calls, and exceptions. Handlers in negative
+        groups are internal, like the identity cache's profile watcher, and are
+        left untimed so they do not dilute the plugin latency.
+
+        Args:
+            name: Session name of the client.
+            sample_rate: Fraction of handler calls that are timed (0..1). All
+                calls are counted; unsampled calls only cost one random number.
+        """
+        self.name = name
+        self.sample_rate = sample_rate
+        self.logger = get_logger(f"HandlerMetrics_{name}")
+        self.handlers: Dict[str, HandlerStats] = {}
+        self._wrapped: Dict[int, Handler] = {}
+
+    def _record(self, stats: HandlerStats, handler_name: str, wall: float, rpc: float,
+                error: Optional[BaseException]) -> None:
+        stats.sampled += 1
+        stats.wall_total += wall
+        stats.rpc_total += rpc
+        if wall > stats.wall_max:
+            stats.wall_max = wall
+        HANDLER_DURATION.observe(wall, client=self.name, handler=handler_name)
+        if rpc:
+            HANDLER_RPC_SECONDS.inc(rpc, client=self.name, handler=handler_name)
+        if error is not None:
+            error_type = type(error).__name__
+            stats.errors += 1
+            stats.error_types[error_type] = stats.error_types.get(error_type, 0) + 1
+            HANDLER_ERRORS.inc(client=self.name, handler=handler_name, error=error_type)
+
+    def wrap(self, callback: Callable) -> Callable:
+        """Wrap a handler callback with timing. Coroutine callbacks stay coroutines."""
+        handler_name = _handler_name(callback)
+        stats = self.handlers.setdefault(handler_name, HandlerStats())
+
+        if inspect.iscoroutinefunction(callback):
+            @functools.wraps(callback)
+            async def instrumented(client, *args):
+                stats.calls += 1
+                if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                    return await callback(client, *args)
+
+                rpc = [0.0]
+                token = _rpc_time.set(rpc)
+                error = None
+                begin = time.perf_counter()
+                try:
+                    return await callback(client, *args)
+                except (StopPropagation, ContinuePropagation):
+                    raise
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    _rpc_time.reset(token)
+                    self._record(stats, handler_name, time.perf_counter() - begin, rpc[0], error)
+        else:
+            # Sync callbacks run in the client's executor, their RPCs are not attributed
+            @functools.wraps(callback)
+            def instrumented(client, *args):
+                stats.calls += 1
+                if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                    return callback(client, *args)
+
+                error = None
+                begin = time.perf_counter()
+                try:
+                    return callback(client, *args)
+                except (StopPropagation, ContinuePropagation):
+                    raise
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    self._record(stats, handler_name, time.perf_counter() - begin, 0.0, error)
+
+        return instrumented
+
+    def install(self, client: Client) -> None:
+        """
+        Instrument all handlers added to the client from now on.
+
+        Handlers shared between clients (plugin modules are imported once) are
+        never modified; each client registers its own instrumented copy.
+        """
+        add_handler = client.add_handler
+        remove_handler = client.remove_handler
+        invoke = client.invoke
+
+        def instrumented_add_handler(handler: Handler, group: int = 0):
+            if group < 0:
+                add_handler(handler, group)
+                return handler, group
+            wrapped = copy.copy(handler)
+            wrapped.callback = self.wrap(handler.callback)
+            self._wrapped[id(handler)] = wrapped
+            add_handler(wrapped, group)
+            return handler, group
+
+        def instrumented_remove_handler(handler: Handler, group: int = 0):
+            remove_handler(self._wrapped.pop(id(handler), handler), group)
+
+        async def timed_invoke(query, retries: int = Session.MAX_RETRIES,
+                               timeout: float = Session.WAIT_TIMEOUT,
+                               sleep_threshold: float = None):
+            rpc = _rpc_time.get()
+            if rpc is None:
+                return await invoke(query, retries, timeout, sleep_threshold)
+            begin = time.perf_counter()
+            try:
+                return await invoke(query, retries, timeout, sleep_threshold)
+            finally:
+                rpc[0] += time.perf_counter() - begin
+
+        client.add_handler = instrumented_add_handler
+        client.remove_handler = instrumented_remove_handler
+        client.invoke = timed_invoke
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get per-handler call counts, timings and errors."""
+        return {handler_name: stats.as_dict() for handler_name, stats in self.handlers.items()}
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from pyrogram import Client, raw
+from pyrogram.handlers import RawUpdateHandler
+from pyrogram.types import User
+
+from utils.logger import get_logger
+
+
+class IdentityCache:
+    # Raw updates that change the account's own profile
+    USER_UPDATES = (
+        raw.types.UpdateUser,
+        raw.types.UpdateUserName,
+        raw.types.UpdateUserPhone,
+        raw.types.UpdateUserEmojiStatus
+    )
+
+    # Handler group the profile watcher runs in, ahead of user handlers
+    GROUP = -1
+
+    _caches: Dict[str, "IdentityCache"] = {}
+
+    def __init__(self, client: Client, ttl: float = 3600):
+        """
+        Cached result of ``get_me`` for one client.
+
+        The cached user is refreshed when it is older than ``ttl`` seconds or
+        after an update reports a change to the account's own profile.
+
+        Args:
+            client: Instance of Pyrogram client.
+            ttl: Seconds before the cached identity is refreshed (0 = never by age).
+        """
+        self.client = client
+        self.ttl = ttl
+        self.logger = get_logger(f"IdentityCache_{client.name}")
+        self._me: Optional[User] = None
+        self._fetched_at = 0.0
+        self._stale = False
+        self._lock = asyncio.Lock()
+        self._handler: Optional[RawUpdateHandler] = None
+        self.stats = {
+            'hits': 0,
+            'fetches': 0,
+            'invalidations': 0
+        }
+
+        if getattr(client, "me", None):
+            self.set(client.me)
+
+    @classmethod
+    def for_client(cls, client: Client) -> "IdentityCache":
+        """Get the identity cache of a client, creating one if the client has none."""
+        cache = cls._caches.get(client.name)
+        if cache is None or cache.client is not client:
+            cache = cls(client)
+            cls._caches[client.name] = cache
+        return cache
+
+    def _is_fresh(self) -> bool:
+        if self._me is None or self._stale:
+            return False
+        return not self.ttl or time.monotonic() - self._fetched_at < self.ttl
+
+    async def get(self) -> User:
+        """
+        Get the client's own user, fetching it only if the cache is stale.
+
+        Returns:
+            User: The account's own user object.
+        """
+        if self._is_fresh():
+            self.stats['hits'] += 1
+            return self._me
+
+        async with self._lock:
+            if not self._is_fresh():
+                self.set(await self.client.get_me())
+                self.stats['fetches'] += 1
+            else:
+                self.stats['hits'] += 1
+            return self._me
+
+    def set(self, me: User) -> None:
+        """Store a freshly fetched identity."""
+        self._me = me
+        self._fetched_at = time.monotonic()
+        self._stale = False
+
+    def invalidate(self) -> None:
+        """Force the next ``get`` to fetch the identity again."""
+        self._stale = True
+        self.stats['invalidations'] += 1
+
+    async def _on_raw_update(self, client: Client, update, users, chats) -> None:
+        if isinstance(update, self.USER_UPDATES) and self._me and update.user_id == self._me.id:
+            self.logger.debug(f"Profile update {type(update).__name__} received, invalidating identity")
+            self.invalidate()
+
+    def install(self) -> None:
+        """Register the cache for its client and watch for profile updates."""
+        IdentityCache._caches[self.client.name] = self
+        if self._handler is None:
+            self._handler = RawUpdateHandler(self._on_raw_update)
+            self.client.add_handler(self._handler, group=self.GROUP)
+
+    def uninstall(self) -> None:
+        """Unregister the cache from its client and stop watching for profile updates."""
+        if IdentityCache._caches.get(self.client.name) is self:
+            del IdentityCache._caches[self.client.name]
+        if self._handler is not None:
+            self.client.remove_handler(self._handler, self.GROUP)
+            self._handler = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            **self.stats,
+            'cached': self._me is not None,
+            'age': time.monotonic() - self._fetched_at if self._me else None
+        }
+
+
+async def get_me(client: Client) -> User:
+    """
+    Get the client's own user from its identity cache.
+
+    Args:
+        client: Instance of Pyrogram client.
+
+    Returns:
+        User: The account's own user object.
+    """
+    return await IdentityCache.for_client(client).get()
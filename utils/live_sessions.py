@@ -0,0 +1,106 @@
+import heapq
+import itertools
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class LiveSession:
+    __slots__ = ("user_id", "chat_id", "message_id", "start_ts")
+
+    def __init__(self, user_id: int, chat_id: int, message_id: int, start_ts: float):
+        """
+        A message kept up to date for one user.
+
+        Only the ids needed to edit the message are stored, not the Message object.
+        """
+        self.user_id = user_id
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.start_ts = start_ts
+
+    def __repr__(self) -> str:
+        return (
+            f"LiveSession(user_id={self.user_id}, chat_id={self.chat_id}, "
+            f"message_id={self.message_id}, start_ts={self.start_ts})"
+        )
+
+
+class LiveSessionStore:
+    def __init__(self, ttl: float):
+        """
+        Live sessions by user id with a min-heap expiry index.
+
+        Expiring sessions costs O(expired * log n) instead of a scan of all
+        sessions. Replaced and removed sessions are dropped from the heap
+        lazily, and the heap is rebuilt when stale entries dominate it.
+
+        Args:
+            ttl: Seconds a session lives after it starts.
+        """
+        self.ttl = ttl
+        self._sessions: Dict[int, LiveSession] = {}
+        self._expiry: List[Tuple[float, int, LiveSession]] = []
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._sessions
+
+    def __iter__(self) -> Iterator[LiveSession]:
+        return iter(list(self._sessions.values()))
+
+    def get(self, user_id: int) -> Optional[LiveSession]:
+        return self._sessions.get(user_id)
+
+    def add(self, user_id: int, chat_id: int, message_id: int,
+            start_ts: Optional[float] = None) -> LiveSession:
+        """
+        Start (or restart) the session of a user.
+
+        Args:
+            user_id: User the session belongs to.
+            chat_id: Chat of the message to update.
+            message_id: Message to update.
+            start_ts: Unix time the session started (defaults to now).
+
+        Returns:
+            LiveSession: The new session.
+        """
+        start_ts = time.time() if start_ts is None else start_ts
+        session = LiveSession(user_id, chat_id, message_id, start_ts)
+        self._sessions[user_id] = session
+        heapq.heappush(self._expiry, (start_ts + self.ttl, next(self._sequence), session))
+        self._compact()
+        return session
+
+    def remove(self, user_id: int) -> Optional[LiveSession]:
+        """Remove the session of a user. Its heap entry is dropped lazily."""
+        session = self._sessions.pop(user_id, None)
+        self._compact()
+        return session
+
+    def pop_expired(self, now: Optional[float] = None) -> List[LiveSession]:
+        """
+        Remove and return all sessions that expired by ``now``.
+
+        Args:
+            now: Unix time to expire against (defaults to now).
+
+        Returns:
+            List[LiveSession]: The expired sessions, oldest first.
+        """
+        now = time.time() if now is None else now
+        expired = []
+        while self._expiry and self._expiry[0][0] <= now:
+            _, _, session = heapq.heappop(self._expiry)
+            if self._sessions.get(session.user_id) is session:
+                del self._sessions[session.user_id]
+                expired.append(session)
+        return expired
+
+    def _compact(self) -> None:
+        if len(self._expiry) > 2 * len(self._sessions) + 64:
+            self._expiry = [entry for entry in self._expiry if self._sessions.get(entry[2].user_id) is entry[2]]
+            heapq.heapify(self._expiry)
@@ -1,8 +1,13 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 
 
 class ColoredFormatter(logging.Formatter):
@@ -27,66 +32,258 @@ class ColoredFormatter(logging.Formatter):
 
     def format(self, record):
         # Determine client type from logger name
-        client_type = "system"
-        if "_" in record.name:
-            prefix = record.name.split("_")[0]
-            if prefix in ["user", "bot"]:
-                client_type = prefix
+        client_type = _client_type(record.name)
+        if client_type not in ("user", "bot"):
+            client_type = "system"
 
         # Add color for client type
         client_color = self.CLIENT_COLORS.get(client_type, "")
         level_color = self.LEVEL_COLORS.get(record.levelno, "")
 
-        # Format the message
-        record.msg = f"{client_color}[{record.name}]{self.RESET} {level_color}{record.msg}{self.RESET}"
+        # Format a copy, so other handlers still see the original message
+        record = copy.copy(record)
+        record.msg = f"{client_color}[{record.name}]{self.RESET} {level_color}{record.getMessage()}{self.RESET}"
+        record.args = None
 
         return super().format(record)
 
 
+class _LazyQueueHandler(QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one compact JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+class _ClientTypeFileHandler(logging.Handler):
+    """Writes each record to the shared log file of its client type."""
+
+    def emit(self, record):
+        LoggerFactory.get_file_handler(_client_type(record.name)).handle(record)
+
+
+def _client_type(name: str) -> str:
+    """Determine client type from logger name."""
+    return name.split("_")[0] if "_" in name else "system"
+
+
 class LoggerFactory:
+    SYNC = "sync"
+    QUEUE = "queue"
+
+    TEXT = "text"
+    JSON = "json"
+
     _loggers: Dict[str, logging.Logger] = {}
+    _mode: Optional[str] = SYNC  # None after shutdown
+    _format = TEXT
+    _file_tag = ""
+    _console_handler: Optional[logging.Handler] = None
+    _file_handlers: Dict[str, logging.Handler] = {}
+    _handlers_lock = threading.Lock()
+    _queue: Optional[queue.SimpleQueue] = None
+    _queue_handler: Optional[QueueHandler] = None
+    _listener: Optional[QueueListener] = None
 
     @classmethod
-    def get_logger(cls, name: str) -> logging.Logger:
-        if name in cls._loggers:
-            return cls._loggers[name]
+    def configure(cls, mode: str = SYNC, fmt: str = TEXT) -> None:
+        """
+        Select how log records are written.
 
-        logger = logging.getLogger(name)
-        logger.setLevel(logging.DEBUG)
+        In ``sync`` mode every logger writes to the console and its log file
+        directly. In ``queue`` mode loggers only put records on a queue, and a
+        single background thread formats and writes them, so logging never
+        blocks the event loop on I/O.
 
-        if not logger.handlers:
-            # Console handler
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setFormatter(ColoredFormatter(
-                "%(asctime)s - %(message)s",
-                datefmt="%H:%M:%S"
-            ))
-            logger.addHandler(console_handler)
+        Args:
+            mode: ``sync`` or ``queue``.
+            fmt: ``text`` for the plain log format or ``json`` for one JSON
+                object per line in ``logs/<type>.jsonl``.
+        """
+        if mode not in (cls.SYNC, cls.QUEUE):
+            raise ValueError(f"Unknown logging mode: {mode}")
+        if fmt not in (cls.TEXT, cls.JSON):
+            raise ValueError(f"Unknown logging format: {fmt}")
+        if (mode, fmt) == (cls._mode, cls._format):
+            return
 
-            # Rotating file handler
-            log_dir = Path("logs")
-            log_dir.mkdir(exist_ok=True)
+        cls._stop_listener()
+        cls._close_handlers()
+        cls._mode = mode
+        cls._format = fmt
 
-            # Determine client type from logger name
-            client_type = "system"
-            if "_" in name:
-                client_type = name.split("_")[0]
-
-            # Create a separate file for each client type
-            file_handler = RotatingFileHandler(
-                log_dir / f"{client_type}.log",
-                maxBytes=2 * 1024 * 1024,  # 2MB
-                backupCount=3,
-                encoding="utf-8"
+        if mode == cls.QUEUE:
+            cls._queue = queue.SimpleQueue()
+            cls._queue_handler = _LazyQueueHandler(cls._queue)
+            cls._listener = QueueListener(
+                cls._queue,
+                cls.get_console_handler(),
+                _ClientTypeFileHandler(),
+                respect_handler_level=True
             )
+            cls._listener.start()
+
+        for logger in cls._loggers.values():
+            cls._attach_handlers(logger)
+
+    @classmethod
+    def set_file_tag(cls, tag: str) -> None:
+        """
+        Add a tag to the log file names, e.g. ``logs/user.w0.log``.
+
+        Used by worker processes, so each process rotates its own files.
+
+        Args:
+            tag: File name tag (empty for no tag).
+        """
+        if tag == cls._file_tag:
+            return
+        cls._file_tag = tag
+        # The listener thread resolves file handlers lazily, so it picks up the new files too
+        with cls._handlers_lock:
+            handlers = list(cls._file_handlers.values())
+            cls._file_handlers.clear()
+        for handler in handlers:
+            handler.close()
+        if cls._mode == cls.SYNC:
+            for logger in cls._loggers.values():
+                cls._attach_handlers(logger)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Flush queued records, stop the background listener and close all log files.
+
+        Loggers keep no handlers until the next ``configure``, so no log file is
+        reopened while the interpreter exits.
+        """
+        cls._stop_listener()
+        cls._mode = None
+        for logger in cls._loggers.values():
+            cls._attach_handlers(logger)
+        cls._close_handlers()
+
+    @classmethod
+    def _stop_listener(cls) -> None:
+        if cls._listener:
+            cls._listener.stop()
+            cls._listener = None
+            cls._queue = None
+            cls._queue_handler = None
+
+    @classmethod
+    def _close_handlers(cls) -> None:
+        with cls._handlers_lock:
+            handlers = list(cls._file_handlers.values())
+            if cls._console_handler:
+                handlers.append(cls._console_handler)
+            cls._file_handlers.clear()
+            cls._console_handler = None
+        for handler in handlers:
+            # The stream may already be closed at exit, like logging.shutdown() allows for
+            try:
+                handler.flush()
+                handler.close()
+            except (OSError, ValueError):
+                pass
+
+    @classmethod
+    def get_console_handler(cls) -> logging.Handler:
+        """Get the console handler shared by all loggers."""
+        with cls._handlers_lock:
+            if cls._console_handler is None:
+                cls._console_handler = logging.StreamHandler(sys.stdout)
+                cls._console_handler.setFormatter(ColoredFormatter(
+                    "%(asctime)s - %(message)s",
+                    datefmt="%H:%M:%S"
+                ))
+            return cls._console_handler
+
+    @classmethod
+    def get_file_handler(cls, client_type: str) -> logging.Handler:
+        """
+        Get the rotating file handler shared by all loggers of a client type.
+
+        One handler per file means one open descriptor, and rotation happens
+        under that handler's lock instead of racing between handlers.
+        """
+        with cls._handlers_lock:
+            handler = cls._file_handlers.get(client_type)
+            if handler is None:
+                handler = cls._create_file_handler(client_type)
+                cls._file_handlers[client_type] = handler
+            return handler
+
+    @classmethod
+    def _create_file_handler(cls, client_type: str) -> logging.Handler:
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+
+        # Create a separate file for each client type
+        suffix = "jsonl" if cls._format == cls.JSON else "log"
+        tag = f".{cls._file_tag}" if cls._file_tag else ""
+        file_handler = RotatingFileHandler(
+            log_dir / f"{client_type}{tag}.{suffix}",
+            maxBytes=2 * 1024 * 1024,  # 2MB
+            backupCount=3,
+            encoding="utf-8"
+        )
+        if cls._format == cls.JSON:
+            file_handler.setFormatter(JsonLinesFormatter())
+        else:
             file_handler.setFormatter(logging.Formatter(
                 "%(asctime)s - [%(name)s] - %(levelname)s - %(message)s"
             ))
-            logger.addHandler(file_handler)
+        return file_handler
+
+    @classmethod
+    def _attach_handlers(cls, logger: logging.Logger) -> None:
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+        handlers: List[logging.Handler]
+        if cls._mode is None:
+            handlers = []
+        elif cls._mode == cls.QUEUE:
+            handlers = [cls._queue_handler]
+        else:
+            handlers = [cls.get_console_handler(), cls.get_file_handler(_client_type(logger.name))]
+
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    @classmethod
+    def get_logger(cls, name: str) -> logging.Logger:
+        if name in cls._loggers:
+            return cls._loggers[name]
+
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.DEBUG)
+
+        if not logger.handlers:
+            cls._attach_handlers(logger)
 
         cls._loggers[name] = logger
         return logger
 
 
+atexit.register(LoggerFactory.shutdown)
+
+
 def get_logger(name: str) -> logging.Logger:
     return LoggerFactory.get_logger(name)
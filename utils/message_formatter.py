@@ -1,11 +1,67 @@
+import re
 from typing import Optional, Union, Dict, Any
 
 from pyrogram import enums, Client
 
 from utils.logger import get_logger
 
+# Allowed HTML tags
+ALLOWED_HTML_TAGS = [
+    '<b>', '</b>', '<i>', '</i>', '<u>', '</u>',
+    '<s>', '</s>', '<code>', '</code>', '<pre>', '</pre>',
+    '<a>', '</a>', '<spoiler>', '</spoiler>'
+]
+
+# Limited set of tags is supported in buttons
+ALLOWED_BUTTON_HTML_TAGS = ['<b>', '</b>', '<i>', '</i>', '<u>', '</u>', '<s>', '</s>']
+
+# Special characters for Markdown
+MARKDOWN_SPECIAL_CHARS = ['\\', '`', '*', '_', '{', '}', '[', ']', '(', ')', '#', '+', '-', '.', '!']
+
+
+def _tag_names(tags):
+    return sorted({tag.strip('</>') for tag in tags}, key=len, reverse=True)
+
+
+def _tags_pattern(template, tags):
+    return re.compile(template.format('|'.join(map(re.escape, _tag_names(tags)))))
+
+
+def _clean_html_replacement(match):
+    return _CLEAN_HTML_REPLACEMENTS[match[0]]
+
+
+# Precompiled patterns. _CLEAN_HTML_RE escapes "<" and ">" and restores the
+# allowed tags in one scan; a tag may be written raw or already escaped, as
+# both end up as the same tag after escaping.
+_CLEAN_HTML_RE = _tags_pattern('<(?:/?(?:{0})(?:>|&gt;))?|&lt;/?(?:{0})(?:>|&gt;)|>', ALLOWED_HTML_TAGS)
+_ALLOWED_TAG_RE = _tags_pattern('</?(?:{})>', ALLOWED_HTML_TAGS)
+_BUTTON_DISALLOWED_TAG_RE = _tags_pattern(
+    '</?(?:{})>', set(ALLOWED_HTML_TAGS) - set(ALLOWED_BUTTON_HTML_TAGS)
+)
+_ESCAPED_TAGS = {tag.replace('<', '&lt;').replace('>', '&gt;'): tag for tag in ALLOWED_HTML_TAGS}
+_CLEAN_HTML_REPLACEMENTS = {
+    '<': '&lt;',
+    '>': '&gt;',
+    **{
+        opening + tag[1:-1] + closing: tag
+        for tag in ALLOWED_HTML_TAGS for opening in ('<', '&lt;') for closing in ('>', '&gt;')
+    }
+}
+# The single scan pays a callback per "<", one str.replace per allowed tag
+# pays per character. With more than a few "<" plus one per this many
+# characters, the replaces are faster (see benchmarks/message_formatter_bench).
+_CLEAN_HTML_SCAN_TAGS = 6
+_CLEAN_HTML_SCAN_SPACING = 128
+# Backslash must stay first so inserted escapes are not escaped again
+_MARKDOWN_ESCAPES = [(char, '\\' + char) for char in MARKDOWN_SPECIAL_CHARS]
+_MARKDOWN_TAG_RE = re.compile(r'\*\*|__|~~|`')
+
 
 class MessageFormatter:
+    ALLOWED_HTML_TAGS = ALLOWED_HTML_TAGS
+    MARKDOWN_SPECIAL_CHARS = MARKDOWN_SPECIAL_CHARS
+
     def __init__(self, client: Client):
         """
         Message formatter considering client settings.
@@ -28,16 +84,6 @@ class MessageFormatter:
             'lang_code': client.lang_code
         }
 
-        # Allowed HTML tags
-        self.ALLOWED_HTML_TAGS = [
-            '<b>', '</b>', '<i>', '</i>', '<u>', '</u>',
-            '<s>', '</s>', '<code>', '</code>', '<pre>', '</pre>',
-            '<a>', '</a>', '<spoiler>', '</spoiler>'
-        ]
-
-        # Special characters for Markdown
-        self.MARKDOWN_SPECIAL_CHARS = ['\\', '`', '*', '_', '{', '}', '[', ']', '(', ')', '#', '+', '-', '.', '!']
-
     def _get_client_parse_mode(self) -> enums.ParseMode:
         """Get the markup mode from client settings."""
         client_parse_mode = getattr(self.client, 'parse_mode', 'DEFAULT')
@@ -112,11 +158,7 @@ class MessageFormatter:
         Returns:
             bool: Whether there are conflicts.
         """
-        markdown_tags = ['**', '__', '~~', '`', '```']
-        has_markdown = any(tag in text for tag in markdown_tags)
-        has_html = any(tag in text for tag in self.ALLOWED_HTML_TAGS)
-
-        return has_markdown and has_html
+        return bool(_MARKDOWN_TAG_RE.search(text)) and bool(_ALLOWED_TAG_RE.search(text))
 
     def _clean_html(self, text: str) -> str:
         """
@@ -128,15 +170,17 @@ class MessageFormatter:
         Returns:
             str: Cleaned text.
         """
-        # First, escape all HTML tags
-        text = text.replace('<', '&lt;').replace('>', '&gt;')
-
-        # Restore allowed tags
-        for tag in self.ALLOWED_HTML_TAGS:
-            escaped_tag = tag.replace('<', '&lt;').replace('>', '&gt;')
-            text = text.replace(escaped_tag, tag)
+        if '<' not in text and '&lt;' not in text:
+            return text.replace('>', '&gt;')
+        if text.count('<') > _CLEAN_HTML_SCAN_TAGS + len(text) // _CLEAN_HTML_SCAN_SPACING:
+            # Dense markup: escape all HTML tags, then restore the allowed ones
+            text = text.replace('<', '&lt;').replace('>', '&gt;')
+            for escaped_tag, tag in _ESCAPED_TAGS.items():
+                text = text.replace(escaped_tag, tag)
+            return text
 
-        return text
+        # Escape and restore in a single scan
+        return _CLEAN_HTML_RE.sub(_clean_html_replacement, text)
 
     def _escape_markdown(self, text: str) -> str:
         """
@@ -148,8 +192,10 @@ class MessageFormatter:
         Returns:
             str: Text with escaped characters.
         """
-        for char in self.MARKDOWN_SPECIAL_CHARS:
-            text = text.replace(char, f'\\{char}')
+        # str.replace per character stays faster than a regex or translate
+        # table here, so only the escaped forms are precomputed
+        for char, escaped in _MARKDOWN_ESCAPES:
+            text = text.replace(char, escaped)
         return text
 
     def create_button_text(self, text: str, parse_mode: Optional[Union[str, enums.ParseMode]] = None) -> str:
@@ -166,16 +212,10 @@ class MessageFormatter:
         # Buttons have specific restrictions
         mode = self._normalize_parse_mode(parse_mode) if parse_mode else self.default_parse_mode
 
-        # Limited set of tags is supported in buttons
-        allowed_button_html_tags = ['<b>', '</b>', '<i>', '</i>', '<u>', '</u>', '<s>', '</s>']
-
         try:
             if mode == enums.ParseMode.HTML:
                 # Clean text from all tags except those allowed for buttons
-                text = self._clean_html(text)
-                for tag in self.ALLOWED_HTML_TAGS:
-                    if tag not in allowed_button_html_tags:
-                        text = text.replace(tag, '')
+                text = _BUTTON_DISALLOWED_TAG_RE.sub('', self._clean_html(text))
             elif mode == enums.ParseMode.MARKDOWN:
                 # Only basic formatting is supported in buttons
                 text = self._escape_markdown(text)
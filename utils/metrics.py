@@ -0,0 +1,342 @@
+import asyncio
+import bisect
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pyrogram import Client
+from pyrogram.errors import FloodWait
+from pyrogram.session import Session
+
+from utils.logger import get_logger
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self) -> None:
+        """Drop all label combinations, e.g. before re-collecting them."""
+        self._values.clear()
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+            for key, value in self._values.items()
+        ]
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.TYPE}",
+            *self._samples()
+        ]
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set the total directly, for totals collected from component statistics."""
+        self._values[self._key(labels)] = value
+
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # Per-bucket counts, sum, count
+            state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            state[0][index] += 1
+        state[1] += value
+        state[2] += 1
+
+    def _samples(self) -> List[str]:
+        samples = []
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                samples.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            samples.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            samples.append(f"{self.name}_sum{labels} {total}")
+            samples.append(f"{self.name}_count{labels} {count}")
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Collection of metrics rendered together in the Prometheus text format."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric) -> Any:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that updates metrics right before they are rendered."""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """Run all collectors and render every metric."""
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Metrics recorded while the clients run
+RPC_DURATION = REGISTRY.histogram(
+    "pyrogram_rpc_duration_seconds", "Duration of raw API calls.", ("client", "method")
+)
+RPC_ERRORS = REGISTRY.counter(
+    "pyrogram_rpc_errors_total", "Raw API calls that raised an error.", ("client", "method", "error")
+)
+FLOOD_WAIT_SECONDS = REGISTRY.counter(
+    "pyrogram_flood_wait_seconds_total", "Seconds of FloodWait imposed on raw API calls.", ("client",)
+)
+TICK_DURATION = REGISTRY.histogram(
+    "pyrogram_periodic_tick_duration_seconds", "Duration of periodic fan-out ticks.", ("client",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+
+# Metrics collected from component statistics on every scrape
+CLIENT_CONNECTED = REGISTRY.gauge(
+    "pyrogram_client_connected", "Whether the client is connected.", ("client", "type")
+)
+CLIENT_ERRORS = REGISTRY.counter(
+    "pyrogram_client_errors_total", "Errors handled by the client's error handler.", ("client", "error")
+)
+CLIENT_FLOOD_WAITS = REGISTRY.counter(
+    "pyrogram_client_flood_waits_total", "FloodWaits handled by the client's error handler.", ("client",)
+)
+UPDATES_QUEUE_DEPTH = REGISTRY.gauge(
+    "pyrogram_updates_queue_depth", "Updates waiting for a handler worker.", ("client",)
+)
+HANDLER_WORKERS = REGISTRY.gauge(
+    "pyrogram_handler_workers", "Handler workers of the client's dispatcher.", ("client",)
+)
+START_ATTEMPTS = REGISTRY.counter(
+    "pyrogram_start_attempts_total", "Start attempts of the client manager.", ("client",)
+)
+CIRCUIT_OPEN = REGISTRY.gauge(
+    "pyrogram_circuit_open", "Whether the client's start circuit breaker is open.", ("client",)
+)
+RATE_LIMIT = REGISTRY.gauge(
+    "pyrogram_rate_limit", "Current outbound rate limit in calls per second.", ("client", "method_class")
+)
+FANOUT_CALLS = REGISTRY.counter(
+    "pyrogram_fanout_calls_total", "Calls of periodic fan-out ticks by outcome.", ("client", "outcome")
+)
+RENDER_CACHE = REGISTRY.counter(
+    "pyrogram_render_cache_total", "Render cache lookups of periodic message edits by result.", ("client", "result")
+)
+SESSION_CACHE = REGISTRY.counter(
+    "pyrogram_session_cache_total", "Session string cache lookups by result.", ("client", "result")
+)
+SCHEDULER_JOBS = REGISTRY.gauge(
+    "pyrogram_scheduler_jobs", "Jobs registered with the shared scheduler."
+)
+SCHEDULER_WAKEUPS = REGISTRY.gauge(
+    "pyrogram_scheduler_wakeups_per_second", "Wakeups of the shared scheduler per second."
+)
+
+
+def collect_statistics(statistics: Dict[str, Any]) -> None:
+    """
+    Update the collected metrics from ``PyrogramMultiClient.get_statistics()``.
+
+    Clients that are no longer running disappear from the output.
+    """
+    for metric in (CLIENT_CONNECTED, CLIENT_ERRORS, CLIENT_FLOOD_WAITS, UPDATES_QUEUE_DEPTH, HANDLER_WORKERS,
+                   START_ATTEMPTS, CIRCUIT_OPEN, RATE_LIMIT, FANOUT_CALLS, RENDER_CACHE, SESSION_CACHE):
+        metric.clear()
+
+    for name, stats in statistics.get('clients', {}).items():
+        CLIENT_CONNECTED.set(int(stats['connected']), client=name, type=stats['type'])
+        UPDATES_QUEUE_DEPTH.set(stats.get('updates_queue', 0), client=name)
+        workers = stats.get('workers')
+        if workers:
+            HANDLER_WORKERS.set(workers['workers'], client=name)
+
+        retries = stats['retries']
+        START_ATTEMPTS.set(retries['attempts'], client=name)
+        CIRCUIT_OPEN.set(int(retries['circuit']['state'] == "open"), client=name)
+
+        errors = stats.get('errors')
+        if errors:
+            CLIENT_FLOOD_WAITS.set(errors['flood_wait_counts'], client=name)
+            for error, count in errors['error_types'].items():
+                CLIENT_ERRORS.set(count, client=name, error=error)
+            for method_class, limit in errors.get('rate_limits', {}).items():
+                RATE_LIMIT.set(limit['rate'], client=name, method_class=method_class)
+
+        fanout = stats.get('fanout')
+        if fanout:
+            for outcome in ('completed', 'failed', 'dropped'):
+                FANOUT_CALLS.set(fanout[outcome], client=name, outcome=outcome)
+
+        render_cache = stats.get('render_cache')
+        if render_cache:
+            for result in ('hits', 'misses'):
+                RENDER_CACHE.set(render_cache[result], client=name, result=result)
+
+        session = stats.get('session') or {}
+        cache = session.get('session_cache')
+        if cache:
+            for result in ('hits', 'misses', 'rejected'):
+                SESSION_CACHE.set(cache[result], client=name, result=result)
+
+    scheduler = statistics.get('scheduler')
+    if scheduler:
+        SCHEDULER_JOBS.set(scheduler['jobs'])
+        SCHEDULER_WAKEUPS.set(scheduler['wakeups_per_second'])
+
+
+def install_rpc_metrics(client: Client) -> None:
+    """
+    Record the latency, errors and FloodWaits of the client's raw calls.
+
+    Install it before other ``invoke`` wrappers such as the rate limiter, so
+    only the time spent on the call itself is measured.
+    """
+    invoke = client.invoke
+    name = client.name
+
+    async def measured_invoke(query, retries: int = Session.MAX_RETRIES,
+                              timeout: float = Session.WAIT_TIMEOUT,
+                              sleep_threshold: float = None):
+        method = type(query).__name__
+        begin = time.perf_counter()
+        try:
+            return await invoke(query, retries, timeout, sleep_threshold)
+        except FloodWait as e:
+            FLOOD_WAIT_SECONDS.inc(e.value, client=name)
+            RPC_ERRORS.inc(client=name, method=method, error="FloodWait")
+            raise
+        except Exception as e:
+            RPC_ERRORS.inc(client=name, method=method, error=type(e).__name__)
+            raise
+        finally:
+            RPC_DURATION.observe(time.perf_counter() - begin, client=name, method=method)
+
+    client.invoke = measured_invoke
+
+
+class MetricsServer:
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9090):
+        """
+        Minimal HTTP server publishing ``GET /metrics`` in the Prometheus text format.
+
+        Args:
+            registry: Metrics to publish.
+            host: Address to listen on.
+            port: Port to listen on.
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.logger = get_logger("MetricsServer")
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5)
+            # Skip the headers
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, content_type = "200 OK", "text/plain; version=0.0.4; charset=utf-8"
+                body = self.registry.render().encode("utf-8")
+            else:
+                status, content_type, body = "404 Not Found", "text/plain; charset=utf-8", b"Not Found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except Exception as e:
+            self.logger.debug(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
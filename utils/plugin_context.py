@@ -0,0 +1,67 @@
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from pyrogram import Client
+
+from config.settings import ClientConfig
+
+T = TypeVar("T")
+
+
+class PluginContext:
+    _contexts: Dict[str, "PluginContext"] = {}
+
+    def __init__(self, name: str, config: Optional[ClientConfig] = None):
+        """
+        Per-client settings and state of shared plugin packages.
+
+        A plugin package is imported once and its handlers are attached to
+        every client that lists it. Handlers look up the context of the client
+        they run for, so one copy of the plugin code serves any number of
+        accounts.
+
+        Args:
+            name: Session name of the client.
+            config: Configuration of the client; ``plugins.settings`` holds
+                the plugin parameters.
+        """
+        self.name = name
+        self.config = config
+        self.settings: Dict[str, Any] = dict(config.plugins.settings) if config else {}
+        self._state: Dict[str, Any] = {}
+
+    @classmethod
+    def for_client(cls, client: Client) -> "PluginContext":
+        """Get the plugin context of a client, creating an empty one if it has none."""
+        context = cls._contexts.get(client.name)
+        if context is None:
+            context = cls(client.name)
+            cls._contexts[client.name] = context
+        return context
+
+    def install(self) -> None:
+        """Register the context for its client."""
+        PluginContext._contexts[self.name] = self
+
+    def uninstall(self) -> None:
+        """Unregister the context and drop the plugin state."""
+        if PluginContext._contexts.get(self.name) is self:
+            del PluginContext._contexts[self.name]
+        self._state.clear()
+
+    def setting(self, key: str, default: Any = None) -> Any:
+        """Get a plugin parameter from the client's configuration."""
+        return self.settings.get(key, default)
+
+    def state(self, key: str, factory: Callable[["PluginContext"], T]) -> T:
+        """
+        Get the plugin state stored under ``key``, creating it on first use.
+
+        Args:
+            key: Name of the state, unique across the plugins of a client.
+            factory: Called with this context to create the state.
+        """
+        value = self._state.get(key)
+        if value is None:
+            value = factory(self)
+            self._state[key] = value
+        return value
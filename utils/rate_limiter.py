@@ -0,0 +1,261 @@
+import asyncio
+import time
+from typing import Any, Dict, Hashable, Optional
+
+from pyrogram import Client, raw
+from pyrogram.errors import FloodWait
+from pyrogram.session import Session
+
+from config.settings import RateLimitConfig
+from utils.logger import get_logger
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Asynchronous token bucket.
+
+        Args:
+            rate: Tokens added per second (0 = unlimited).
+            capacity: Maximum burst size (defaults to one second worth of tokens).
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now < self._updated_at:
+            return
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Get the number of seconds until ``tokens`` are available."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(time.monotonic())
+        missing = tokens - self._tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Wait until ``tokens`` are available and take them.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        async with self._lock:
+            while True:
+                wait = self.delay(tokens)
+                if wait <= 0:
+                    self._tokens -= tokens
+                    return waited
+                await asyncio.sleep(wait)
+                waited += wait
+
+
+class KeyedRateLimiter:
+    def __init__(self, rate: float):
+        """
+        Minimum spacing between operations on the same key (e.g. a chat).
+
+        Only the next free slot per key is stored, so thousands of keys cost
+        one float each.
+
+        Args:
+            rate: Operations per second per key (0 = unlimited).
+        """
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[Hashable, float] = {}
+
+    def reserve(self, key: Hashable) -> float:
+        """
+        Reserve the next slot for ``key``.
+
+        Returns:
+            float: Seconds to wait before the slot starts.
+        """
+        if not self.interval:
+            return 0.0
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(key, now))
+        self._next_slot[key] = slot + self.interval
+        return slot - now
+
+    def prune(self) -> None:
+        """Forget keys whose slots are already in the past."""
+        now = time.monotonic()
+        self._next_slot = {key: slot for key, slot in self._next_slot.items() if slot > now}
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    def __init__(self, max_rate: float, min_rate: float, decrease_factor: float = 0.5,
+                 recovery_interval: float = 60.0):
+        """
+        Token bucket that backs off on FloodWait and slowly recovers.
+
+        The rate is multiplied by ``decrease_factor`` on every FloodWait and
+        raised by 10% of ``max_rate`` after each ``recovery_interval`` seconds
+        without one.
+
+        Args:
+            max_rate: Highest allowed rate (calls per second).
+            min_rate: Lowest rate the bucket backs off to.
+            decrease_factor: Multiplier applied to the rate on FloodWait.
+            recovery_interval: Seconds without FloodWait before the rate is raised.
+        """
+        super().__init__(max_rate)
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.decrease_factor = decrease_factor
+        self.recovery_interval = recovery_interval
+        self._blocked_until = 0.0
+        self._adjusted_at = time.monotonic()
+
+    def delay(self, tokens: float = 1.0) -> float:
+        blocked = self._blocked_until - time.monotonic()
+        return max(blocked, super().delay(tokens))
+
+    def on_flood_wait(self, seconds: float) -> None:
+        """Lower the rate and block the bucket for the FloodWait duration."""
+        now = time.monotonic()
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.capacity = max(self.rate, 1.0)
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        # Start refilling only once the wait is over, so the bucket does not burst
+        self._tokens = 0.0
+        self._updated_at = now + seconds
+        self._adjusted_at = now + seconds
+
+    def on_success(self) -> None:
+        """Raise the rate again once enough time has passed without FloodWait."""
+        if self.rate >= self.max_rate:
+            return
+        now = time.monotonic()
+        if now - self._adjusted_at >= self.recovery_interval:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+            self.capacity = max(self.rate, 1.0)
+            self._adjusted_at = now
+
+
+class ClientRateLimiter:
+    # Raw functions grouped into method classes that share a limit
+    METHOD_CLASSES = {
+        "send": (
+            raw.functions.messages.SendMessage,
+            raw.functions.messages.SendMedia,
+            raw.functions.messages.SendMultiMedia,
+            raw.functions.messages.ForwardMessages,
+            raw.functions.messages.SendInlineBotResult
+        ),
+        "edit": (
+            raw.functions.messages.EditMessage,
+            raw.functions.messages.EditInlineBotMessage
+        ),
+        "resolve": (
+            raw.functions.contacts.ResolveUsername,
+            raw.functions.contacts.ResolvePhone,
+            raw.functions.users.GetUsers,
+            raw.functions.channels.GetChannels
+        )
+    }
+
+    def __init__(self, name: str, config: RateLimitConfig):
+        """
+        Proactive outbound rate limiter of one client.
+
+        Args:
+            name: Session name of the client.
+            config: Rate limit settings.
+        """
+        self.name = name
+        self.logger = get_logger(f"RateLimiter_{name}")
+        self.buckets: Dict[str, AdaptiveTokenBucket] = {
+            method_class: AdaptiveTokenBucket(
+                max_rate,
+                max_rate * config.min_rate_factor,
+                config.decrease_factor,
+                config.recovery_interval
+            )
+            for method_class, max_rate in (
+                ("send", config.send),
+                ("edit", config.edit),
+                ("resolve", config.resolve)
+            )
+            if max_rate > 0
+        }
+        self._classes = {
+            query_type: method_class
+            for method_class, query_types in self.METHOD_CLASSES.items()
+            for query_type in query_types
+        }
+        self.stats = {
+            method_class: {'calls': 0, 'flood_waits': 0, 'flood_wait_seconds': 0, 'waited_seconds': 0.0}
+            for method_class in self.buckets
+        }
+
+    def classify(self, query: Any) -> Optional[str]:
+        """Get the method class of a raw query, if it is limited."""
+        method_class = self._classes.get(type(query))
+        return method_class if method_class in self.buckets else None
+
+    def on_flood_wait(self, method_class: str, seconds: int) -> None:
+        """Feed a FloodWait back into the limiter of a method class."""
+        bucket = self.buckets.get(method_class)
+        if not bucket:
+            return
+        bucket.on_flood_wait(seconds)
+        self.stats[method_class]['flood_waits'] += 1
+        self.stats[method_class]['flood_wait_seconds'] += seconds
+        self.logger.warning(
+            f"FloodWait of {seconds}s on {method_class}, "
+            f"lowering rate to {bucket.rate:.2f}/s"
+        )
+
+    def install(self, client: Client) -> None:
+        """
+        Route the client's raw calls through the limiter.
+
+        FloodWaits of limited calls are raised to the limiter instead of being
+        slept inside Pyrogram, so they can lower the rate. Waits up to the
+        client's sleep threshold are still retried transparently.
+        """
+        invoke = client.invoke
+
+        async def limited_invoke(query, retries: int = Session.MAX_RETRIES,
+                                 timeout: float = Session.WAIT_TIMEOUT,
+                                 sleep_threshold: float = None):
+            method_class = self.classify(query)
+            if method_class is None:
+                return await invoke(query, retries, timeout, sleep_threshold)
+
+            threshold = sleep_threshold if sleep_threshold is not None else client.sleep_threshold
+            bucket = self.buckets[method_class]
+            stats = self.stats[method_class]
+            while True:
+                stats['waited_seconds'] += await bucket.acquire()
+                stats['calls'] += 1
+                try:
+                    result = await invoke(query, retries, timeout, 0)
+                except FloodWait as e:
+                    self.on_flood_wait(method_class, e.value)
+                    if e.value > threshold:
+                        raise
+                    continue
+                bucket.on_success()
+                return result
+
+        client.invoke = limited_invoke
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get per-method-class rates and FloodWait counts."""
+        return {
+            method_class: {**self.stats[method_class], 'rate': bucket.rate}
+            for method_class, bucket in self.buckets.items()
+        }
@@ -0,0 +1,78 @@
+import hashlib
+from typing import Any, Dict, Tuple
+
+from pyrogram import Client
+
+
+class RenderCache:
+    _caches: Dict[str, "RenderCache"] = {}
+
+    def __init__(self, name: str):
+        """
+        Content digests of the messages a client keeps editing.
+
+        Periodic updaters ask the cache before editing a message; an edit whose
+        text has the same BLAKE2b digest as the last one sent for that message
+        is skipped instead of costing a call that Telegram answers with
+        MESSAGE_NOT_MODIFIED. Unlike ``hash()``, the digest makes a collision
+        that would skip a real edit practically impossible.
+
+        Args:
+            name: Session name of the client.
+        """
+        self.name = name
+        self._hashes: Dict[Tuple[int, int], bytes] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_client(cls, client: Client) -> "RenderCache":
+        """Get the render cache of a client, creating one if it has none."""
+        cache = cls._caches.get(client.name)
+        if cache is None:
+            cache = cls(client.name)
+            cls._caches[client.name] = cache
+        return cache
+
+    def install(self) -> None:
+        """Register the cache for its client."""
+        RenderCache._caches[self.name] = self
+
+    def uninstall(self) -> None:
+        """Unregister the cache and drop its entries."""
+        if RenderCache._caches.get(self.name) is self:
+            del RenderCache._caches[self.name]
+        self._hashes.clear()
+
+    def changed(self, chat_id: int, message_id: int, text: str) -> bool:
+        """
+        Check whether ``text`` differs from the last text sent to the message.
+
+        A changed text is remembered right away; call ``forget`` if the edit
+        is then not delivered, so the next tick sends it again.
+
+        Returns:
+            bool: True if the message should be edited.
+        """
+        key = (chat_id, message_id)
+        digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        if self._hashes.get(key) == digest:
+            self.hits += 1
+            return False
+        self._hashes[key] = digest
+        self.misses += 1
+        return True
+
+    def forget(self, chat_id: int, message_id: int) -> None:
+        """Drop the entry of a message, e.g. when its edit failed or its session ended."""
+        self._hashes.pop((chat_id, message_id), None)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get the number of cached messages and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._hashes),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
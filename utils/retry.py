@@ -0,0 +1,126 @@
+import random
+import time
+from typing import Any, Dict
+
+
+class BackoffPolicy:
+    def __init__(self, base_delay: float = 5.0, max_delay: float = 60.0, multiplier: float = 2.0):
+        """
+        Exponential backoff with full jitter.
+
+        The delay before retry ``n`` is drawn uniformly from
+        ``[0, min(max_delay, base_delay * multiplier ** n)]``, so clients that
+        failed together do not retry together.
+
+        Args:
+            base_delay: Upper bound of the first delay in seconds.
+            max_delay: Cap of the delay upper bound in seconds.
+            multiplier: Growth factor of the upper bound per attempt.
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get a jittered delay for a retry.
+
+        Args:
+            attempt: Number of the retry, starting at 0.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return random.uniform(0, ceiling)
+
+    def after(self, seconds: float) -> float:
+        """
+        Get a jittered delay for a wait imposed by the server, such as FloodWait.
+
+        Never returns less than ``seconds``.
+        """
+        return seconds + random.uniform(0, self.base_delay)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    _breakers: Dict[str, "CircuitBreaker"] = {}
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 300.0):
+        """
+        Circuit breaker for the connection attempts of one client.
+
+        After ``failure_threshold`` consecutive failures the circuit opens and
+        no attempts are allowed for ``reset_timeout`` seconds. Then a single
+        half-open probe is allowed: success closes the circuit, failure opens
+        it again.
+
+        Args:
+            name: Session name of the client.
+            failure_threshold: Consecutive failures that open the circuit (0 = never).
+            reset_timeout: Seconds the circuit stays open before a probe.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self.stats = {
+            'opened': 0,
+            'probes': 0
+        }
+
+    @classmethod
+    def for_client(cls, name: str, failure_threshold: int = 5, reset_timeout: float = 300.0) -> "CircuitBreaker":
+        """
+        Get the circuit breaker of a client.
+
+        The breaker outlives the client manager, so its state carries over
+        restarts and config reloads. The thresholds are updated on every call.
+        """
+        breaker = cls._breakers.get(name)
+        if breaker is None:
+            breaker = cls(name, failure_threshold, reset_timeout)
+            cls._breakers[name] = breaker
+        breaker.failure_threshold = failure_threshold
+        breaker.reset_timeout = reset_timeout
+        return breaker
+
+    def time_until_probe(self) -> float:
+        """Get the seconds until the next attempt is allowed (0 if allowed now)."""
+        if self.state != self.OPEN:
+            return 0.0
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if remaining > 0:
+            return remaining
+        self.state = self.HALF_OPEN
+        self.stats['probes'] += 1
+        return 0.0
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful attempt."""
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed attempt and open the circuit if needed."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+            self.failure_threshold and self.failures >= self.failure_threshold
+        ):
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self.stats['opened'] += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get circuit breaker statistics."""
+        return {
+            **self.stats,
+            'state': self.state,
+            'failures': self.failures
+        }
@@ -0,0 +1,189 @@
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from utils.logger import get_logger
+
+# APScheduler is imported when the first scheduler is created
+if TYPE_CHECKING:
+    from apscheduler.job import Job
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+
+def _create_scheduler(on_wakeup: Callable[[], None], **options) -> "AsyncIOScheduler":
+    """Create an AsyncIOScheduler that reports every wakeup of its processing loop."""
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    class _CountingAsyncIOScheduler(AsyncIOScheduler):
+        def _process_jobs(self):
+            on_wakeup()
+            return super()._process_jobs()
+
+    return _CountingAsyncIOScheduler(**options)
+
+
+class ClientScheduler:
+    def __init__(self, shared: "SharedScheduler", session_name: str):
+        """
+        Per-client view of the shared scheduler.
+
+        Job ids are prefixed with the session name, so clients never clash,
+        and shutting the namespace down removes only this client's jobs.
+
+        Args:
+            shared: Process-wide scheduler.
+            session_name: Session name used as the namespace.
+        """
+        self.shared = shared
+        self.session_name = session_name
+        self._job_ids: List[str] = []
+
+    def _qualify(self, job_id: str) -> str:
+        return f"{self.session_name}:{job_id}"
+
+    def add_job(self, func: Callable, trigger: Optional[str] = None,
+                id: Optional[str] = None, **kwargs: Any) -> "Job":
+        """
+        Add a job in this client's namespace.
+
+        Args:
+            func: Callable to run.
+            trigger: APScheduler trigger name.
+            id: Job id within the namespace (defaults to the function name).
+            **kwargs: Passed through to ``AsyncIOScheduler.add_job``.
+
+        Returns:
+            Job: The scheduled job.
+        """
+        job_id = self._qualify(id or getattr(func, "__name__", "job"))
+        job = self.shared.scheduler.add_job(
+            func,
+            trigger=trigger,
+            id=job_id,
+            name=job_id,
+            replace_existing=True,
+            **kwargs
+        )
+        if job_id not in self._job_ids:
+            self._job_ids.append(job_id)
+        return job
+
+    def remove_job(self, id: str) -> None:
+        """Remove a job from this client's namespace."""
+        from apscheduler.jobstores.base import JobLookupError
+
+        job_id = self._qualify(id)
+        try:
+            self.shared.scheduler.remove_job(job_id)
+        except JobLookupError:
+            pass
+        if job_id in self._job_ids:
+            self._job_ids.remove(job_id)
+
+    def get_jobs(self) -> List["Job"]:
+        """Get the jobs registered by this client."""
+        return [
+            job for job in (self.shared.scheduler.get_job(job_id) for job_id in self._job_ids)
+            if job is not None
+        ]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Remove all jobs of this client. The shared scheduler keeps running.
+
+        Args:
+            wait: Kept for compatibility with ``AsyncIOScheduler.shutdown``.
+        """
+        from apscheduler.jobstores.base import JobLookupError
+
+        for job_id in self._job_ids:
+            try:
+                self.shared.scheduler.remove_job(job_id)
+            except JobLookupError:
+                pass
+        self._job_ids.clear()
+        self.shared.remove_namespace(self.session_name)
+
+
+class SharedScheduler:
+    WAKEUP_WINDOW = 60.0
+
+    def __init__(self):
+        """Process-wide scheduler that all clients register their jobs with."""
+        self.logger = get_logger("SharedScheduler")
+        self._scheduler: Optional["AsyncIOScheduler"] = None
+        self._namespaces: Dict[str, ClientScheduler] = {}
+        self._wakeups: deque = deque()
+        self._total_wakeups = 0
+        self._started = False
+        self._started_at = 0.0
+
+    def _record_wakeup(self) -> None:
+        now = time.monotonic()
+        self._total_wakeups += 1
+        self._wakeups.append(now)
+        while self._wakeups and now - self._wakeups[0] > self.WAKEUP_WINDOW:
+            self._wakeups.popleft()
+
+    @property
+    def scheduler(self) -> "AsyncIOScheduler":
+        """The APScheduler instance, created on first use."""
+        if self._scheduler is None:
+            self._scheduler = _create_scheduler(self._record_wakeup)
+        return self._scheduler
+
+    @property
+    def running(self) -> bool:
+        return self._started
+
+    def start(self) -> None:
+        """Start the scheduler. Must be called from a running event loop."""
+        if not self._started:
+            self.scheduler.start()
+            self._started = True
+            self._started_at = time.monotonic()
+            self.logger.info("Shared scheduler started")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the scheduler and drop all namespaces."""
+        if self._started:
+            self.scheduler.shutdown(wait=wait)
+            self._started = False
+            self._namespaces.clear()
+            self.logger.info("Shared scheduler stopped")
+
+    def namespace(self, session_name: str) -> ClientScheduler:
+        """
+        Get the scheduler namespace for a client.
+
+        Args:
+            session_name: Session name of the client.
+
+        Returns:
+            ClientScheduler: The client's namespace.
+        """
+        if session_name not in self._namespaces:
+            self._namespaces[session_name] = ClientScheduler(self, session_name)
+        return self._namespaces[session_name]
+
+    def remove_namespace(self, session_name: str) -> None:
+        """Forget a client's namespace."""
+        self._namespaces.pop(session_name, None)
+
+    def wakeups_per_second(self) -> float:
+        """Get the average number of scheduler wakeups per second over the last minute."""
+        now = time.monotonic()
+        while self._wakeups and now - self._wakeups[0] > self.WAKEUP_WINDOW:
+            self._wakeups.popleft()
+        window = min(self.WAKEUP_WINDOW, now - self._started_at) if self._started else self.WAKEUP_WINDOW
+        return len(self._wakeups) / window if window > 0 else 0.0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get scheduler statistics."""
+        return {
+            'running': self._started,
+            'clients': len(self._namespaces),
+            'jobs': len(self._scheduler.get_jobs()) if self._scheduler else 0,
+            'total_wakeups': self._total_wakeups,
+            'wakeups_per_second': self.wakeups_per_second()
+        }
@@ -0,0 +1,151 @@
+import hashlib
+import hmac
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from pyrogram.crypto import aes
+
+from utils.logger import get_logger
+from utils.session_manager import is_valid_session_string
+
+# Environment variable holding the cache secret; without it nothing is cached
+SESSION_CACHE_KEY_ENV = "SESSION_CACHE_KEY"
+
+
+class SessionStringCache:
+    SUFFIX = ".session-cache"
+    IV_SIZE = 16
+    MAC_SIZE = 32
+
+    def __init__(self, directory: str, secret: str, api_id: Optional[int] = None,
+                 test_mode: Optional[bool] = None):
+        """
+        Encrypted on-disk cache of exported session strings, keyed by session name.
+
+        Entries are encrypted with AES-256-CTR and authenticated with
+        HMAC-SHA256. A cached string is only returned if it decrypts and passes
+        a structural check against ``api_id`` and ``test_mode``, so no
+        connection is needed to trust it.
+
+        Args:
+            directory: Directory holding the cache files.
+            secret: Secret the encryption and MAC keys are derived from.
+            api_id: API id the cached strings must belong to.
+            test_mode: Test mode flag the cached strings must match.
+        """
+        self.directory = Path(directory)
+        self.api_id = api_id
+        self.test_mode = test_mode
+        self._enc_key = hashlib.sha256(b"session-cache:enc:" + secret.encode()).digest()
+        self._mac_key = hashlib.sha256(b"session-cache:mac:" + secret.encode()).digest()
+        self.logger = get_logger("SessionCache")
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'rejected': 0,
+            'stores': 0
+        }
+
+    @classmethod
+    def for_client(cls, session_name: str, api_id: int, workdir: str = "sessions",
+                   test_mode: bool = False) -> Optional["SessionStringCache"]:
+        """
+        Create the cache used by a client.
+
+        The secret is taken from the ``SESSION_CACHE_KEY`` environment variable.
+        Without it no cache is created: a key derived from values of the
+        configuration file would not protect the cached session strings.
+
+        Returns:
+            Optional[SessionStringCache]: The cache, or None if no secret is set.
+        """
+        secret = os.environ.get(SESSION_CACHE_KEY_ENV)
+        if not secret:
+            get_logger("SessionCache").warning(
+                f"Session cache of {session_name} is enabled but {SESSION_CACHE_KEY_ENV} is not set, "
+                f"session strings will not be cached"
+            )
+            return None
+        return cls(workdir, secret, api_id, test_mode)
+
+    def _path(self, session_name: str) -> Path:
+        return self.directory / f"{session_name}{self.SUFFIX}"
+
+    def _mac(self, session_name: str, iv: bytes, ciphertext: bytes) -> bytes:
+        return hmac.new(self._mac_key, session_name.encode() + iv + ciphertext, hashlib.sha256).digest()
+
+    def load(self, session_name: str) -> Optional[str]:
+        """
+        Get the cached session string of a session.
+
+        Returns:
+            Optional[str]: The session string, or None if there is no valid entry.
+        """
+        path = self._path(session_name)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.stats['misses'] += 1
+            return None
+
+        iv = data[:self.IV_SIZE]
+        mac = data[self.IV_SIZE:self.IV_SIZE + self.MAC_SIZE]
+        ciphertext = data[self.IV_SIZE + self.MAC_SIZE:]
+
+        session_string = None
+        if len(iv) == self.IV_SIZE and hmac.compare_digest(mac, self._mac(session_name, iv, ciphertext)):
+            try:
+                session_string = aes.ctr256_decrypt(ciphertext, self._enc_key, bytearray(iv)).decode()
+            except UnicodeDecodeError:
+                session_string = None
+
+        if not session_string or not is_valid_session_string(session_string, self.api_id, self.test_mode):
+            self.logger.warning(f"Discarding invalid cached session string of {session_name}")
+            self.stats['rejected'] += 1
+            self.invalidate(session_name)
+            return None
+
+        self.stats['hits'] += 1
+        return session_string
+
+    def store(self, session_name: str, session_string: str) -> bool:
+        """
+        Encrypt and store the session string of a session.
+
+        Returns:
+            bool: True if the entry was written.
+        """
+        if not is_valid_session_string(session_string, self.api_id, self.test_mode):
+            return False
+
+        iv = os.urandom(self.IV_SIZE)
+        ciphertext = aes.ctr256_encrypt(session_string.encode(), self._enc_key, bytearray(iv))
+        path = self._path(session_name)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Owner-only, written atomically so a crash never leaves a torn entry
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(iv + self._mac(session_name, iv, ciphertext) + ciphertext)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.error(f"Failed to cache session string of {session_name}: {e}")
+            return False
+
+        self.stats['stores'] += 1
+        return True
+
+    def invalidate(self, session_name: str) -> None:
+        """Remove the cached session string of a session."""
+        try:
+            self._path(session_name).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.error(f"Failed to remove cached session string of {session_name}: {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return dict(self.stats)
@@ -1,10 +1,19 @@
+import base64
+import sqlite3
+import struct
+from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict, Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple
 
 from pyrogram import Client
+from pyrogram.storage import Storage
 
 from utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from utils.session_cache import SessionStringCache
+
 
 class SessionType(Enum):
     FILE = "file"
@@ -12,19 +21,110 @@ class SessionType(Enum):
     STRING = "string"
 
 
+@dataclass
+class SessionProbe:
+    """What can be learned about a session without connecting."""
+    dc_id: Optional[int]
+    is_authorized: bool
+
+
+def _unpack_session_string(session_string: str) -> Tuple[int, Optional[int], bool, bytes, int, bool]:
+    """Unpack (dc_id, api_id, test_mode, auth_key, user_id, is_bot) from a session string."""
+    packed = base64.urlsafe_b64decode(session_string + "=" * (-len(session_string) % 4))
+    if len(session_string) in (Storage.SESSION_STRING_SIZE, Storage.SESSION_STRING_SIZE_64):
+        fmt = (Storage.OLD_SESSION_STRING_FORMAT
+               if len(session_string) == Storage.SESSION_STRING_SIZE
+               else Storage.OLD_SESSION_STRING_FORMAT_64)
+        dc_id, test_mode, auth_key, user_id, is_bot = struct.unpack(fmt, packed)
+        return dc_id, None, test_mode, auth_key, user_id, is_bot
+    return struct.unpack(Storage.SESSION_STRING_FORMAT, packed)
+
+
+def is_valid_session_string(session_string: str, api_id: Optional[int] = None,
+                            test_mode: Optional[bool] = None) -> bool:
+    """
+    Check that a session string is well-formed and authorized, without connecting.
+
+    Args:
+        session_string: Session string to check.
+        api_id: Expected API id, if known.
+        test_mode: Expected test mode flag, if known.
+
+    Returns:
+        bool: True if the string can be used to start a client.
+    """
+    try:
+        dc_id, string_api_id, string_test_mode, auth_key, user_id, _ = _unpack_session_string(session_string)
+    except (struct.error, ValueError):
+        return False
+
+    if not 1 <= dc_id <= 5 or len(auth_key) != 256 or not any(auth_key) or not user_id:
+        return False
+    if api_id is not None and string_api_id is not None and string_api_id != api_id:
+        return False
+    if test_mode is not None and bool(string_test_mode) != test_mode:
+        return False
+    return True
+
+
+def probe_session(session_name: str, workdir: str = "sessions",
+                  session_string: Optional[str] = None,
+                  in_memory: bool = False) -> SessionProbe:
+    """
+    Read the DC and authorization state of a session without starting a client.
+
+    Args:
+        session_name: Session name (file name without extension).
+        workdir: Directory holding file-based sessions.
+        session_string: Session string, if the client uses one.
+        in_memory: Whether the client keeps its session in memory only.
+
+    Returns:
+        SessionProbe: DC id (None if unknown) and whether the session is authorized.
+    """
+    try:
+        if session_string:
+            dc_id, _, _, auth_key, user_id, _ = _unpack_session_string(session_string)
+            return SessionProbe(dc_id=dc_id, is_authorized=bool(auth_key and user_id))
+
+        if in_memory:
+            return SessionProbe(dc_id=None, is_authorized=False)
+
+        path = Path(workdir) / f"{session_name}.session"
+        if not path.is_file():
+            return SessionProbe(dc_id=None, is_authorized=False)
+
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT dc_id, auth_key, user_id FROM sessions LIMIT 1").fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return SessionProbe(dc_id=None, is_authorized=False)
+        dc_id, auth_key, user_id = row
+        return SessionProbe(dc_id=dc_id, is_authorized=bool(auth_key and user_id))
+
+    except (sqlite3.Error, struct.error, ValueError):
+        return SessionProbe(dc_id=None, is_authorized=False)
+
+
 class SessionManager:
-    def __init__(self, client: Client, session_type: SessionType = SessionType.FILE):
+    def __init__(self, client: Client, session_type: SessionType = SessionType.FILE,
+                 cache: Optional["SessionStringCache"] = None):
         """
         Pyrogram session manager.
 
         Args:
             client: Instance of Pyrogram client.
             session_type: Type of session (file/memory/string).
+            cache: Encrypted cache of exported session strings, if enabled.
         """
         self.client = client
         self.session_type = session_type
+        self.cache = cache
         self.logger = get_logger(f"SessionManager_{client.name}")
-        self.session_string: Optional[str] = None
+        self.session_string: Optional[str] = client.session_string
 
         # Save important client parameters
         self._client_config = {
@@ -54,6 +154,7 @@ class SessionManager:
                 return True
 
             elif self.session_type == SessionType.STRING:
+                # A configured or cached string is used as is, without an export handshake
                 if not self.session_string:
                     self.session_string = await self.export_session()
                     if self.session_string:
@@ -87,29 +188,46 @@ class SessionManager:
             session_string = await self.client.export_session_string()
             self.logger.info(f"Session exported successfully for {self._get_client_info()}")
             self.session_string = session_string
+            if self.cache:
+                self.cache.store(self.client.name, session_string)
             return session_string
 
         except Exception as e:
             self.logger.error(f"Failed to export session for {self._get_client_info()}: {e}")
             return None
 
-    async def import_session(self, session_string: str) -> bool:
+    async def import_session(self, session_string: str, verify: bool = False) -> bool:
         """
         Import the session from a string.
 
+        The string is checked structurally, which needs no connection. It is
+        used the next time the client is created, through the session cache.
+
         Args:
             session_string: Session string to import.
+            verify: Also start and stop the client to verify the string with Telegram.
 
         Returns:
             bool: Success of import.
         """
+        if not is_valid_session_string(session_string, self.client.api_id, self.client.test_mode):
+            self.logger.error(f"Invalid session string for {self._get_client_info()}")
+            return False
+
+        self.session_string = session_string
+        if self.cache:
+            self.cache.store(self.client.name, session_string)
+
+        if not verify:
+            self.logger.info(f"Session imported for {self._get_client_info()}")
+            return True
+
         try:
             if self.client.is_connected:
                 await self.client.stop()
 
             # Check client type (bot/user) and set appropriate parameters
             self.client.session_string = session_string
-            self.session_string = session_string
 
             # Verify connection
             await self.client.start()
@@ -118,6 +236,8 @@ class SessionManager:
 
         except Exception as e:
             self.logger.error(f"Failed to import session for {self._get_client_info()}: {e}")
+            if self.cache:
+                self.cache.invalidate(self.client.name)
             return False
         finally:
             if self.client.is_connected:
@@ -134,6 +254,7 @@ class SessionManager:
             "type": self.session_type.value,
             "client_info": self._client_config,
             "has_session_string": bool(self.session_string),
+            "session_cache": self.cache.get_statistics() if self.cache else None,
             "is_connected": self.client.is_connected,
             "workdir": self._client_config['workdir'],
             "test_mode": self._client_config['test_mode']
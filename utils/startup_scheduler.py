@@ -0,0 +1,190 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from config.settings import ClientConfig, StartupConfig
+from utils.logger import get_logger
+from utils.session_manager import SessionProbe, probe_session
+
+
+@dataclass
+class ClientStartupResult:
+    session_name: str
+    dc_id: Optional[int]
+    authorized: bool
+    success: bool = False
+    queued_seconds: float = 0.0  # Time spent waiting for ramp-up and concurrency slots
+    start_seconds: float = 0.0  # Time spent inside the start call itself
+    ready_after: float = 0.0  # Time from the beginning of the startup run
+
+
+@dataclass
+class StartupReport:
+    total_seconds: float = 0.0
+    results: Dict[str, ClientStartupResult] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for result in self.results.values() if result.success)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+
+class StartupScheduler:
+    def __init__(self, config: StartupConfig):
+        """
+        Bounded, DC-aware scheduler for starting many clients.
+
+        Args:
+            config: Startup scheduling settings.
+        """
+        self.config = config
+        self.logger = get_logger("StartupScheduler")
+
+    def _order(self, configs: List[ClientConfig],
+               probes: Dict[str, SessionProbe]) -> List[ClientConfig]:
+        """
+        Order clients so that authorized sessions go first and consecutive
+        launches are spread across DCs.
+        """
+        groups = [configs]
+        if self.config.authorized_first:
+            groups = [
+                [c for c in configs if probes[c.session_name].is_authorized],
+                [c for c in configs if not probes[c.session_name].is_authorized]
+            ]
+
+        ordered = []
+        for group in groups:
+            by_dc: Dict[Optional[int], List[ClientConfig]] = OrderedDict()
+            for client_config in group:
+                by_dc.setdefault(probes[client_config.session_name].dc_id, []).append(client_config)
+
+            # Round-robin over DCs
+            queues = list(by_dc.values())
+            while queues:
+                for queue in queues:
+                    ordered.append(queue.pop(0))
+                queues = [queue for queue in queues if queue]
+
+        return ordered
+
+    async def run(self, configs: List[ClientConfig],
+                  start_function: Callable[[ClientConfig], Awaitable[bool]]) -> StartupReport:
+        """
+        Start clients with bounded concurrency, per-DC limits and ramp-up pacing.
+
+        Args:
+            configs: Client configurations to start.
+            start_function: Coroutine function starting a single client.
+
+        Returns:
+            StartupReport: Per-client and total time-to-ready.
+        """
+        report = StartupReport()
+        begin = time.monotonic()
+
+        probes = {
+            c.session_name: probe_session(c.session_name, c.workdir, c.session_string, c.in_memory)
+            for c in configs
+        }
+        ordered = self._order(configs, probes)
+
+        authorized = sum(1 for probe in probes.values() if probe.is_authorized)
+        self.logger.info(
+            f"Scheduling startup of {len(ordered)} client(s) "
+            f"({authorized} authorized, {len(ordered) - authorized} need login), "
+            f"max concurrent: {self.config.max_concurrent or 'unlimited'}, "
+            f"per DC: {self.config.per_dc_concurrency or 'unlimited'}, "
+            f"ramp-up: {self.config.ramp_up_rate or 'unlimited'}/s"
+        )
+
+        global_limit = asyncio.Semaphore(self.config.max_concurrent) if self.config.max_concurrent > 0 else None
+        dc_limits: Dict[Optional[int], asyncio.Semaphore] = {}
+
+        async def launch(client_config: ClientConfig, result: ClientStartupResult):
+            queued_at = time.monotonic()
+            dc_limit = None
+            if self.config.per_dc_concurrency > 0:
+                dc_limit = dc_limits.setdefault(
+                    result.dc_id, asyncio.Semaphore(self.config.per_dc_concurrency)
+                )
+
+            if dc_limit:
+                await dc_limit.acquire()
+            try:
+                if global_limit:
+                    await global_limit.acquire()
+                try:
+                    started_at = time.monotonic()
+                    result.queued_seconds = started_at - queued_at
+                    try:
+                        result.success = bool(await start_function(client_config))
+                    except Exception as e:
+                        self.logger.error(f"Unexpected error starting {client_config.session_name}: {e}")
+                    finished_at = time.monotonic()
+                    result.start_seconds = finished_at - started_at
+                    result.ready_after = finished_at - begin
+                finally:
+                    if global_limit:
+                        global_limit.release()
+            finally:
+                if dc_limit:
+                    dc_limit.release()
+
+        tasks = []
+        interval = 1 / self.config.ramp_up_rate if self.config.ramp_up_rate > 0 else 0
+        try:
+            for index, client_config in enumerate(ordered):
+                if interval:
+                    delay = begin + index * interval - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                probe = probes[client_config.session_name]
+                result = ClientStartupResult(
+                    session_name=client_config.session_name,
+                    dc_id=probe.dc_id,
+                    authorized=probe.is_authorized
+                )
+                report.results[client_config.session_name] = result
+                tasks.append(asyncio.create_task(
+                    launch(client_config, result),
+                    name=f"start_{client_config.session_name}"
+                ))
+
+            if tasks:
+                await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            # Cancel the launches too and let them clean up before giving up
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        report.total_seconds = time.monotonic() - begin
+        self._log_report(report)
+        return report
+
+    def _log_report(self, report: StartupReport):
+        """Log per-client and total time-to-ready."""
+        for result in sorted(report.results.values(), key=lambda r: r.ready_after):
+            self.logger.debug(
+                f"{result.session_name}: {'ready' if result.success else 'failed'} "
+                f"after {result.ready_after:.2f}s (DC: {result.dc_id or '?'}, "
+                f"queued: {result.queued_seconds:.2f}s, start: {result.start_seconds:.2f}s)"
+            )
+
+        if report.results:
+            slowest = max(report.results.values(), key=lambda r: r.start_seconds)
+            average = sum(r.start_seconds for r in report.results.values()) / len(report.results)
+            self.logger.info(
+                f"Startup finished in {report.total_seconds:.2f}s. "
+                f"Ready: {report.succeeded}/{len(report.results)}, "
+                f"average start: {average:.2f}s, "
+                f"slowest: {slowest.session_name} ({slowest.start_seconds:.2f}s)"
+            )
@@ -0,0 +1,132 @@
+import math
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class TimerWheel:
+    def __init__(self, resolution: float = 1.0, slots: int = 64, levels: int = 3):
+        """
+        Hierarchical timer wheel for per-item deadlines.
+
+        Level 0 has one slot per tick, every higher level has slots that are
+        ``slots`` times wider. Timers move down a level when their slot comes
+        round, so advancing costs O(due timers) plus an amortized cascade,
+        independent of how many timers are scheduled. Timers further out than
+        the top level are parked in its slots and re-placed on every pass.
+
+        Args:
+            resolution: Seconds per tick. Deadlines are rounded up to a tick.
+            slots: Slots per level.
+            levels: Number of levels, at least 2 so far timers have a top level to park in.
+
+        Raises:
+            ValueError: If ``levels`` is less than 2.
+        """
+        if levels < 2:
+            raise ValueError(f"TimerWheel needs at least 2 levels, got {levels}")
+
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self._origin = time.monotonic()
+        self._current = 0
+        self._wheels: List[List[Dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        # Position of every timer: key -> (level, slot)
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+        self.fired = 0
+        self.cascaded = 0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def _tick_of(self, now: float) -> int:
+        return int((now - self._origin) / self.resolution)
+
+    def _place(self, key: Hashable, deadline: int) -> None:
+        delta = deadline - self._current
+        level = 0
+        while level < self.levels - 1 and delta >= self.slots ** (level + 1):
+            level += 1
+        slot = (deadline // self.slots ** level) % self.slots
+        self._wheels[level][slot][key] = deadline
+        self._where[key] = (level, slot)
+
+    def schedule(self, key: Hashable, delay: float, now: Optional[float] = None) -> None:
+        """
+        Fire ``key`` after ``delay`` seconds, replacing an existing timer for it.
+
+        Args:
+            key: Item the timer belongs to.
+            delay: Seconds from ``now``.
+            now: Monotonic time (defaults to now).
+        """
+        self.cancel(key)
+        now = time.monotonic() if now is None else now
+        deadline = math.ceil((now + delay - self._origin) / self.resolution)
+        self._place(key, max(deadline, self._current + 1))
+
+    def cancel(self, key: Hashable) -> bool:
+        """Remove the timer of ``key``. Returns whether there was one."""
+        position = self._where.pop(key, None)
+        if position is None:
+            return False
+        level, slot = position
+        del self._wheels[level][slot][key]
+        return True
+
+    def _cascade(self, level: int) -> None:
+        slot = (self._current // self.slots ** level) % self.slots
+        timers = self._wheels[level][slot]
+        self._wheels[level][slot] = {}
+        for key, deadline in timers.items():
+            self._place(key, deadline)
+        self.cascaded += len(timers)
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Move the wheel forward to ``now`` and return the keys that are due.
+
+        Fired timers are removed; reschedule a key to make it periodic.
+
+        Args:
+            now: Monotonic time (defaults to now).
+
+        Returns:
+            List[Hashable]: Due keys, in deadline order.
+        """
+        now = time.monotonic() if now is None else now
+        target = self._tick_of(now)
+        if not self._where:
+            self._current = max(self._current, target)
+            return []
+
+        due = []
+        while self._current < target:
+            self._current += 1
+            for level in range(self.levels - 1, 0, -1):
+                if self._current % self.slots ** level == 0:
+                    self._cascade(level)
+
+            timers = self._wheels[0][self._current % self.slots]
+            if timers:
+                self._wheels[0][self._current % self.slots] = {}
+                for key in timers:
+                    del self._where[key]
+                due.extend(timers)
+        self.fired += len(due)
+        return due
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get the number of scheduled timers and the work done so far."""
+        return {
+            'scheduled': len(self._where),
+            'fired': self.fired,
+            'cascaded': self.cascaded,
+            'tick': self._current,
+            'resolution': self.resolution
+        }
@@ -0,0 +1,170 @@
+import asyncio
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pyrogram import Client
+
+from config.settings import AutoscaleConfig
+from utils.handler_metrics import HandlerInstrumentation
+from utils.logger import get_logger
+
+
+class WorkerPoolAutoscaler:
+    def __init__(self, client: Client, config: AutoscaleConfig,
+                 handler_metrics: Optional[HandlerInstrumentation] = None):
+        """
+        Grows and shrinks the handler workers of a client's dispatcher.
+
+        Every ``interval`` seconds the depth of the update queue and the mean
+        handler latency since the last check are compared with the configured
+        thresholds. A backlog grows the pool by half its size; a pool that
+        stayed idle for ``scale_down_after`` checks gives up one worker.
+
+        Args:
+            client: Started client.
+            config: Autoscaling settings.
+            handler_metrics: Handler instrumentation of the client, the source
+                of handler latency. Without it only the queue depth is used.
+        """
+        self.client = client
+        self.config = config
+        self.handler_metrics = handler_metrics
+        self.logger = get_logger(f"WorkerPool_{client.name}")
+        self._task: Optional[asyncio.Task] = None
+        self._idle_checks = 0
+        self._handler_totals = (0, 0.0)
+        self.stats = {
+            'grown': 0,
+            'shrunk': 0,
+            'last_decision': None
+        }
+
+    @property
+    def workers(self) -> int:
+        return self.client.workers
+
+    def _handler_latency(self) -> Optional[float]:
+        """Mean wall time of the handler calls sampled since the last check."""
+        if not self.handler_metrics:
+            return None
+        sampled = sum(stats.sampled for stats in self.handler_metrics.handlers.values())
+        wall = sum(stats.wall_total for stats in self.handler_metrics.handlers.values())
+        previous_sampled, previous_wall = self._handler_totals
+        self._handler_totals = (sampled, wall)
+        if sampled == previous_sampled:
+            return None
+        return (wall - previous_wall) / (sampled - previous_sampled)
+
+    def _worker_pairs(self) -> List[Tuple[asyncio.Task, asyncio.Lock]]:
+        dispatcher = self.client.dispatcher
+        tasks = dispatcher.handler_worker_tasks
+        return list(zip(tasks, dispatcher.locks_list[len(dispatcher.locks_list) - len(tasks):]))
+
+    def _grow(self, count: int) -> None:
+        dispatcher = self.client.dispatcher
+        # Same bookkeeping as Dispatcher.start, so Dispatcher.stop stops these workers
+        # too; the lists are replaced, not mutated, as in _shrink
+        locks = [asyncio.Lock() for _ in range(count)]
+        tasks = [dispatcher.loop.create_task(dispatcher.handler_worker(lock)) for lock in locks]
+        dispatcher.locks_list = [*dispatcher.locks_list, *locks]
+        dispatcher.handler_worker_tasks = [*dispatcher.handler_worker_tasks, *tasks]
+        self.client.workers += count
+
+    def _shrink(self, count: int) -> None:
+        dispatcher = self.client.dispatcher
+        # Forget workers that already exited; the lists are replaced, not mutated,
+        # because Dispatcher.add_handler may be iterating over the locks
+        live = [(task, lock) for task, lock in self._worker_pairs() if not task.done()]
+        dispatcher.handler_worker_tasks = [task for task, _ in live]
+        dispatcher.locks_list = [lock for _, lock in live]
+        for _ in range(count):
+            # The next idle worker takes the sentinel and exits
+            dispatcher.updates_queue.put_nowait(None)
+            self.client.workers -= 1
+
+    def resize(self, target: int, reason: str) -> None:
+        """
+        Resize the pool to ``target`` workers (clamped to the configured bounds).
+
+        Args:
+            target: Desired number of workers.
+            reason: Why, for the log.
+        """
+        target = max(self.config.min_workers, min(self.config.max_workers, target))
+        current = self.workers
+        if target == current:
+            return
+        if target > current:
+            self._grow(target - current)
+            self.stats['grown'] += 1
+        else:
+            self._shrink(current - target)
+            self.stats['shrunk'] += 1
+        self.stats['last_decision'] = {'at': time.time(), 'from': current, 'to': target, 'reason': reason}
+        self.logger.info(f"Resized handler workers {current} -> {target}: {reason}")
+
+    def check(self) -> None:
+        """Take one scaling decision from the current queue depth and handler latency."""
+        depth = self.client.dispatcher.updates_queue.qsize()
+        latency = self._handler_latency()
+        slow = latency is not None and latency > self.config.latency_target
+        latency_text = f"{latency * 1000:.0f} ms" if latency is not None else "n/a"
+
+        if depth >= self.config.scale_up_depth or (depth and slow):
+            self._idle_checks = 0
+            if self.workers < self.config.max_workers:
+                self.resize(
+                    self.workers + max(1, math.ceil(self.workers / 2)),
+                    f"{depth} queued updates, mean handler latency {latency_text}"
+                )
+            return
+
+        if depth or slow:
+            self._idle_checks = 0
+            return
+
+        self._idle_checks += 1
+        if self._idle_checks >= self.config.scale_down_after and self.workers > self.config.min_workers:
+            self._idle_checks = 0
+            self.resize(
+                self.workers - 1,
+                f"queue empty for {self.config.scale_down_after} checks, "
+                f"mean handler latency {latency_text}"
+            )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.interval)
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"Worker pool check failed: {e}")
+
+    def start(self) -> None:
+        """Start the periodic checks and bring the pool within its bounds."""
+        if self.client.no_updates:
+            self.logger.warning("Updates are disabled, worker autoscaling is not started")
+            return
+        self.resize(self.workers, "configured workers outside the autoscaling bounds")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"worker_pool_{self.client.name}")
+
+    async def stop(self) -> None:
+        """Stop the periodic checks. The dispatcher stops the workers."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get the pool size, its bounds and the resize history."""
+        return {
+            'workers': self.workers,
+            'min_workers': self.config.min_workers,
+            'max_workers': self.config.max_workers,
+            **self.stats
+        }